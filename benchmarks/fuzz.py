@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+
+"""
+Fuzz the parser, checking that no input takes longer to parse than a budget proportional to its size.
+
+Each input is parsed as a shell link, and the values of its property storages are decoded; exceptions derived from
+`Exception` are the expected outcome of malformed input, but an input whose parse takes longer than a fixed allowance
+plus a number of nanoseconds per input byte fails the run, as does an input whose parse is interrupted by the timeout,
+such as by an endless loop. The time of an input is the fastest of a few parses, so that a single preemption does not
+fail the run.
+
+By default, a built-in coverage-guided fuzzer mutates a corpus seeded with synthetic shell links (and with the files
+of a seed directory), keeping the mutants that reach line transitions in the parser that no earlier input reached. With
+`--atheris`, the inputs are instead generated by libFuzzer through Atheris, an optional dependency; the remaining
+arguments are passed to libFuzzer. Failing inputs are written to the artifact directory. The exit status is non-zero
+if any input fails. Run from the root of the repository:
+
+    $ python benchmarks/fuzz.py --duration 300 --artifacts fuzz-artifacts/
+    $ python benchmarks/fuzz.py --atheris -- -max_total_time=300 -max_len=8192
+"""
+
+from __future__ import annotations
+from argparse import ArgumentParser
+from collections.abc import Callable
+from hashlib import sha256
+from logging import CRITICAL, disable as disable_logging
+from pathlib import Path
+from random import Random
+from signal import SIGALRM, ITIMER_REAL, setitimer, signal
+from sys import argv, path as sys_path, settrace, stdout
+from time import perf_counter_ns, monotonic
+from types import FrameType
+from typing import Final
+
+ROOT_PATH: Final[Path] = Path(__file__).resolve().parent.parent
+PACKAGE_PATH: Final[str] = str(ROOT_PATH / 'lnk_parser')
+
+sys_path.insert(0, str(ROOT_PATH))
+
+# The number of times an input whose parse exceeds its budget is parsed again before it is taken to fail.
+NUM_TIMING_RETRIES: Final[int] = 3
+
+# Values that are likely to be at the boundaries of the size and count fields of the structures.
+_INTERESTING_INTEGERS: Final[tuple[int, ...]] = (
+    0, 1, 2, 3, 4, 7, 8, 0x10, 0x7F, 0x80, 0xFF, 0x100, 0x7FFF, 0x8000, 0xFFFF, 0x10000, 0x7FFFFFFF, 0x80000000,
+    0xFFFFFFFF
+)
+
+
+class ParseTimeoutError(BaseException):
+    """
+    Raised in the parse of an input that has run for longer than the timeout. Derived from `BaseException`, so that the
+    parser, which may catch `Exception`, does not catch it.
+    """
+
+
+def _raise_timeout(signal_number: int, frame: FrameType | None) -> None:
+    raise ParseTimeoutError
+
+
+def _make_parse(max_bytes: int) -> Callable[[bytes], None]:
+    from lnk_parser.structures.shell_link import ShellLink
+    from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+    from lnk_parser.parse_budget import ParseLimits
+
+    limits = ParseLimits(max_bytes=max_bytes)
+
+    def parse(data: bytes) -> None:
+        try:
+            shell_link = ShellLink.from_bytes(data=data, limits=limits)
+            for extra_data in shell_link.extra_data_list:
+                if isinstance(extra_data, PropertyStoreDataBlock):
+                    for property_storage in extra_data.property_storages:
+                        _ = property_storage.properties
+        except Exception:
+            pass
+
+    return parse
+
+
+class TimeChecker:
+    """
+    Times the parses of inputs against a budget of a fixed allowance plus a number of nanoseconds per input byte.
+    """
+
+    def __init__(self, parse: Callable[[bytes], None], base_ns: int, ns_per_byte: int, timeout: float):
+        self.parse = parse
+        self.base_ns = base_ns
+        self.ns_per_byte = ns_per_byte
+        self.timeout = timeout
+        self.max_observed_ns_per_byte = 0.0
+
+        signal(SIGALRM, _raise_timeout)
+
+    def budget_ns(self, data: bytes) -> int:
+        return self.base_ns + self.ns_per_byte * len(data)
+
+    def _time_parse(self, data: bytes) -> int | None:
+        setitimer(ITIMER_REAL, self.timeout)
+        try:
+            start_ns = perf_counter_ns()
+            self.parse(data)
+            return perf_counter_ns() - start_ns
+        except ParseTimeoutError:
+            return None
+        finally:
+            setitimer(ITIMER_REAL, 0)
+
+    def check(self, data: bytes) -> str | None:
+        """
+        Time the parse of an input against its budget.
+
+        :param data: The input.
+        :return: A description of the failure of the input, or `None` if it is parsed within its budget.
+        """
+
+        for _ in range(NUM_TIMING_RETRIES):
+            if (duration_ns := self._time_parse(data=data)) is None:
+                return f'the parse did not end within the timeout of {self.timeout} s'
+
+            self.max_observed_ns_per_byte = max(self.max_observed_ns_per_byte, duration_ns / max(len(data), 1))
+            if duration_ns <= self.budget_ns(data=data):
+                return None
+
+        return f'the parse took {duration_ns / 1e6:.2f} ms, more than the budget of {self.budget_ns(data) / 1e6:.2f} ms'
+
+
+class CoverageTracer:
+    """
+    Collects the transitions between lines of the parser's source executed while parsing an input.
+    """
+
+    def __init__(self):
+        self._transitions: set[tuple[str, int, int]] = set()
+        self._frame_to_previous_line: dict[FrameType, int] = {}
+
+    def _trace_line(self, frame: FrameType, event: str, arg: object) -> Callable | None:
+        if event == 'line':
+            self._transitions.add(
+                (frame.f_code.co_filename, self._frame_to_previous_line.get(frame, 0), frame.f_lineno)
+            )
+            self._frame_to_previous_line[frame] = frame.f_lineno
+        return self._trace_line
+
+    def _trace_call(self, frame: FrameType, event: str, arg: object) -> Callable | None:
+        return self._trace_line if frame.f_code.co_filename.startswith(PACKAGE_PATH) else None
+
+    def collect(self, parse: Callable[[bytes], None], data: bytes) -> set[tuple[str, int, int]]:
+        """
+        Parse an input, collecting the line transitions executed in the parser.
+
+        :param parse: The function parsing an input.
+        :param data: The input.
+        :return: The line transitions, as the file name and the previous and current line numbers.
+        """
+
+        self._transitions = set()
+        settrace(self._trace_call)
+        try:
+            parse(data)
+        finally:
+            settrace(None)
+            self._frame_to_previous_line.clear()
+
+        return self._transitions
+
+
+def _mutate(data: bytes, corpus: list[bytes], random: Random) -> bytes:
+    """
+    Apply a few random mutations to an input: bit flips, boundary values written over bytes and integer fields,
+    deletions, duplications and insertions of chunks, splices with other inputs of the corpus, and truncation.
+
+    :param data: The input to be mutated.
+    :param corpus: The corpus, from which inputs are spliced.
+    :param random: The random number generator.
+    :return: The mutated input.
+    """
+
+    mutant = bytearray(data)
+
+    for _ in range(random.randint(1, 4)):
+        if not mutant:
+            mutant.extend(random.randbytes(random.randint(1, 64)))
+            continue
+
+        position = random.randrange(len(mutant))
+        match random.randrange(8):
+            case 0:
+                mutant[position] ^= 1 << random.randrange(8)
+            case 1:
+                mutant[position] = random.choice(_INTERESTING_INTEGERS) & 0xFF
+            case 2:
+                width = random.choice((2, 4))
+                value = random.choice(_INTERESTING_INTEGERS + (len(mutant), len(mutant) - position))
+                mutant[position:position + width] = (value & ((1 << (8 * width)) - 1)).to_bytes(width, 'little')
+            case 3:
+                del mutant[position:position + random.randint(1, 64)]
+            case 4:
+                chunk = mutant[position:position + random.randint(1, 64)]
+                insert_position = random.randrange(len(mutant) + 1)
+                mutant[insert_position:insert_position] = chunk * random.randint(1, 8)
+            case 5:
+                mutant[position:position] = random.randbytes(random.randint(1, 16))
+            case 6:
+                other = random.choice(corpus)
+                mutant = mutant[:position] + other[random.randrange(len(other) + 1):]
+            case 7:
+                del mutant[position:]
+
+    return bytes(mutant)
+
+
+def _make_seed_corpus(num_synthetic: int, seed_directory: Path | None) -> list[bytes]:
+    from lnk_parser.corpus import CorpusParameters, make_shell_link_bytes
+
+    parameters_list = (
+        CorpusParameters(),
+        CorpusParameters(unicode_ratio=0.0, max_path_depth=2),
+        CorpusParameters(unicode_ratio=1.0, max_path_depth=12, max_num_properties=40, tracker_ratio=1.0)
+    )
+
+    corpus = [
+        make_shell_link_bytes(index=index, parameters=parameters_list[index % len(parameters_list)])
+        for index in range(num_synthetic)
+    ]
+    if seed_directory is not None:
+        corpus.extend(path.read_bytes() for path in sorted(seed_directory.iterdir()) if path.is_file())
+
+    return corpus
+
+
+def _write_artifact(artifact_directory: Path, data: bytes) -> Path:
+    artifact_directory.mkdir(parents=True, exist_ok=True)
+    artifact_path = artifact_directory / f'slow-{sha256(data).hexdigest()[:16]}.lnk'
+    artifact_path.write_bytes(data)
+
+    return artifact_path
+
+
+def _fuzz_builtin(args, time_checker: TimeChecker) -> int:
+    random = Random(args.seed)
+    corpus = _make_seed_corpus(num_synthetic=args.num_seeds, seed_directory=args.seed_directory)
+    tracer = CoverageTracer()
+
+    coverage: set[tuple[str, int, int]] = set()
+    for data in corpus:
+        coverage |= tracer.collect(parse=time_checker.parse, data=data)
+
+    num_executions = 0
+    num_failures = 0
+    start_time = monotonic()
+    next_report_time = start_time + args.report_interval
+
+    while num_executions < args.iterations and monotonic() - start_time < args.duration:
+        mutant = _mutate(data=random.choice(corpus), corpus=corpus, random=random)[:args.max_len]
+        num_executions += 1
+
+        if (failure := time_checker.check(data=mutant)) is not None:
+            num_failures += 1
+            artifact_path = _write_artifact(artifact_directory=args.artifacts, data=mutant)
+            stdout.write(f'FAIL {artifact_path} ({len(mutant)} bytes): {failure}\n')
+            continue
+
+        if new_transitions := tracer.collect(parse=time_checker.parse, data=mutant) - coverage:
+            coverage |= new_transitions
+            corpus.append(mutant)
+
+        if monotonic() >= next_report_time:
+            next_report_time += args.report_interval
+            stdout.write(
+                f'{num_executions} executions, {num_executions / (monotonic() - start_time):.0f}/s, '
+                f'{len(coverage)} transitions, {len(corpus)} inputs, '
+                f'{time_checker.max_observed_ns_per_byte:.0f} ns/byte at most, {num_failures} failures\n'
+            )
+            stdout.flush()
+
+    stdout.write(
+        f'{num_executions} executions in {monotonic() - start_time:.1f} s, {len(coverage)} transitions, '
+        f'{len(corpus)} inputs, {time_checker.max_observed_ns_per_byte:.0f} ns/byte at most, '
+        f'{num_failures} failures\n'
+    )
+
+    return 1 if num_failures else 0
+
+
+def _fuzz_atheris(args, libfuzzer_arguments: list[str]) -> int:
+    import atheris
+
+    with atheris.instrument_imports(include=['lnk_parser']):
+        parse = _make_parse(max_bytes=args.max_len)
+
+    time_checker = TimeChecker(
+        parse=parse,
+        base_ns=args.base_us * 1000,
+        ns_per_byte=args.ns_per_byte,
+        timeout=args.timeout
+    )
+
+    def test_one_input(data: bytes) -> None:
+        if (failure := time_checker.check(data=data)) is not None:
+            _write_artifact(artifact_directory=args.artifacts, data=data)
+            raise AssertionError(f'Input of {len(data)} bytes: {failure}')
+
+    atheris.Setup([argv[0], *libfuzzer_arguments], test_one_input)
+    atheris.Fuzz()
+
+    return 0
+
+
+def main() -> int:
+    argument_parser = ArgumentParser(description='Fuzz the parser against a parse time budget per input byte.')
+    argument_parser.add_argument(
+        '--atheris',
+        help='Generate the inputs with libFuzzer through Atheris; the remaining arguments are passed to libFuzzer.',
+        action='store_true'
+    )
+    argument_parser.add_argument(
+        '--duration',
+        help='The number of seconds to fuzz for, with the built-in fuzzer.',
+        type=float,
+        default=60.0
+    )
+    argument_parser.add_argument(
+        '-n', '--iterations',
+        help='The largest number of inputs to parse, with the built-in fuzzer.',
+        type=int,
+        default=2**63
+    )
+    argument_parser.add_argument(
+        '--seed',
+        help='The seed of the built-in fuzzer.',
+        type=int,
+        default=0
+    )
+    argument_parser.add_argument(
+        '--num-seeds',
+        help='The number of synthetic shell links with which the corpus of the built-in fuzzer is seeded.',
+        type=int,
+        default=30
+    )
+    argument_parser.add_argument(
+        '--seed-directory',
+        help='A directory of files with which the corpus of the built-in fuzzer is also seeded.',
+        type=Path
+    )
+    argument_parser.add_argument(
+        '--max-len',
+        help='The largest size of an input, which is also the byte limit of the parse.',
+        type=int,
+        default=16384
+    )
+    argument_parser.add_argument(
+        '--base-us',
+        help='The fixed allowance of the parse time budget of an input, in microseconds.',
+        type=int,
+        default=5000
+    )
+    argument_parser.add_argument(
+        '--ns-per-byte',
+        help='The allowance of the parse time budget of an input per input byte, in nanoseconds.',
+        type=int,
+        default=5000
+    )
+    argument_parser.add_argument(
+        '--timeout',
+        help='The number of seconds after which the parse of an input is interrupted and the input fails.',
+        type=float,
+        default=2.0
+    )
+    argument_parser.add_argument(
+        '--report-interval',
+        help='The number of seconds between progress reports of the built-in fuzzer.',
+        type=float,
+        default=10.0
+    )
+    argument_parser.add_argument(
+        '--artifacts',
+        help='The directory to which failing inputs are written.',
+        type=Path,
+        default=Path('fuzz-artifacts')
+    )
+    args, remaining_arguments = argument_parser.parse_known_args()
+
+    # The parser logs a warning for each unsupported structure, which malformed input is full of.
+    disable_logging(CRITICAL)
+
+    if args.atheris:
+        return _fuzz_atheris(args=args, libfuzzer_arguments=[
+            argument for argument in remaining_arguments if argument != '--'
+        ])
+
+    if remaining_arguments:
+        argument_parser.error(f'unrecognized arguments: {" ".join(remaining_arguments)}')
+
+    time_checker = TimeChecker(
+        parse=_make_parse(max_bytes=args.max_len),
+        base_ns=args.base_us * 1000,
+        ns_per_byte=args.ns_per_byte,
+        timeout=args.timeout
+    )
+
+    return _fuzz_builtin(args=args, time_checker=time_checker)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""
+Compare decoding shell link headers one by one with `ShellLinkHeader.from_bytes` against decoding them in a batch with
+`lnk_parser.header_batch.decode_headers`. Requires NumPy. Run from the root of the repository:
+
+    $ python benchmarks/header_batch.py --count 1000000
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from sys import path as sys_path
+from time import perf_counter
+
+sys_path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.header_batch import decode_headers
+from benchmarks.synthetic import make_synthetic_shell_link
+
+
+def main():
+    argument_parser = ArgumentParser(description='Compare decoding shell link headers one by one and in a batch.')
+    argument_parser.add_argument(
+        '-n', '--count',
+        help='The number of headers to decode.',
+        type=int,
+        default=1_000_000
+    )
+    args = argument_parser.parse_args()
+
+    # The headers of the synthetic shell links differ only in their times, so a few distinct ones are repeated.
+    distinct_headers = [make_synthetic_shell_link(index=index)[:ShellLinkHeader.SIZE] for index in range(1000)]
+    buffer = b''.join(distinct_headers[index % len(distinct_headers)] for index in range(args.count))
+
+    start_time = perf_counter()
+    for offset in range(0, len(buffer), ShellLinkHeader.SIZE):
+        ShellLinkHeader.from_bytes(data=buffer, base_offset=offset)
+    one_by_one_elapsed = perf_counter() - start_time
+
+    start_time = perf_counter()
+    header_columns = decode_headers(data=buffer)
+    batch_elapsed = perf_counter() - start_time
+
+    print(f'Headers: {len(header_columns)}')
+    print(f'One by one: {one_by_one_elapsed:.3f} s ({one_by_one_elapsed / args.count * 1e9:.0f} ns per header)')
+    print(f'Batch: {batch_elapsed:.3f} s ({batch_elapsed / args.count * 1e9:.1f} ns per header)')
+    print(f'Speedup: {one_by_one_elapsed / batch_elapsed:.0f}x')
+
+
+if __name__ == '__main__':
+    main()
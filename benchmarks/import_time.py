@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+"""
+Measure the import time of the command-line interface and of the parser, and check it against budgets.
+
+Each scenario (printing the help, parsing an LNK file as text or as NDJSON, and parsing it with the parser as a
+library) is run several times with `python -X importtime`. The time of a scenario is the sum of the self times of the
+modules it imports beyond those imported by the bare interpreter, including the dependencies, in the fastest run; a
+first run, not counted, writes the bytecode of the modules, so that compiling them is not measured. A scenario fails if
+it imports any of its excluded modules, such as `multiprocessing` when no workers are used, or if its time exceeds its
+budget; the budgets may be scaled for slower machines. The exit status is non-zero if a scenario fails. Run from the
+root of the repository:
+
+    $ python benchmarks/import_time.py --repeat 10 --top 5
+"""
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from os import environ
+from pathlib import Path
+from subprocess import run
+from sys import executable, path as sys_path, stdout
+from tempfile import TemporaryDirectory
+from typing import Final
+
+ROOT_PATH: Final[Path] = Path(__file__).resolve().parent.parent
+
+sys_path.insert(0, str(ROOT_PATH))
+
+from lnk_parser.corpus import CorpusParameters, make_shell_link_bytes
+
+# The modules that parsing a single LNK file, without workers, a cache or jump lists, has no use for.
+_SINGLE_FILE_EXCLUDED_MODULES: Final[frozenset[str]] = frozenset({
+    'multiprocessing',
+    'concurrent',
+    'asyncio',
+    'sqlite3',
+    'numpy',
+    'lnk_parser.scan_cache',
+    'lnk_parser.corpus',
+    'lnk_parser.structures.compound_file',
+    'lnk_parser.structures.dest_list'
+})
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    # The arguments of the interpreter; `{lnk_path}` is replaced by the path of an LNK file.
+    arguments: tuple[str, ...]
+    excluded_modules: frozenset[str]
+    budget_ms: float
+
+
+SCENARIOS: Final[tuple[Scenario, ...]] = (
+    Scenario(
+        name='help',
+        arguments=('lnk_parser.py', '--help'),
+        excluded_modules=frozenset({
+            'lnk_parser.structures.shell_link',
+            'lnk_parser.scan',
+            'lnk_parser.rendering',
+            'string_utils_py',
+            'json',
+            'multiprocessing',
+            'sqlite3'
+        }),
+        budget_ms=60
+    ),
+    Scenario(
+        name='text',
+        arguments=('lnk_parser.py', '{lnk_path}'),
+        excluded_modules=_SINGLE_FILE_EXCLUDED_MODULES,
+        budget_ms=140
+    ),
+    Scenario(
+        name='ndjson',
+        arguments=('lnk_parser.py', '--format', 'ndjson', '{lnk_path}'),
+        excluded_modules=_SINGLE_FILE_EXCLUDED_MODULES,
+        budget_ms=140
+    ),
+    # Parsing a file as a library has no use for the command-line interface or the rendering of the output. The
+    # structures cannot do without `msdsalgs`, whose masks and time conversions they are built on.
+    Scenario(
+        name='library',
+        arguments=(
+            '-c',
+            'from lnk_parser.structures.shell_link import ShellLink; ShellLink.from_path(path=r"{lnk_path}")'
+        ),
+        excluded_modules=frozenset({
+            'argparse',
+            'typed_argument_parser',
+            'lnk_parser.cli',
+            'lnk_parser.rendering',
+            'json'
+        }) | _SINGLE_FILE_EXCLUDED_MODULES,
+        budget_ms=120
+    )
+)
+
+
+@dataclass(frozen=True)
+class ScenarioMeasurement:
+    # The self time of each module imported beyond those of the bare interpreter, in microseconds, in the fastest run.
+    module_name_to_self_time: dict[str, int]
+    # The names of the imported modules that the scenario excludes.
+    excluded_module_names: list[str]
+
+    @property
+    def time_ms(self) -> float:
+        return sum(self.module_name_to_self_time.values()) / 1000
+
+
+def _measure_import_times(arguments: list[str]) -> dict[str, int]:
+    """
+    Run the interpreter with `-X importtime` and collect the self time of each imported module.
+
+    :param arguments: The arguments of the interpreter, following `-X importtime`.
+    :return: A map from the name of each imported module to its self time, in microseconds.
+    """
+
+    completed_process = run(
+        [executable, '-X', 'importtime', *arguments],
+        cwd=ROOT_PATH,
+        env={name: value for name, value in environ.items() if name != 'PYTHONDONTWRITEBYTECODE'},
+        capture_output=True,
+        text=True
+    )
+    if completed_process.returncode != 0:
+        raise RuntimeError(f'The arguments {arguments} failed: {completed_process.stderr}')
+
+    module_name_to_self_time: dict[str, int] = {}
+    for line in completed_process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        self_time, _, module_name = line.removeprefix('import time:').split('|')
+        # The heading line has no numbers.
+        if self_time.strip().isdigit():
+            module_name_to_self_time[module_name.strip()] = int(self_time)
+
+    return module_name_to_self_time
+
+
+def _is_excluded(module_name: str, excluded_modules: frozenset[str]) -> bool:
+    return any(
+        module_name == excluded_module or module_name.startswith(f'{excluded_module}.')
+        for excluded_module in excluded_modules
+    )
+
+
+def measure_interpreter_module_names() -> set[str]:
+    """
+    Collect the names of the modules imported by the bare interpreter, which are not counted in any scenario.
+
+    :return: The names of the modules.
+    """
+
+    return set(_measure_import_times(arguments=['-c', 'pass']))
+
+
+def measure_scenario(
+    scenario: Scenario,
+    lnk_path: Path,
+    interpreter_module_names: set[str],
+    repeat: int
+) -> ScenarioMeasurement:
+    """
+    Run a scenario several times, after a first run writing the bytecode, and keep its fastest run.
+
+    :param scenario: The scenario to be run.
+    :param lnk_path: The path of the LNK file given to the scenario.
+    :param interpreter_module_names: The names of the modules imported by the bare interpreter.
+    :param repeat: The number of times the scenario is run.
+    :return: The measurement of the fastest run.
+    """
+
+    arguments = [argument.format(lnk_path=lnk_path) for argument in scenario.arguments]
+    _measure_import_times(arguments=arguments)
+
+    fastest_module_name_to_self_time: dict[str, int] | None = None
+    for _ in range(repeat):
+        module_name_to_self_time = {
+            module_name: self_time
+            for module_name, self_time in _measure_import_times(arguments=arguments).items()
+            if module_name not in interpreter_module_names
+        }
+        if fastest_module_name_to_self_time is None or (
+            sum(module_name_to_self_time.values()) < sum(fastest_module_name_to_self_time.values())
+        ):
+            fastest_module_name_to_self_time = module_name_to_self_time
+
+    return ScenarioMeasurement(
+        module_name_to_self_time=fastest_module_name_to_self_time,
+        excluded_module_names=sorted(
+            module_name for module_name in fastest_module_name_to_self_time
+            if _is_excluded(module_name=module_name, excluded_modules=scenario.excluded_modules)
+        )
+    )
+
+
+def write_budget_lnk_file(directory: Path) -> Path:
+    """
+    Write the LNK file given to the scenarios.
+
+    :param directory: The directory in which to write the file.
+    :return: The path of the file.
+    """
+
+    lnk_path = directory / 'budget.lnk'
+    lnk_path.write_bytes(make_shell_link_bytes(index=0, parameters=CorpusParameters()))
+
+    return lnk_path
+
+
+def main() -> int:
+    argument_parser = ArgumentParser(description='Measure the import time of the command-line interface.')
+    argument_parser.add_argument(
+        '-n', '--repeat',
+        help='The number of times each scenario is run; the fastest run is kept.',
+        type=int,
+        default=10
+    )
+    argument_parser.add_argument(
+        '--budget-scale',
+        help='The factor by which the budgets are multiplied, for slower machines.',
+        type=float,
+        default=1.0
+    )
+    argument_parser.add_argument(
+        '--top',
+        help='The number of modules with the largest self times to list for each scenario.',
+        type=int,
+        default=0
+    )
+    args = argument_parser.parse_args()
+
+    interpreter_module_names = measure_interpreter_module_names()
+
+    num_failures = 0
+    with TemporaryDirectory() as temporary_directory:
+        lnk_path = write_budget_lnk_file(directory=Path(temporary_directory))
+
+        for scenario in SCENARIOS:
+            measurement = measure_scenario(
+                scenario=scenario,
+                lnk_path=lnk_path,
+                interpreter_module_names=interpreter_module_names,
+                repeat=args.repeat
+            )
+
+            budget_ms = scenario.budget_ms * args.budget_scale
+            is_failure = measurement.time_ms > budget_ms or bool(measurement.excluded_module_names)
+            num_failures += is_failure
+
+            stdout.write(
+                f'{scenario.name:<10} {measurement.time_ms:>8.1f} ms  budget {budget_ms:>6.1f} ms  '
+                f'{len(measurement.module_name_to_self_time):>4} modules  {"FAIL" if is_failure else "ok"}\n'
+            )
+            if measurement.excluded_module_names:
+                stdout.write(f'  excluded modules imported: {", ".join(measurement.excluded_module_names)}\n')
+
+            for module_name, self_time in sorted(
+                measurement.module_name_to_self_time.items(),
+                key=lambda item: item[1],
+                reverse=True
+            )[:args.top]:
+                stdout.write(f'  {self_time / 1000:>8.2f} ms  {module_name}\n')
+
+    return 1 if num_failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Measure the memory retained by parsed shell links.
+
+A synthetic corpus of shell links is parsed, and all of the parsed shell links are kept alive, as when correlating a
+large collection. The retained bytes per shell link are measured with `tracemalloc`, and the peak resident set size of
+the process is reported. Run from the root of the repository:
+
+    $ python benchmarks/memory.py --count 100000
+"""
+
+from argparse import ArgumentParser
+from gc import collect
+from pathlib import Path
+from resource import getrusage, RUSAGE_SELF
+from sys import path as sys_path
+from time import perf_counter
+from tracemalloc import start as tracemalloc_start, stop as tracemalloc_stop, get_traced_memory
+
+sys_path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lnk_parser.structures.shell_link import ShellLink
+from benchmarks.synthetic import make_synthetic_shell_link
+
+
+def main():
+    argument_parser = ArgumentParser(description='Measure the memory retained by parsed shell links.')
+    argument_parser.add_argument(
+        '-n', '--count',
+        help='The number of shell links to parse and keep.',
+        type=int,
+        default=100_000
+    )
+    argument_parser.add_argument(
+        '--no-tracemalloc',
+        help='Do not trace allocations, measuring only the peak resident set size (which tracing inflates).',
+        action='store_true'
+    )
+    args = argument_parser.parse_args()
+
+    corpus: list[bytes] = [make_synthetic_shell_link(index=index) for index in range(args.count)]
+    corpus_size = sum(len(data) for data in corpus)
+
+    collect()
+
+    if not args.no_tracemalloc:
+        tracemalloc_start()
+
+    start_time = perf_counter()
+    shell_links: list[ShellLink] = [ShellLink.from_bytes(data=data) for data in corpus]
+    elapsed = perf_counter() - start_time
+
+    collect()
+
+    print(f'Shell links: {len(shell_links)}')
+    print(f'Corpus size: {corpus_size} bytes ({corpus_size / len(corpus):.0f} bytes per shell link)')
+    print(f'Parse time: {elapsed:.2f} s ({elapsed / len(corpus) * 1e6:.1f} us per shell link)')
+
+    if not args.no_tracemalloc:
+        retained, _ = get_traced_memory()
+        tracemalloc_stop()
+        print(f'Retained: {retained} bytes ({retained / len(shell_links):.0f} bytes per shell link)')
+
+    # `ru_maxrss` is in kibibytes on Linux.
+    print(f'Peak RSS: {getrusage(RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+"""
+Measure the time spent in each stage of parsing and rendering shell links.
+
+The `run` command parses a corpus and writes, for each stage, the time per item and the items per second as JSON. The
+items are shell links, except for the string data stage (string data fields) and the extra data stages (blocks of each
+class). The corpus is synthetic by default: typical shell links, shell links with long target ID lists and shell links
+with property-store-heavy extra data. A directory of real LNK files can be used instead.
+
+The `compare` command compares the results of two runs and exits with a non-zero status if a stage has become slower
+than the threshold allows. Run from the root of the repository:
+
+    $ python benchmarks/stages.py run --output baseline.json
+    $ python benchmarks/stages.py run --output current.json
+    $ python benchmarks/stages.py compare baseline.json current.json
+"""
+
+from __future__ import annotations
+from argparse import ArgumentParser, Namespace
+from collections import defaultdict
+from json import dump as json_dump, load as json_load
+from pathlib import Path
+from platform import python_version, platform
+from sys import path as sys_path, stdout, stderr
+from time import perf_counter_ns
+from typing import Any, Callable
+
+sys_path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.structures.link_target_id_list import LinkTargetIDList
+from lnk_parser.structures.link_info import LinkInfo
+from lnk_parser.structures.lazy_shell_link import LazyShellLink
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.extra_data import ExtraData, UnsupportedExtraData
+from lnk_parser.rendering import render_ndjson
+from lnk_parser.utils import _decode_string_data_field, resolve_encoding
+from benchmarks.synthetic import make_synthetic_shell_link
+
+# The name of each synthetic corpus part and the arguments with which its shell links are made.
+SYNTHETIC_CORPUS_PARTS: dict[str, dict[str, int]] = {
+    'typical': dict(num_directories=2, num_properties=1),
+    'long_id_list': dict(num_directories=40, num_properties=1),
+    'property_store_heavy': dict(num_directories=2, num_properties=200)
+}
+
+
+def _is_parseable(data: bytes, system_default_encoding: str | None) -> bool:
+    try:
+        ShellLink.from_bytes(data=data, system_default_encoding=system_default_encoding)
+    except Exception:
+        return False
+
+    return True
+
+
+def _make_corpus(args: Namespace) -> list[bytes]:
+    if args.corpus_dir is not None:
+        # The files that cannot be parsed have no stages to time.
+        corpus = [path.read_bytes() for path in sorted(args.corpus_dir.rglob('*')) if path.is_file()]
+        parseable_corpus = [
+            data for data in corpus if _is_parseable(data=data, system_default_encoding=args.system_encoding)
+        ]
+        if num_skipped := len(corpus) - len(parseable_corpus):
+            stderr.write(f'Skipped {num_skipped} files that could not be parsed.\n')
+
+        return parseable_corpus
+
+    return [
+        make_synthetic_shell_link(index=index, **part_kwargs)
+        for part_kwargs in SYNTHETIC_CORPUS_PARTS.values()
+        for index in range(args.count)
+    ]
+
+
+def _time_calls(calls: list[Callable[[], Any]], repeat: int) -> float:
+    """
+    Time a list of calls.
+
+    :param calls: The calls to be timed.
+    :param repeat: The number of times to time the calls.
+    :return: The lowest total duration of the calls, in nanoseconds.
+    """
+
+    best = None
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        for call in calls:
+            call()
+        duration = perf_counter_ns() - start
+        best = duration if best is None else min(best, duration)
+
+    return best
+
+
+def _make_stage_calls(
+    corpus: list[bytes],
+    system_default_encoding: str | None = None
+) -> dict[str, list[Callable[[], Any]]]:
+    """
+    Make the calls of each stage, one for each item of the stage in the corpus.
+
+    :param corpus: The shell links of the corpus.
+    :param system_default_encoding: The default encoding on the system on which the shell links were generated.
+    :return: A map from the name of each stage to its calls.
+    """
+
+    encoding = resolve_encoding(system_default_encoding)
+    stage_calls: dict[str, list[Callable[[], Any]]] = defaultdict(list)
+
+    for data in corpus:
+        lazy_shell_link = LazyShellLink.from_bytes(data=data, system_default_encoding=encoding)
+        shell_link = ShellLink.from_bytes(data=data, system_default_encoding=encoding)
+
+        stage_calls['header'].append(lambda data=data: ShellLinkHeader.from_bytes(data=data))
+
+        if (offset := lazy_shell_link.link_target_id_list_offset) is not None:
+            stage_calls['link_target_id_list'].append(
+                lambda data=data, offset=offset: LinkTargetIDList.from_bytes(
+                    data=data,
+                    base_offset=offset,
+                    system_default_encoding=encoding
+                )
+            )
+
+        if (offset := lazy_shell_link.link_info_offset) is not None:
+            stage_calls['link_info'].append(
+                lambda data=data, offset=offset: LinkInfo.from_bytes(
+                    data=data,
+                    base_offset=offset,
+                    system_default_encoding=encoding
+                )
+            )
+
+        is_unicode = bool(lazy_shell_link.link_flags_value & LinkFlags.IsUnicode)
+        for offset in lazy_shell_link.string_data_offsets.values():
+            stage_calls['string_data'].append(
+                lambda data=data, offset=offset, is_unicode=is_unicode: _decode_string_data_field(
+                    buffer=data,
+                    is_unicode=is_unicode,
+                    offset=offset,
+                    system_default_encoding=encoding
+                )
+            )
+
+        offset = lazy_shell_link.extra_data_offset
+        for extra_data in shell_link.extra_data_list:
+            # The blocks of unsupported signatures are kept undecoded, by `UnsupportedExtraData`; `ExtraData.from_bytes`
+            # would fail to look up a class for them.
+            extra_data_class = UnsupportedExtraData if isinstance(extra_data, UnsupportedExtraData) else ExtraData
+            stage_calls[f'extra_data.{extra_data.__class__.__name__}'].append(
+                lambda data=data, offset=offset, extra_data_class=extra_data_class: extra_data_class.from_bytes(
+                    data=data,
+                    base_offset=offset
+                )
+            )
+            offset += extra_data.size
+
+        stage_calls['shell_link'].append(
+            lambda data=data: ShellLink.from_bytes(data=data, system_default_encoding=encoding)
+        )
+        stage_calls['render_text'].append(lambda shell_link=shell_link: str(shell_link))
+        stage_calls['render_ndjson'].append(lambda shell_link=shell_link: render_ndjson('', shell_link))
+
+    return stage_calls
+
+
+def run(args: Namespace) -> None:
+    corpus = _make_corpus(args=args)
+
+    stages: dict[str, dict[str, float | int]] = {}
+    for stage_name, calls in _make_stage_calls(
+        corpus=corpus,
+        system_default_encoding=args.system_encoding
+    ).items():
+        duration_ns = _time_calls(calls=calls, repeat=args.repeat)
+        stages[stage_name] = {
+            'num_items': len(calls),
+            'us_per_item': duration_ns / len(calls) / 1000,
+            'items_per_second': len(calls) / (duration_ns / 1e9) if duration_ns else float('inf')
+        }
+
+    results = {
+        'metadata': {
+            'python_version': python_version(),
+            'platform': platform(),
+            'corpus': str(args.corpus_dir) if args.corpus_dir is not None else 'synthetic',
+            'num_shell_links': len(corpus),
+            'system_encoding': resolve_encoding(args.system_encoding),
+            'repeat': args.repeat
+        },
+        'stages': stages
+    }
+
+    if args.output is not None:
+        with open(args.output, 'w') as output_file:
+            json_dump(results, output_file, indent=4)
+            output_file.write('\n')
+
+    for stage_name, stage in stages.items():
+        stdout.write(
+            f'{stage_name:<40} {stage["us_per_item"]:>12.2f} us/item {stage["items_per_second"]:>14.0f} items/s\n'
+        )
+
+
+def compare(args: Namespace) -> int:
+    with open(args.baseline) as baseline_file:
+        baseline_stages: dict[str, dict[str, float]] = json_load(baseline_file)['stages']
+
+    with open(args.current) as current_file:
+        current_stages: dict[str, dict[str, float]] = json_load(current_file)['stages']
+
+    num_regressions = 0
+    for stage_name, current_stage in current_stages.items():
+        if (baseline_stage := baseline_stages.get(stage_name)) is None:
+            stdout.write(f'{stage_name:<40} {"":>12} {current_stage["us_per_item"]:>12.2f} us/item  (new)\n')
+            continue
+
+        ratio = current_stage['us_per_item'] / baseline_stage['us_per_item']
+        if is_regression := ratio > 1 + args.threshold:
+            num_regressions += 1
+
+        stdout.write(
+            f'{stage_name:<40} {baseline_stage["us_per_item"]:>12.2f} {current_stage["us_per_item"]:>12.2f} us/item'
+            f' {ratio - 1:>+8.1%}{"  REGRESSION" if is_regression else ""}\n'
+        )
+
+    for stage_name in baseline_stages.keys() - current_stages.keys():
+        stdout.write(f'{stage_name:<40} (missing from the current results)\n')
+
+    return 1 if num_regressions else 0
+
+
+def main() -> int:
+    argument_parser = ArgumentParser(description='Measure the time spent in each stage of parsing shell links.')
+    subparsers = argument_parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmark.')
+    run_parser.add_argument(
+        '-n', '--count',
+        help='The number of shell links in each part of the synthetic corpus.',
+        type=int,
+        default=200
+    )
+    run_parser.add_argument(
+        '--corpus-dir',
+        help='A directory of LNK files to be used as the corpus instead of the synthetic one.',
+        type=Path
+    )
+    run_parser.add_argument(
+        '--system-encoding',
+        help=(
+            'The default encoding on the system on which the LNK files of the corpus were generated, with which their'
+            ' strings that are not Unicode-encoded are decoded. Defaults to the encoding of the current system.'
+        )
+    )
+    run_parser.add_argument(
+        '-r', '--repeat',
+        help='The number of times each stage is timed; the fastest time is kept.',
+        type=int,
+        default=5
+    )
+    run_parser.add_argument('-o', '--output', help='The path of a JSON file in which to store the results.', type=Path)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare results against a baseline.')
+    compare_parser.add_argument('baseline', help='The path of the JSON file of the baseline results.', type=Path)
+    compare_parser.add_argument('current', help='The path of the JSON file of the current results.', type=Path)
+    compare_parser.add_argument(
+        '-t', '--threshold',
+        help='The relative slowdown of a stage above which it is flagged as a regression.',
+        type=float,
+        default=0.1
+    )
+
+    args = argument_parser.parse_args()
+
+    if args.command == 'run':
+        run(args=args)
+        return 0
+    else:
+        return compare(args=args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic shell links for the benchmarks.
+
+Each shell link has a target ID list (root folder, volume and file entry shell items with extension blocks), a link
+info structure, string data and special folder, known folder, tracker and property store extra data blocks. The names,
+times and identifiers vary with the index of the shell link, so that the parsed shell links share no strings. The
+depth of the target path and the number of properties can be raised to make ID-list-heavy and property-store-heavy
+shell links.
+"""
+
+from struct import pack
+from uuid import UUID
+
+_LINK_CLSID = UUID('00021401-0000-0000-C000-000000000046')
+_MY_COMPUTER_CLSID = UUID('20d04fe0-3aea-1069-a2d8-08002b30309d')
+_SUMMARY_INFORMATION_FORMAT_ID = UUID('46588ae2-4cbc-4338-bbfc-139326986dce')
+
+# HasLinkTargetIDList, HasLinkInfo, HasArguments, HasIconLocation and IsUnicode.
+_LINK_FLAGS = 0x01 | 0x02 | 0x20 | 0x40 | 0x80
+
+_BASE_FILETIME = 132_000_000_000_000_000
+
+
+def _utf16(string: str) -> bytes:
+    return string.encode('utf-16-le')
+
+
+def _shell_item(data: bytes) -> bytes:
+    return pack('<H', len(data) + 2) + data
+
+
+def _file_entry_extension_block(name: str) -> bytes:
+    body = (
+        pack('<HI', 9, 0xbeef0004)
+        + pack('<HHHH', 0x5021, 0, 0x5021, 0)
+        + bytes(4)
+        + bytes(8) + bytes(8)
+        + pack('<H', 0)
+        + bytes(8)
+        + _utf16(name) + b'\x00\x00'
+        + pack('<H', 20)
+    )
+    return pack('<H', len(body) + 2) + body
+
+
+def _file_entry_shell_item(name: str, is_directory: bool) -> bytes:
+    data = (
+        bytes([0x31 if is_directory else 0x32, 0])
+        + pack('<IHHH', 0 if is_directory else 4096, 0x5021, 0, 0x10 if is_directory else 0x20)
+        + name.encode('ascii') + b'\x00'
+    )
+    if len(data) % 2:
+        data += b'\x00'
+    return _shell_item(data + _file_entry_extension_block(name=name))
+
+
+def _string_data(string: str) -> bytes:
+    return pack('<H', len(string)) + _utf16(string)
+
+
+def _property_value(property_id: int, string: str) -> bytes:
+    value_bytes = pack('<I', len(string) + 1) + _utf16(string) + b'\x00\x00'
+    return pack('<IIB', 13 + len(value_bytes), property_id, 0) + pack('<HH', 0x1F, 0) + value_bytes
+
+
+def make_synthetic_shell_link(index: int, num_directories: int = 2, num_properties: int = 1) -> bytes:
+    """
+    Make the bytes of a synthetic shell link.
+
+    :param index: The index of the shell link, from which its varying contents are derived.
+    :param num_directories: The number of directories in the target path, each becoming a file entry shell item.
+    :param num_properties: The number of properties in the property store.
+    :return: The bytes of the shell link.
+    """
+
+    directory_names = ['Users'] + [f'dir{index:08d}-{level}' for level in range(1, num_directories)]
+    directory_path = '\\'.join(directory_names)
+    file_name = f'file{index:08d}.exe'
+
+    header = (
+        pack('<I', 0x4C) + _LINK_CLSID.bytes_le
+        + pack('<II', _LINK_FLAGS, 0x20)
+        + pack('<QQQ', _BASE_FILETIME + index, _BASE_FILETIME + 2 * index, _BASE_FILETIME + 3 * index)
+        + pack('<IiI', 4096, 0, 1)
+        + bytes(2) + bytes(10)
+    )
+
+    shell_items = (
+        _shell_item(bytes([0x1f, 0x50]) + _MY_COMPUTER_CLSID.bytes_le)
+        + _shell_item(bytes([0x2f]) + b'C:\\' + bytes(19))
+        + b''.join(_file_entry_shell_item(name=name, is_directory=True) for name in directory_names)
+        + _file_entry_shell_item(name=file_name, is_directory=False)
+    )
+    link_target_id_list = pack('<H', len(shell_items) + 2) + shell_items + b'\x00\x00'
+
+    volume_label = f'VOL{index % 100:02d}'.encode('ascii') + b'\x00'
+    volume_id = pack('<IIII', 16 + len(volume_label), 3, index & 0xFFFFFFFF, 16) + volume_label
+    local_base_path = f'C:\\{directory_path}\\{file_name}'.encode('ascii') + b'\x00'
+    common_path_suffix = b'\x00'
+    link_info_header_size = 0x1C
+    local_base_path_offset = link_info_header_size + len(volume_id)
+    common_path_suffix_offset = local_base_path_offset + len(local_base_path)
+    link_info = (
+        pack(
+            '<IIIIIII',
+            common_path_suffix_offset + len(common_path_suffix),
+            link_info_header_size,
+            1,
+            link_info_header_size,
+            local_base_path_offset,
+            0,
+            common_path_suffix_offset
+        )
+        + volume_id + local_base_path + common_path_suffix
+    )
+
+    string_data = _string_data(f'/c start {file_name}') + _string_data(f'C:\\{directory_path}\\icon.ico')
+
+    special_folder_data_block = pack('<IIII', 0x10, 0xA0000005, 37, 221)
+    known_folder_data_block = pack('<II', 0x1C, 0xA000000B) + index.to_bytes(16, 'little') + pack('<I', 221)
+    tracker_data_block = (
+        pack('<IIII', 0x60, 0xA0000003, 0x58, 0)
+        + f'host{index % 1000:03d}'.encode('ascii').ljust(16, b'\x00')
+        + b''.join(UUID(int=(index << 2) | i).bytes_le for i in range(4))
+    )
+
+    property_values = b''.join(
+        _property_value(property_id=4 + i, string=f'S-1-5-21-{index}-{i}') for i in range(num_properties)
+    )
+    property_storage_body = b'1SPS' + _SUMMARY_INFORMATION_FORMAT_ID.bytes_le + property_values + bytes(4)
+    property_storage = pack('<I', len(property_storage_body) + 4) + property_storage_body
+    property_store_body = property_storage + bytes(4)
+    property_store_data_block = pack('<II', len(property_store_body) + 8, 0xA0000009) + property_store_body
+
+    return (
+        header
+        + link_target_id_list
+        + link_info
+        + string_data
+        + special_folder_data_block
+        + known_folder_data_block
+        + tracker_data_block
+        + property_store_data_block
+        + bytes(4)
+    )
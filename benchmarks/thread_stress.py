@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""
+Parse shell links from many threads at once, checking that each parse is unaffected by the others.
+
+The corpus is a synthetic one whose shell links vary in shape (Unicode or not, target path depth, number of
+properties), so that threads parsing at the same time advance through structures of different sizes. Each parsed shell
+link is serialized again and compared with the bytes it was parsed from, which the corpus guarantees to be equal. The
+thread switch interval is lowered to make interleavings frequent. The parse rate is reported for each number of
+threads; it only increases with the number of threads on free-threaded builds of CPython. Run from the root of the
+repository:
+
+    $ python benchmarks/thread_stress.py --count 2000 --threads 1 2 4 8
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sys import path as sys_path, setswitchinterval, getswitchinterval
+from time import perf_counter
+
+sys_path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.corpus import CorpusParameters, make_shell_link_bytes
+
+
+def _check_shell_links(corpus: list[bytes], system_default_encoding: str, start: int) -> int:
+    """
+    Parse the shell links of the corpus, starting at an index and wrapping around, and check each one.
+
+    :param corpus: The bytes of the shell links.
+    :param system_default_encoding: The encoding of the strings that are not Unicode-encoded.
+    :param start: The index of the first shell link to parse.
+    :return: The number of shell links that were not parsed correctly.
+    """
+
+    num_failures = 0
+    for index in range(len(corpus)):
+        data = corpus[(start + index) % len(corpus)]
+        try:
+            shell_link = ShellLink.from_bytes(data=data, system_default_encoding=system_default_encoding)
+            if shell_link.to_bytes(system_default_encoding=system_default_encoding) != data:
+                num_failures += 1
+        except Exception:
+            num_failures += 1
+
+    return num_failures
+
+
+def main() -> int:
+    argument_parser = ArgumentParser(description='Parse shell links from many threads at once, checking each parse.')
+    argument_parser.add_argument(
+        '-n', '--count',
+        help='The number of shell links in the corpus.',
+        type=int,
+        default=2000
+    )
+    argument_parser.add_argument(
+        '-t', '--threads',
+        help='The numbers of threads with which to parse the corpus.',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8]
+    )
+    argument_parser.add_argument(
+        '--switch-interval',
+        help='The thread switch interval, in seconds, while parsing.',
+        type=float,
+        default=1e-6
+    )
+    args = argument_parser.parse_args()
+
+    parameters = CorpusParameters(unicode_ratio=0.5, max_path_depth=12, max_num_properties=40)
+    corpus = [make_shell_link_bytes(index=index, parameters=parameters) for index in range(args.count)]
+
+    original_switch_interval = getswitchinterval()
+    setswitchinterval(args.switch_interval)
+
+    total_failures = 0
+    try:
+        for num_threads in args.threads:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                start_time = perf_counter()
+                # Each thread parses the whole corpus, starting at a different shell link.
+                num_failures = sum(
+                    executor.map(
+                        lambda start: _check_shell_links(
+                            corpus=corpus,
+                            system_default_encoding=parameters.system_default_encoding,
+                            start=start
+                        ),
+                        (thread_index * len(corpus) // num_threads for thread_index in range(num_threads))
+                    )
+                )
+                elapsed = perf_counter() - start_time
+
+            total_failures += num_failures
+            print(
+                f'Threads: {num_threads:>3}  '
+                f'Rate: {num_threads * len(corpus) / elapsed:>9.0f} shell links/s  '
+                f'Failures: {num_failures}'
+            )
+    finally:
+        setswitchinterval(original_switch_interval)
+
+    return 1 if total_failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,22 +1,172 @@
 #!/usr/bin/env python3
 
 from __future__ import annotations
-from typing import Type
+from typing import Type, Any, Callable, Iterable, Iterator, TYPE_CHECKING
 from logging import WARNING, StreamHandler, Formatter
-from sys import stderr
-
-from string_utils_py import text_align_delimiter, underline
+from sys import stderr, stdout
+from functools import reduce
+from operator import or_
+from contextlib import nullcontext, AbstractContextManager
+from itertools import groupby
+from pathlib import Path
 
 from lnk_parser import LOG
 from lnk_parser.cli import LnkParserArgumentParser
-from lnk_parser.structures.shell_link import ShellLink
-from lnk_parser.utils import get_system_default_encoding
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.show_command import ShowCommand
+
+# The modules that parse and render shell links are imported once the arguments have been parsed, so that invocations
+# that end in the argument parser, such as with `--help`, do not pay for importing them; the carving module is only
+# imported when carving, the watching module when watching, and the archive module when archives are provided.
+if TYPE_CHECKING:
+    from lnk_parser.scan import ScanResult
+    from lnk_parser.scan_statistics import ScanStatistics
+    from lnk_parser.header_filter import HeaderFilter
+    from lnk_parser.structures.shell_link import ShellLink
+
+
+def _make_header_filter(args: Type[LnkParserArgumentParser.Namespace]) -> HeaderFilter | None:
+    from lnk_parser.header_filter import HeaderFilter
+
+    time_ranges: dict[str, tuple] = {
+        range_name: (after, before) if after is not None or before is not None else None
+        for range_name, after, before in (
+            ('creation_time_range', args.created_after, args.created_before),
+            ('access_time_range', args.accessed_after, args.accessed_before),
+            ('write_time_range', args.written_after, args.written_before)
+        )
+    }
+
+    header_filter = HeaderFilter(
+        required_link_flags=reduce(or_, (LinkFlags[name] for name in args.has_flags or []), LinkFlags(0)),
+        excluded_link_flags=reduce(or_, (LinkFlags[name] for name in args.lacks_flags or []), LinkFlags(0)),
+        show_commands=frozenset(ShowCommand[name] for name in args.show_commands) if args.show_commands else None,
+        min_file_size=args.min_file_size,
+        max_file_size=args.max_file_size,
+        **time_ranges
+    )
+
+    return header_filter if header_filter != HeaderFilter() else None
+
+
+def _carve_paths(
+    args: Type[LnkParserArgumentParser.Namespace],
+    process: Callable[[str, ShellLink], Any],
+    system_encoding: str,
+    header_filter: HeaderFilter | None
+) -> Iterator[ScanResult]:
+    from lnk_parser.scan import ScanResult
+    from lnk_parser.carving import carve, DEFAULT_CHUNK_SIZE
+
+    for path in args.paths:
+        try:
+            for carve_result in carve(
+                path=path,
+                process=process,
+                num_workers=args.workers,
+                chunk_size=args.carve_chunk_size if args.carve_chunk_size is not None else DEFAULT_CHUNK_SIZE,
+                system_default_encoding=system_encoding,
+                header_filter=header_filter
+            ):
+                yield ScanResult(path=carve_result.path, output=carve_result.output)
+        except OSError as e:
+            yield ScanResult.from_error(path=str(path), error=e)
+
+
+def _scan_archives(
+    paths: Iterable[str],
+    args: Type[LnkParserArgumentParser.Namespace],
+    process: Callable[[str, ShellLink], Any],
+    system_encoding: str,
+    header_filter: HeaderFilter | None,
+    collect_statistics: bool
+) -> Iterator[ScanResult]:
+    from lnk_parser.archive import scan_archive, ArchiveMemberSelector
+
+    selector = ArchiveMemberSelector(include_jump_lists=args.jump_lists, match_signature=args.archive_signature)
+
+    for path in paths:
+        yield from scan_archive(
+            path=path,
+            process=process,
+            num_workers=args.workers,
+            chunk_size=args.chunk_size,
+            system_default_encoding=system_encoding,
+            header_filter=header_filter,
+            selector=selector,
+            collect_statistics=collect_statistics
+        )
+
+
+def _is_archive_path(path: Path) -> bool:
+    from lnk_parser.archive import is_archive_path
+
+    return is_archive_path(path=path) and not path.is_dir()
+
+
+def _write_results(
+    results: Iterable[ScanResult],
+    args: Type[LnkParserArgumentParser.Namespace],
+    scan_statistics: ScanStatistics | None,
+    num_written: int = 0
+) -> int:
+    """
+    Write the outputs of scan results to standard output, logging the errors when writing text, and flush it.
+
+    :param results: The scan results to be written.
+    :param args: The parsed command-line arguments.
+    :param scan_statistics: The statistics to which the results are added, if statistics are reported.
+    :param num_written: The number of outputs written earlier, after the first of which text outputs are separated by
+        blank lines.
+    :return: The number of outputs written, including those written earlier.
+    """
 
-# TODO: Add tests? (pytest)
+    from lnk_parser.rendering import render_ndjson_error
+
+    for result in results:
+        if scan_statistics is not None:
+            scan_statistics.add(result)
+
+        if args.format == 'ndjson':
+            if result.is_error:
+                output = render_ndjson_error(
+                    path=result.path,
+                    error_type=result.error_type,
+                    error_message=result.error_message
+                )
+            else:
+                output = result.output
+
+            stdout.write(f'{output}\n')
+        else:
+            if result.is_error:
+                LOG.error(f'Unable to parse {result.path}: {result.error_type}: {result.error_message}')
+                continue
+
+            stdout.write(f'\n{result.output}\n' if num_written else f'{result.output}\n')
+
+        num_written += 1
+        if num_written % args.flush_interval == 0:
+            stdout.flush()
+
+    stdout.flush()
+
+    return num_written
 
 
 def main():
-    args: Type[LnkParserArgumentParser.Namespace] = LnkParserArgumentParser().parse_args()
+    argument_parser = LnkParserArgumentParser()
+    args: Type[LnkParserArgumentParser.Namespace] = argument_parser.parse_args()
+
+    if args.watch and args.carve:
+        argument_parser.error('--watch is not available when carving.')
+
+    if args.watch and any(_is_archive_path(path=path) for path in args.paths):
+        argument_parser.error('--watch is not available for archives.')
+
+    from lnk_parser.scan import iter_lnk_paths, scan_session
+    from lnk_parser.rendering import render_text, render_ndjson
+    from lnk_parser.utils import get_system_default_encoding
 
     system_encoding = args.system_encoding or get_system_default_encoding()
 
@@ -25,19 +175,106 @@ def main():
     handler.setFormatter(fmt=Formatter(fmt='%(levelname)s: %(message)s'))
     LOG.addHandler(hdlr=handler)
 
-    print(
-        text_align_delimiter(
-            text='\n\n'.join(
-                (
-                    f'{underline(string=lnk_file.name, underline_character="=")}\n'
-                    f'{ShellLink.from_bytes(data=lnk_file.read(), system_default_encoding=system_encoding)}'
-                )
-                for lnk_file in args.lnk_files
-            ),
-            delimiter=': ',
-            put_non_match_after_delimiter=False
+    process = render_ndjson if args.format == 'ndjson' else render_text
+    header_filter = _make_header_filter(args=args)
+
+    if args.stats or args.stats_interval is not None:
+        from lnk_parser.scan_statistics import ScanStatistics, reporting_periodically
+
+        scan_statistics = ScanStatistics(num_slowest=args.stats_top)
+        if args.stats_interval is not None:
+            reporting_context = reporting_periodically(
+                scan_statistics=scan_statistics,
+                interval=args.stats_interval,
+                write=stderr.write
+            )
+        else:
+            reporting_context = nullcontext()
+    else:
+        scan_statistics = None
+        reporting_context = nullcontext()
+
+    def open_scan_session() -> AbstractContextManager[Callable[[Iterable[str]], Iterator[ScanResult]]]:
+        return scan_session(
+            process=process,
+            num_workers=args.workers,
+            ordered=not args.unordered,
+            max_tasks_per_worker=args.max_tasks_per_worker,
+            chunk_size=args.chunk_size,
+            system_default_encoding=system_encoding,
+            header_filter=header_filter,
+            cache_path=args.cache,
+            use_threads=args.threads,
+            collect_statistics=scan_statistics is not None
         )
-    )
+
+    def scan(paths: Iterable[str]) -> Iterator[ScanResult]:
+        with open_scan_session() as scan_batch:
+            yield from scan_batch(paths)
+
+    with reporting_context:
+        if args.carve:
+            _write_results(
+                results=_carve_paths(
+                    args=args,
+                    process=process,
+                    system_encoding=system_encoding,
+                    header_filter=header_filter
+                ),
+                args=args,
+                scan_statistics=scan_statistics
+            )
+        elif args.watch:
+            from lnk_parser.watch import watch_paths
+
+            num_written = 0
+            try:
+                # The pool and the cache are set up once for the whole session; each batch of new and modified files is
+                # scanned with them, and its outputs flushed, as soon as it is complete.
+                with open_scan_session() as scan_batch:
+                    for paths in watch_paths(
+                        paths=args.paths,
+                        recursive=args.recursive,
+                        include_jump_lists=args.jump_lists,
+                        debounce_interval=args.watch_debounce,
+                        use_polling=args.watch_polling,
+                        poll_interval=args.watch_poll_interval
+                    ):
+                        num_written = _write_results(
+                            results=scan_batch(paths),
+                            args=args,
+                            scan_statistics=scan_statistics,
+                            num_written=num_written
+                        )
+            except KeyboardInterrupt:
+                pass
+        else:
+            num_written = 0
+            # The provided paths are scanned in order, the archives among them being read rather than parsed as files.
+            for is_archive, paths in groupby(args.paths, key=lambda path: _is_archive_path(path=path)):
+                if is_archive:
+                    results = _scan_archives(
+                        paths=paths,
+                        args=args,
+                        process=process,
+                        system_encoding=system_encoding,
+                        header_filter=header_filter,
+                        collect_statistics=scan_statistics is not None
+                    )
+                else:
+                    results = scan(
+                        paths=iter_lnk_paths(paths=paths, recursive=args.recursive, include_jump_lists=args.jump_lists)
+                    )
+
+                num_written = _write_results(
+                    results=results,
+                    args=args,
+                    scan_statistics=scan_statistics,
+                    num_written=num_written
+                )
+
+    if scan_statistics is not None:
+        stderr.write(scan_statistics.format_report())
 
 
 if __name__ == '__main__':
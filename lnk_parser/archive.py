@@ -0,0 +1,375 @@
+from __future__ import annotations
+from logging import Logger, getLogger
+from dataclasses import dataclass
+from typing import Any, Callable, Final, Iterator, TYPE_CHECKING
+from os import fspath, PathLike
+from contextlib import nullcontext
+from collections import deque
+from itertools import islice
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.header_filter import HeaderFilter
+from lnk_parser.scan import LNK_FILE_SUFFIX, ScanResult, parse_data
+from lnk_parser.instrumentation import StageDurationCollector, set_collector, collecting
+from lnk_parser.carving import SHELL_LINK_SIGNATURE
+from lnk_parser.jump_list import is_jump_list_path
+
+# The archive modules are imported when an archive is first opened, so that parsing LNK files alone does not pay for
+# importing them.
+if TYPE_CHECKING:
+    from zipfile import ZipFile
+    from multiprocessing.pool import AsyncResult
+
+LOG: Logger = getLogger(__name__)
+
+# Separates the path of an archive from the name of a member within it.
+ARCHIVE_MEMBER_SEPARATOR: Final[str] = '!'
+
+ZIP_SUFFIXES: Final[tuple[str, ...]] = ('.zip',)
+TAR_SUFFIXES: Final[tuple[str, ...]] = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+# A gzip file that is not a tar archive holds a single member, named as the file without the suffix.
+GZIP_SUFFIX: Final[str] = '.gz'
+
+# The largest member that is read into memory; larger members produce an error result.
+MAX_MEMBER_SIZE: Final[int] = 64 * 1024 * 1024
+
+# The number of chunks of members of a streamed archive, per worker process, that are sent to the workers before the
+# results of the first of them are awaited; this bounds the members held in memory however far reading the archive gets
+# ahead of parsing its members.
+MAX_PENDING_CHUNKS_PER_WORKER: Final[int] = 2
+
+# Set in each worker process by `_initialize_worker`, so that only the member names need to be sent with each task.
+_PROCESS: Callable[[str, ShellLink], Any] | None = None
+_SYSTEM_DEFAULT_ENCODING: str | None = None
+_HEADER_FILTER: HeaderFilter | None = None
+_COLLECT_STATISTICS: bool = False
+_SELECTOR: ArchiveMemberSelector | None = None
+_ZIP_FILE: ZipFile | None = None
+
+
+@dataclass(slots=True)
+class ArchiveMember:
+    # The path of the archive followed by `ARCHIVE_MEMBER_SEPARATOR` and the name of the member.
+    path: str
+    data: bytes
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveMemberSelector:
+    """
+    Selects the members of an archive to be parsed: those with the `.lnk` suffix (case-insensitively), those with the
+    suffix of a jump list file if `include_jump_lists` is set, and, if `match_signature` is set, those whose contents
+    begin with the shell link signature, whatever their names.
+    """
+
+    include_jump_lists: bool = False
+    match_signature: bool = False
+
+    def selects_name(self, name: str) -> bool:
+        """
+        Tell whether a member is selected by its name alone.
+
+        :param name: The name of the member.
+        :return: Whether the member is selected by its name.
+        """
+
+        return name.lower().endswith(LNK_FILE_SUFFIX) or (self.include_jump_lists and is_jump_list_path(path=name))
+
+
+def is_archive_path(path: str | PathLike) -> bool:
+    return fspath(path).lower().endswith((*ZIP_SUFFIXES, *TAR_SUFFIXES, GZIP_SUFFIX))
+
+
+def archive_member_path(archive_path: str, member_name: str) -> str:
+    """
+    Make the path by which a member of an archive is referred to.
+
+    :param archive_path: The path of the archive.
+    :param member_name: The name of the member within the archive.
+    :return: The path of the member.
+    """
+
+    return f'{archive_path}{ARCHIVE_MEMBER_SEPARATOR}{member_name}'
+
+
+def _read_member(member_file, selects_name: bool, match_signature: bool) -> bytes | None:
+    """
+    Read a member of an archive, if it is selected.
+
+    At most one byte more than `MAX_MEMBER_SIZE` is read, so that a member whose stated size is wrong, or that
+    decompresses to far more than its compressed size, cannot exhaust the memory.
+
+    :param member_file: A file object of the member.
+    :param selects_name: Whether the member is selected by its name.
+    :param match_signature: Whether a member not selected by its name is selected if it begins with the shell link
+        signature.
+    :return: The bytes of the member, or `None` if it is not selected.
+    """
+
+    if selects_name:
+        prefix = b''
+    elif match_signature:
+        if (prefix := member_file.read(len(SHELL_LINK_SIGNATURE))) != SHELL_LINK_SIGNATURE:
+            return None
+    else:
+        return None
+
+    if len(data := prefix + member_file.read(MAX_MEMBER_SIZE + 1 - len(prefix))) > MAX_MEMBER_SIZE:
+        raise ValueError(f'The member is larger than the limit of {MAX_MEMBER_SIZE} bytes.')
+
+    return data
+
+
+def _iter_zip_members(path: str, selector: ArchiveMemberSelector) -> Iterator[ArchiveMember | ScanResult]:
+    from zipfile import ZipFile
+
+    with ZipFile(path) as zip_file:
+        for zip_info in zip_file.infolist():
+            if zip_info.is_dir():
+                continue
+
+            yield from _read_zip_member(zip_file=zip_file, archive_path=path, name=zip_info.filename, selector=selector)
+
+
+def _read_zip_member(
+    zip_file: ZipFile,
+    archive_path: str,
+    name: str,
+    selector: ArchiveMemberSelector
+) -> Iterator[ArchiveMember | ScanResult]:
+    member_path = archive_member_path(archive_path=archive_path, member_name=name)
+    try:
+        with zip_file.open(name) as member_file:
+            data = _read_member(
+                member_file=member_file,
+                selects_name=selector.selects_name(name=name),
+                match_signature=selector.match_signature
+            )
+    except Exception as e:
+        yield ScanResult.from_error(path=member_path, error=e)
+        return
+
+    if data is not None:
+        yield ArchiveMember(path=member_path, data=data)
+
+
+def _iter_tar_members(path: str, selector: ArchiveMemberSelector) -> Iterator[ArchiveMember | ScanResult]:
+    from tarfile import open as tarfile_open
+
+    # The archive is read as a stream, without seeking, so that compressed archives are decompressed once.
+    with tarfile_open(path, mode='r|*') as tar_file:
+        for tar_info in tar_file:
+            if not tar_info.isfile():
+                continue
+
+            member_path = archive_member_path(archive_path=path, member_name=tar_info.name)
+            try:
+                data = _read_member(
+                    member_file=tar_file.extractfile(tar_info),
+                    selects_name=selector.selects_name(name=tar_info.name),
+                    match_signature=selector.match_signature
+                )
+            except Exception as e:
+                yield ScanResult.from_error(path=member_path, error=e)
+                continue
+
+            if data is not None:
+                yield ArchiveMember(path=member_path, data=data)
+
+
+def _iter_gzip_members(path: str, selector: ArchiveMemberSelector) -> Iterator[ArchiveMember | ScanResult]:
+    from gzip import open as gzip_open
+    from os.path import basename
+
+    name = basename(path)[:-len(GZIP_SUFFIX)]
+    member_path = archive_member_path(archive_path=path, member_name=name)
+
+    try:
+        with gzip_open(path, 'rb') as member_file:
+            data = _read_member(
+                member_file=member_file,
+                selects_name=selector.selects_name(name=name),
+                match_signature=selector.match_signature
+            )
+    except Exception as e:
+        yield ScanResult.from_error(path=member_path, error=e)
+        return
+
+    if data is not None:
+        yield ArchiveMember(path=member_path, data=data)
+
+
+def iter_archive_members(
+    path: str | PathLike,
+    selector: ArchiveMemberSelector = ArchiveMemberSelector()
+) -> Iterator[ArchiveMember | ScanResult]:
+    """
+    Yield the selected members of a zip or tar archive, possibly compressed, or of a gzip file, read into memory.
+
+    The format is determined by the suffix of the path. Tar archives are read as a stream. A member that cannot be read,
+    or that is larger than `MAX_MEMBER_SIZE`, produces a scan result describing the error instead.
+
+    :param path: The path of the archive.
+    :param selector: Selects the members to be read.
+    :return: An iterator of the selected members, and of scan results describing the errors.
+    """
+
+    path = fspath(path)
+    lower_path = path.lower()
+
+    if lower_path.endswith(ZIP_SUFFIXES):
+        return _iter_zip_members(path=path, selector=selector)
+    elif lower_path.endswith(TAR_SUFFIXES):
+        return _iter_tar_members(path=path, selector=selector)
+    elif lower_path.endswith(GZIP_SUFFIX):
+        return _iter_gzip_members(path=path, selector=selector)
+    else:
+        raise ValueError(f'The path {path} does not have the suffix of an archive.')
+
+
+def _initialize_worker(
+    process: Callable[[str, ShellLink], Any] | None,
+    system_default_encoding: str | None,
+    header_filter: HeaderFilter | None,
+    collect_statistics: bool = False,
+    selector: ArchiveMemberSelector | None = None,
+    zip_path: str | None = None
+) -> None:
+    global _PROCESS, _SYSTEM_DEFAULT_ENCODING, _HEADER_FILTER, _COLLECT_STATISTICS, _SELECTOR, _ZIP_FILE
+
+    _PROCESS = process
+    _SYSTEM_DEFAULT_ENCODING = system_default_encoding
+    _HEADER_FILTER = header_filter
+    _COLLECT_STATISTICS = collect_statistics
+    _SELECTOR = selector
+
+    if collect_statistics:
+        set_collector(StageDurationCollector())
+
+    if zip_path is not None:
+        from zipfile import ZipFile
+
+        _ZIP_FILE = ZipFile(zip_path)
+
+
+def _parse_member(member: ArchiveMember | ScanResult) -> list[ScanResult]:
+    if isinstance(member, ScanResult):
+        return [member]
+
+    return parse_data(
+        path=member.path,
+        data=member.data,
+        process=_PROCESS,
+        system_default_encoding=_SYSTEM_DEFAULT_ENCODING,
+        header_filter=_HEADER_FILTER,
+        collect_statistics=_COLLECT_STATISTICS
+    )
+
+
+def _parse_members(members: list[ArchiveMember | ScanResult]) -> list[ScanResult]:
+    return [result for member in members for result in _parse_member(member=member)]
+
+
+def _parse_zip_member(name: str) -> list[ScanResult]:
+    members = _read_zip_member(zip_file=_ZIP_FILE, archive_path=_ZIP_FILE.filename, name=name, selector=_SELECTOR)
+
+    return [result for member in members for result in _parse_member(member=member)]
+
+
+def scan_archive(
+    path: str | PathLike,
+    process: Callable[[str, ShellLink], Any] | None = None,
+    num_workers: int = 1,
+    chunk_size: int = 16,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    selector: ArchiveMemberSelector = ArchiveMemberSelector(),
+    collect_statistics: bool = False
+) -> Iterator[ScanResult]:
+    """
+    Parse the LNK files, and jump list files, within a zip or tar archive, possibly compressed, or a gzip file, without
+    extracting them to disk.
+
+    Each selected member is read into memory and parsed as by `parse_data`, and is referred to by the path of the
+    archive followed by `!` and the name of the member. The members of a zip archive are compressed independently, and
+    are read, decompressed and parsed by the workers, each having the archive open. A tar archive is read and
+    decompressed as a stream in the current process, and its members are parsed by the workers, with a bounded number of
+    them held in memory at once. The results are produced in the order of the members. An archive that cannot be read
+    produces a result describing the error.
+
+    :param path: The path of the archive.
+    :param process: A function applied to the path and the shell link of each parsed member, in the worker, whose return
+        value becomes the output of the result. Must be picklable, and return a picklable value, when more than one
+        worker is used. Defaults to producing the shell link itself.
+    :param num_workers: The number of worker processes. With one worker, the archive is parsed in the current process.
+    :param chunk_size: The number of members sent to a worker process at a time.
+    :param system_default_encoding: The default encoding on the system on which the LNK files were generated.
+    :param header_filter: A filter evaluated on the header of each LNK file before it is parsed.
+    :param selector: Selects the members to be parsed.
+    :param collect_statistics: Whether to attach the statistics of parsing each member, including the time of each
+        parse stage, to its first result. The time of reading and decompressing the members is not included.
+    :return: An iterator of scan results.
+    """
+
+    path = fspath(path)
+    is_zip = path.lower().endswith(ZIP_SUFFIXES)
+
+    try:
+        if is_zip and num_workers > 1:
+            from zipfile import ZipFile
+
+            # The members are selected by their names here, or else by their signatures in the workers.
+            with ZipFile(path) as zip_file:
+                names = [
+                    zip_info.filename for zip_info in zip_file.infolist()
+                    if not zip_info.is_dir() and (selector.match_signature or selector.selects_name(zip_info.filename))
+                ]
+
+            from multiprocessing import Pool
+
+            with Pool(
+                processes=num_workers,
+                initializer=_initialize_worker,
+                initargs=(process, system_default_encoding, header_filter, collect_statistics, selector, path)
+            ) as pool:
+                for results in pool.imap(_parse_zip_member, names, chunksize=chunk_size):
+                    yield from results
+        elif num_workers > 1:
+            from multiprocessing import Pool
+
+            with Pool(
+                processes=num_workers,
+                initializer=_initialize_worker,
+                initargs=(process, system_default_encoding, header_filter, collect_statistics)
+            ) as pool:
+                # The members are sent to the workers a chunk at a time, keeping at most `MAX_PENDING_CHUNKS_PER_WORKER`
+                # chunks per worker in flight; `Pool.imap` would consume the members as fast as they can be read.
+                members = iter_archive_members(path=path, selector=selector)
+                pending_results: deque[AsyncResult] = deque()
+                while chunk := list(islice(members, chunk_size)):
+                    if len(pending_results) >= num_workers * MAX_PENDING_CHUNKS_PER_WORKER:
+                        yield from pending_results.popleft().get()
+
+                    pending_results.append(pool.apply_async(_parse_members, (chunk,)))
+
+                while pending_results:
+                    yield from pending_results.popleft().get()
+        else:
+            # The settings are passed to each parse rather than set as the worker globals, so that scans made
+            # concurrently within the current process do not interfere with each other.
+            with collecting(StageDurationCollector()) if collect_statistics else nullcontext():
+                for member in iter_archive_members(path=path, selector=selector):
+                    if isinstance(member, ScanResult):
+                        yield member
+                        continue
+
+                    yield from parse_data(
+                        path=member.path,
+                        data=member.data,
+                        process=process,
+                        system_default_encoding=system_default_encoding,
+                        header_filter=header_filter,
+                        collect_statistics=collect_statistics
+                    )
+    except Exception as e:
+        yield ScanResult.from_error(path=path, error=e)
@@ -0,0 +1,247 @@
+"""
+An asyncio interface to parsing LNK files.
+
+The reading and parsing are run in an executor, so that the event loop is not blocked. With the default executor (a
+thread pool) the event loop stays responsive, but the parsing is bound by the GIL; a `ProcessPoolExecutor` parses at the
+speed of several processes, provided that the `process` function and its return values are picklable.
+
+The number of files being parsed at a time is bounded; the sources of paths or bytes are not consumed further until a
+slot is free, which propagates backpressure to the producers.
+"""
+
+from __future__ import annotations
+from logging import Logger, getLogger
+from asyncio import get_running_loop, wait, Future, FIRST_COMPLETED
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from os import cpu_count, fspath, PathLike
+from typing import Any, AsyncIterable, AsyncIterator, ByteString, Callable, Iterable, TypeVar
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.header_filter import HeaderFilter
+from lnk_parser.scan import ScanResult, parse_path, parse_data
+
+LOG: Logger = getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def _default_max_concurrency() -> int:
+    return 2 * (cpu_count() or 1)
+
+
+async def _aiter(items: AsyncIterable[T] | Iterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _map_in_executor(
+    function: Callable[..., list[ScanResult]],
+    arguments_iterable: AsyncIterable[tuple] | Iterable[tuple],
+    executor: Executor | None,
+    max_concurrency: int | None,
+    ordered: bool
+) -> AsyncIterator[ScanResult]:
+    """
+    Apply a function to each tuple of arguments in an executor, with a bounded number of calls in progress.
+
+    :param function: A function producing a list of scan results.
+    :param arguments_iterable: The positional arguments of each call.
+    :param executor: The executor in which to run the calls. Defaults to the event loop's default executor.
+    :param max_concurrency: The largest number of calls in progress at a time. Defaults to twice the number of CPUs.
+    :param ordered: Whether to produce the results in the order of the arguments rather than in order of completion.
+    :return: An asynchronous iterator of the scan results of the calls.
+    """
+
+    loop = get_running_loop()
+    max_concurrency = max_concurrency or _default_max_concurrency()
+
+    pending: deque[Future] | set[Future] = deque() if ordered else set()
+
+    try:
+        async for arguments in _aiter(arguments_iterable):
+            if len(pending) >= max_concurrency:
+                if ordered:
+                    for result in await pending.popleft():
+                        yield result
+                else:
+                    done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for result in future.result():
+                            yield result
+
+            future = loop.run_in_executor(executor, function, *arguments)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+
+        if ordered:
+            while pending:
+                for result in await pending.popleft():
+                    yield result
+        else:
+            while pending:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        yield result
+    finally:
+        # Calls that have not started are not run if the iteration is stopped early.
+        for future in pending:
+            future.cancel()
+
+
+async def parse_path_async(
+    path: str | PathLike,
+    process: Callable[[str, ShellLink], Any] | None = None,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    executor: Executor | None = None
+) -> list[ScanResult]:
+    """
+    Read and parse the LNK file at a path, or each of the LNK files embedded in the jump list file at a path, in an
+    executor.
+
+    :param path: The path of an LNK file or a jump list file.
+    :param process: A function applied to the path and the shell link of each parsed file, in the executor, whose return
+        value becomes the output of the result. Defaults to producing the shell link itself.
+    :param system_default_encoding: The default encoding on the system on which the LNK file was generated.
+    :param header_filter: A filter evaluated on the header of each LNK file before it is parsed.
+    :param executor: The executor in which to read and parse the file. Defaults to the event loop's default executor.
+    :return: The results of the file, as produced by `lnk_parser.scan.parse_path`.
+    """
+
+    return await get_running_loop().run_in_executor(
+        executor,
+        partial(
+            parse_path,
+            path=fspath(path),
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        )
+    )
+
+
+async def parse_data_async(
+    path: str,
+    data: ByteString | memoryview,
+    process: Callable[[str, ShellLink], Any] | None = None,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    executor: Executor | None = None
+) -> list[ScanResult]:
+    """
+    Parse the bytes of an LNK file in an executor.
+
+    :param path: The path, or another name, by which the LNK file is referred to in its result.
+    :param data: The bytes of the LNK file.
+    :param process: A function applied to the path and the shell link of the parsed file, in the executor, whose return
+        value becomes the output of the result. Defaults to producing the shell link itself.
+    :param system_default_encoding: The default encoding on the system on which the LNK file was generated.
+    :param header_filter: A filter evaluated on the header of the LNK file before it is parsed.
+    :param executor: The executor in which to parse the file. Defaults to the event loop's default executor.
+    :return: The result of the file, as produced by `lnk_parser.scan.parse_data`.
+    """
+
+    return await get_running_loop().run_in_executor(
+        executor,
+        partial(
+            parse_data,
+            path=path,
+            data=data,
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        )
+    )
+
+
+async def scan_paths_async(
+    paths: AsyncIterable[str | PathLike] | Iterable[str | PathLike],
+    process: Callable[[str, ShellLink], Any] | None = None,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    executor: Executor | None = None,
+    max_concurrency: int | None = None,
+    ordered: bool = True
+) -> AsyncIterator[ScanResult]:
+    """
+    Read and parse LNK files, or the LNK files embedded in jump list files, in an executor.
+
+    :param paths: The paths of the LNK files, or jump list files, to be parsed.
+    :param process: A function applied to the path and the shell link of each parsed file, in the executor, whose return
+        value becomes the output of the result. Defaults to producing the shell link itself.
+    :param system_default_encoding: The default encoding on the system on which the LNK files were generated.
+    :param header_filter: A filter evaluated on the header of each LNK file before it is parsed; files whose headers do
+        not match are skipped without producing a result.
+    :param executor: The executor in which to read and parse the files. Defaults to the event loop's default executor.
+    :param max_concurrency: The largest number of files being read or parsed at a time. Defaults to twice the number of
+        CPUs.
+    :param ordered: Whether to produce the results in the order of `paths` rather than in order of completion.
+    :return: An asynchronous iterator of scan results.
+    """
+
+    function = partial(
+        parse_path,
+        process=process,
+        system_default_encoding=system_default_encoding,
+        header_filter=header_filter
+    )
+
+    async for result in _map_in_executor(
+        function=function,
+        arguments_iterable=((fspath(path),) async for path in _aiter(paths)),
+        executor=executor,
+        max_concurrency=max_concurrency,
+        ordered=ordered
+    ):
+        yield result
+
+
+async def scan_data_async(
+    items: AsyncIterable[tuple[str, ByteString]] | Iterable[tuple[str, ByteString]],
+    process: Callable[[str, ShellLink], Any] | None = None,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    executor: Executor | None = None,
+    max_concurrency: int | None = None,
+    ordered: bool = True
+) -> AsyncIterator[ScanResult]:
+    """
+    Parse the bytes of LNK files, such as ones received over the network, in an executor.
+
+    :param items: The path, or another name, and the bytes of each LNK file.
+    :param process: A function applied to the path and the shell link of each parsed file, in the executor, whose return
+        value becomes the output of the result. Defaults to producing the shell link itself.
+    :param system_default_encoding: The default encoding on the system on which the LNK files were generated.
+    :param header_filter: A filter evaluated on the header of each LNK file before it is parsed; files whose headers do
+        not match are skipped without producing a result.
+    :param executor: The executor in which to parse the files. Defaults to the event loop's default executor.
+    :param max_concurrency: The largest number of files being parsed at a time. Defaults to twice the number of CPUs.
+    :param ordered: Whether to produce the results in the order of `items` rather than in order of completion.
+    :return: An asynchronous iterator of scan results.
+    """
+
+    function = partial(
+        parse_data,
+        process=process,
+        system_default_encoding=system_default_encoding,
+        header_filter=header_filter
+    )
+
+    async for result in _map_in_executor(
+        function=function,
+        arguments_iterable=_aiter(items),
+        executor=executor,
+        max_concurrency=max_concurrency,
+        ordered=ordered
+    ):
+        yield result
+
@@ -0,0 +1,172 @@
+from __future__ import annotations
+from logging import Logger, getLogger
+from dataclasses import dataclass
+from typing import Any, Callable, Final, Iterator
+from os import fspath, PathLike, stat
+from struct import pack as struct_pack
+from mmap import mmap, ACCESS_READ
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.header_filter import HeaderFilter
+
+LOG: Logger = getLogger(__name__)
+
+# The header size and link CLSID fields that begin every shell link.
+SHELL_LINK_SIGNATURE: Final[bytes] = struct_pack('<I', ShellLinkHeader.SIZE) + ShellLinkHeader.LINK_CLSID.bytes_le
+
+DEFAULT_CHUNK_SIZE: Final[int] = 64 * 1024 * 1024
+
+# Set in each worker process by `_initialize_worker`, so that only the chunk bounds need to be sent with each task.
+_PATH: str | None = None
+_PROCESS: Callable[[str, ShellLink], Any] | None = None
+_SYSTEM_DEFAULT_ENCODING: str | None = None
+_HEADER_FILTER: HeaderFilter | None = None
+
+
+@dataclass(slots=True)
+class CarveResult:
+    offset: int
+    path: str
+    output: Any
+
+
+def carved_shell_link_path(path: str, offset: int) -> str:
+    """
+    Make the path by which a carved shell link is referred to.
+
+    :param path: The path of the file from which the shell link was carved.
+    :param offset: The offset of the shell link in the file.
+    :return: The path of the carved shell link.
+    """
+
+    return f'{path}@0x{offset:x}'
+
+
+def find_shell_link_offsets(data: bytes | mmap, start: int = 0, end: int | None = None) -> Iterator[int]:
+    """
+    Yield the offsets at which the shell link signature occurs in a byte sequence.
+
+    Occurrences that start within the range but extend past its end are included, so that adjacent ranges together
+    cover every occurrence exactly once.
+
+    :param data: The byte sequence to be searched.
+    :param start: The start of the range of offsets to be searched.
+    :param end: The end (exclusive) of the range of offsets to be searched. Defaults to the end of the byte sequence.
+    :return: An iterator of offsets of the shell link signature.
+    """
+
+    search_end = min((len(data) if end is None else end) + len(SHELL_LINK_SIGNATURE) - 1, len(data))
+
+    offset = data.find(SHELL_LINK_SIGNATURE, start, search_end)
+    while offset != -1:
+        yield offset
+        offset = data.find(SHELL_LINK_SIGNATURE, offset + 1, search_end)
+
+
+def _initialize_worker(
+    path: str,
+    process: Callable[[str, ShellLink], Any] | None,
+    system_default_encoding: str | None,
+    header_filter: HeaderFilter | None
+) -> None:
+    global _PATH, _PROCESS, _SYSTEM_DEFAULT_ENCODING, _HEADER_FILTER
+
+    _PATH = path
+    _PROCESS = process
+    _SYSTEM_DEFAULT_ENCODING = system_default_encoding
+    _HEADER_FILTER = header_filter
+
+
+def _carve_chunk(chunk_range: tuple[int, int]) -> list[tuple[int, Any]]:
+    """
+    Carve the shell links whose signatures start within a range of the file being carved.
+
+    :param chunk_range: The start and end (exclusive) of the range to be searched.
+    :return: The offsets of the shell links that could be parsed, together with the output of `_PROCESS` for each, or
+        the shell link itself if no process function is set.
+    """
+
+    start, end = chunk_range
+    carved: list[tuple[int, Any]] = []
+
+    with open(_PATH, 'rb') as image_file, mmap(image_file.fileno(), 0, access=ACCESS_READ) as mapped:
+        data = memoryview(mapped)
+        try:
+            for offset in find_shell_link_offsets(data=mapped, start=start, end=end):
+                if len(data) - offset < ShellLinkHeader.SIZE:
+                    continue
+
+                if _HEADER_FILTER is not None and not _HEADER_FILTER.matches(data=data, base_offset=offset):
+                    continue
+
+                try:
+                    shell_link = ShellLink.from_bytes(
+                        data=data,
+                        base_offset=offset,
+                        system_default_encoding=_SYSTEM_DEFAULT_ENCODING
+                    )
+                except Exception as e:
+                    LOG.debug(f'Discarding the signature hit at offset 0x{offset:x}: {e.__class__.__name__}: {e}')
+                    continue
+
+                carved.append((
+                    offset,
+                    _PROCESS(carved_shell_link_path(path=_PATH, offset=offset), shell_link)
+                    if _PROCESS is not None else shell_link
+                ))
+        finally:
+            data.release()
+
+    return carved
+
+
+def carve(
+    path: str | PathLike,
+    process: Callable[[str, ShellLink], Any] | None = None,
+    num_workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None
+) -> Iterator[CarveResult]:
+    """
+    Carve shell links out of a file of arbitrary contents, such as a raw disk image or a memory dump.
+
+    The file is memory-mapped and split into chunks, which are searched for the shell link signature (the header size
+    and link CLSID fields), possibly by a pool of worker processes. A shell link is parsed at each hit; hits at which
+    parsing fails are discarded. The results are produced in order of offset.
+
+    :param path: The path of the file to be carved.
+    :param process: A function applied to the path (see `carved_shell_link_path`) and the shell link of each carved
+        shell link, in the worker, whose return value becomes the output of the result. Must be picklable, and return a
+        picklable value, when more than one worker is used. Defaults to producing the shell link itself, as parsed by
+        the worker.
+    :param num_workers: The number of worker processes. With one worker, the file is carved in the current process.
+    :param chunk_size: The number of bytes searched for signatures by a worker at a time.
+    :param system_default_encoding: The default encoding on the system on which the shell links were generated.
+    :param header_filter: A filter evaluated on the header at each hit; hits whose headers do not match are discarded.
+    :return: An iterator of carve results.
+    """
+
+    path = fspath(path)
+
+    if (size := stat(path).st_size) == 0:
+        return
+
+    initargs = (path, process, system_default_encoding, header_filter)
+    chunk_ranges = ((chunk_start, chunk_start + chunk_size) for chunk_start in range(0, size, chunk_size))
+
+    if num_workers <= 1:
+        _initialize_worker(*initargs)
+        yield from _make_carve_results(path=path, chunk_results=map(_carve_chunk, chunk_ranges))
+    else:
+        from multiprocessing import Pool
+
+        with Pool(processes=num_workers, initializer=_initialize_worker, initargs=initargs) as pool:
+            yield from _make_carve_results(path=path, chunk_results=pool.imap(_carve_chunk, chunk_ranges))
+
+
+def _make_carve_results(path: str, chunk_results: Iterator[list[tuple[int, Any]]]) -> Iterator[CarveResult]:
+    for chunk_result in chunk_results:
+        for offset, output in chunk_result:
+            yield CarveResult(offset=offset, path=carved_shell_link_path(path=path, offset=offset), output=output)
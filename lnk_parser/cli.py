@@ -1,14 +1,50 @@
-from io import BufferedReader
-from argparse import FileType
+from argparse import ArgumentParser, ArgumentTypeError
+from pathlib import Path
+from datetime import datetime
+from uuid import UUID
 
 from typed_argument_parser import TypedArgumentParser
 
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.show_command import ShowCommand
+
 
 class LnkParserArgumentParser(TypedArgumentParser):
 
     class Namespace:
-        lnk_files: list[BufferedReader]
+        paths: list[Path]
         system_encoding: str | None
+        recursive: bool
+        jump_lists: bool
+        archive_signature: bool
+        workers: int
+        threads: bool
+        unordered: bool
+        max_tasks_per_worker: int | None
+        chunk_size: int
+        format: str
+        carve: bool
+        carve_chunk_size: int | None
+        flush_interval: int
+        has_flags: list[str] | None
+        lacks_flags: list[str] | None
+        show_commands: list[str] | None
+        created_after: datetime | None
+        created_before: datetime | None
+        accessed_after: datetime | None
+        accessed_before: datetime | None
+        written_after: datetime | None
+        written_before: datetime | None
+        min_file_size: int | None
+        max_file_size: int | None
+        cache: Path | None
+        stats: bool
+        stats_interval: float | None
+        stats_top: int
+        watch: bool
+        watch_debounce: float
+        watch_poll_interval: float
+        watch_polling: bool
 
     def __init__(self, *args, **kwargs):
         super().__init__(
@@ -19,11 +55,17 @@ class LnkParserArgumentParser(TypedArgumentParser):
         )
 
         self.add_argument(
-            'lnk_files',
-            help='The path of an LNK file to be parsed.',
+            'paths',
+            help=(
+                'The path of an LNK file to be parsed, or of a directory whose LNK files (files with the .lnk suffix)'
+                ' are to be parsed. The LNK files within zip and tar archives (files with the .zip, .tar, .tar.gz,'
+                ' .tgz, .tar.bz2, .tbz2, .tar.xz and .txz suffixes) and gzip files (files with the .gz suffix) whose'
+                ' paths are provided are parsed without being extracted, each referred to by the path of the archive'
+                ' followed by ! and its name in the archive.'
+            ),
             nargs='+',
-            type=FileType('rb'),
-            metavar='lnk_file'
+            type=Path,
+            metavar='path'
         )
 
         self.add_argument(
@@ -33,3 +75,661 @@ class LnkParserArgumentParser(TypedArgumentParser):
                 ' system.'
             )
         )
+
+        self.add_argument(
+            '--format',
+            help=(
+                'The output format: human-readable text, or newline-delimited JSON with one object per file, including'
+                ' files that could not be parsed.'
+            ),
+            choices=['text', 'ndjson'],
+            default='text'
+        )
+
+        self.add_argument(
+            '--flush-interval',
+            help='The number of files whose output is written before the output is flushed.',
+            type=int,
+            default=64
+        )
+
+        self.add_argument(
+            '-r', '--recursive',
+            help='Descend into the subdirectories of the provided directories.',
+            action='store_true'
+        )
+
+        self.add_argument(
+            '-j', '--jump-lists',
+            help=(
+                'Also parse the LNK files embedded in the jump list files (files with the .automaticDestinations-ms'
+                ' and .customDestinations-ms suffixes) of the provided directories. Jump list files whose paths are'
+                ' provided explicitly are always parsed as such, and those within the provided archives are parsed'
+                ' too.'
+            ),
+            action='store_true'
+        )
+
+        self.add_argument(
+            '--archive-signature',
+            help=(
+                'Also parse the members of the provided archives that begin with the LNK file signature, whatever'
+                ' their names.'
+            ),
+            action='store_true'
+        )
+
+        self.add_argument(
+            '-w', '--workers',
+            help='The number of worker processes among which the parsing is spread.',
+            type=int,
+            default=1
+        )
+
+        self.add_argument(
+            '--threads',
+            help=(
+                'Use threads rather than processes as workers when scanning. The threads only parse in parallel on'
+                ' free-threaded builds of Python, but the results need not be sent between processes.'
+            ),
+            action='store_true'
+        )
+
+        self.add_argument(
+            '--unordered',
+            help='Output the results in the order in which the files are parsed rather than in the order provided.',
+            action='store_true'
+        )
+
+        self.add_argument(
+            '--max-tasks-per-worker',
+            help=(
+                'The number of files a worker process parses before being replaced by a new one, rounded up to a'
+                ' multiple of the chunk size. Defaults to never replacing the workers.'
+            ),
+            type=int
+        )
+
+        self.add_argument(
+            '--chunk-size',
+            help='The number of files sent to a worker process at a time.',
+            type=int,
+            default=16
+        )
+
+        self.add_argument(
+            '--cache',
+            help=(
+                'The path of an SQLite database in which the parse results are cached across runs. Files whose path,'
+                ' inode, size and modification time are unchanged since they were cached are not parsed again. Not'
+                ' used when carving, nor for the LNK files within archives.'
+            ),
+            type=Path,
+            metavar='PATH'
+        )
+
+        self.add_argument(
+            '--carve',
+            help=(
+                'Carve LNK files out of the provided files, such as raw disk images or memory dumps, rather than'
+                ' parsing them as LNK files. Each carved LNK file is referred to by the path of the file it was carved'
+                ' from followed by @ and its offset.'
+            ),
+            action='store_true'
+        )
+
+        self.add_argument(
+            '--carve-chunk-size',
+            help=(
+                'The number of bytes searched for LNK files by a worker process at a time when carving. Defaults to 64'
+                ' MiB.'
+            ),
+            type=int
+        )
+
+        statistics_group = self.add_argument_group(
+            title='statistics',
+            description=(
+                'Report statistics of the run to standard error: the number of files and bytes parsed per second, the'
+                ' split of the parse time among the parse stages, the number of errors of each type, and the slowest'
+                ' files. Files whose results are taken from the cache are only counted; when carving, only the numbers'
+                ' of results and errors are reported.'
+            )
+        )
+
+        statistics_group.add_argument(
+            '--stats',
+            help='Report the statistics at the end of the run.',
+            action='store_true'
+        )
+
+        statistics_group.add_argument(
+            '--stats-interval',
+            help='The number of seconds between reports of the statistics during the run. Implies --stats.',
+            type=float,
+            metavar='SECONDS'
+        )
+
+        statistics_group.add_argument(
+            '--stats-top',
+            help='The number of slowest files to report.',
+            type=int,
+            default=10,
+            metavar='N'
+        )
+
+        watch_group = self.add_argument_group(
+            title='watch',
+            description=(
+                'Once the provided files have been parsed, keep watching the provided paths, parsing the LNK files that'
+                ' are created or modified, once they have been unchanged for the debounce interval, until interrupted.'
+                ' The changes are reported by inotify on Linux, and are otherwise found by polling. A file is only'
+                ' parsed again if its inode, size or modification time has changed. Not available when carving, nor'
+                ' for archives.'
+            )
+        )
+
+        watch_group.add_argument(
+            '--watch',
+            help='Watch the provided paths for new and modified LNK files.',
+            action='store_true'
+        )
+
+        watch_group.add_argument(
+            '--watch-debounce',
+            help='The number of seconds that a file must be unchanged before it is parsed.',
+            type=float,
+            default=0.25,
+            metavar='SECONDS'
+        )
+
+        watch_group.add_argument(
+            '--watch-poll-interval',
+            help='The number of seconds between listings of the watched directories when polling.',
+            type=float,
+            default=1.0,
+            metavar='SECONDS'
+        )
+
+        watch_group.add_argument(
+            '--watch-polling',
+            help='Poll the watched directories even where inotify is available.',
+            action='store_true'
+        )
+
+        header_filter_group = self.add_argument_group(
+            title='header filter',
+            description=(
+                'Only parse the files whose headers satisfy all of the provided criteria. Times are in ISO 8601 format;'
+                ' times without a time zone are taken to be in UTC.'
+            )
+        )
+
+        header_filter_group.add_argument(
+            '--has-flag',
+            help='A link flag that must be set. Can be provided multiple times.',
+            action='append',
+            choices=[link_flag.name for link_flag in LinkFlags],
+            dest='has_flags',
+            metavar='LINK_FLAG'
+        )
+
+        header_filter_group.add_argument(
+            '--lacks-flag',
+            help='A link flag that must not be set. Can be provided multiple times.',
+            action='append',
+            choices=[link_flag.name for link_flag in LinkFlags],
+            dest='lacks_flags',
+            metavar='LINK_FLAG'
+        )
+
+        header_filter_group.add_argument(
+            '--show-command',
+            help='A show command that is accepted. Can be provided multiple times.',
+            action='append',
+            choices=[show_command.name for show_command in ShowCommand],
+            dest='show_commands'
+        )
+
+        for time_name, time_description in (('created', 'creation'), ('accessed', 'access'), ('written', 'write')):
+            header_filter_group.add_argument(
+                f'--{time_name}-after',
+                help=f'The earliest accepted {time_description} time.',
+                type=datetime.fromisoformat,
+                metavar='TIME'
+            )
+
+            header_filter_group.add_argument(
+                f'--{time_name}-before',
+                help=f'The latest accepted {time_description} time.',
+                type=datetime.fromisoformat,
+                metavar='TIME'
+            )
+
+        header_filter_group.add_argument(
+            '--min-file-size',
+            help='The smallest accepted target file size.',
+            type=int
+        )
+
+        header_filter_group.add_argument(
+            '--max-file-size',
+            help='The largest accepted target file size.',
+            type=int
+        )
+
+
+class CorpusArgumentParser(TypedArgumentParser):
+
+    class Namespace:
+        output: Path
+        count: int
+        blob: bool
+        workers: int
+        verify: bool
+        seed: int
+        unicode_ratio: float
+        min_path_depth: int
+        max_path_depth: int
+        min_properties: int
+        max_properties: int
+        tracker_ratio: float
+        system_encoding: str
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            *args,
+            **(
+                dict(description='A generator of synthetic corpora of Shell Link (.LNK) files.') | kwargs
+            )
+        )
+
+        self.add_argument(
+            'output',
+            help=(
+                'The path of the directory in which to write the LNK files, or the path of the file to write when'
+                ' writing a single file.'
+            ),
+            type=Path
+        )
+
+        self.add_argument(
+            '-n', '--count',
+            help='The number of LNK files in the corpus.',
+            type=int,
+            default=1000
+        )
+
+        self.add_argument(
+            '--blob',
+            help=(
+                'Write the LNK files one after another into a single file, from which they can be carved, rather than'
+                ' as separate files.'
+            ),
+            action='store_true'
+        )
+
+        self.add_argument(
+            '-w', '--workers',
+            help='The number of worker processes among which the generation is spread.',
+            type=int,
+            default=1
+        )
+
+        self.add_argument(
+            '--verify',
+            help='Check that each LNK file is reproduced exactly when parsed and serialized again.',
+            action='store_true'
+        )
+
+        self.add_argument(
+            '--seed',
+            help='The seed from which the contents of the corpus are derived.',
+            type=int,
+            default=0
+        )
+
+        self.add_argument(
+            '--unicode-ratio',
+            help='The proportion of LNK files whose strings are Unicode-encoded.',
+            type=float,
+            default=0.9
+        )
+
+        self.add_argument(
+            '--min-path-depth',
+            help='The smallest number of directories in the target path of an LNK file.',
+            type=int,
+            default=1
+        )
+
+        self.add_argument(
+            '--max-path-depth',
+            help='The largest number of directories in the target path of an LNK file.',
+            type=int,
+            default=6
+        )
+
+        self.add_argument(
+            '--min-properties',
+            help='The smallest number of properties in the property store of an LNK file.',
+            type=int,
+            default=0
+        )
+
+        self.add_argument(
+            '--max-properties',
+            help='The largest number of properties in the property store of an LNK file.',
+            type=int,
+            default=4
+        )
+
+        self.add_argument(
+            '--tracker-ratio',
+            help='The proportion of LNK files with a tracker data block.',
+            type=float,
+            default=0.8
+        )
+
+        self.add_argument(
+            '--system-encoding',
+            help='The encoding of the strings of the LNK files that are not Unicode-encoded.',
+            default='cp1252'
+        )
+
+
+def _parse_volume_serial_number(value: str) -> int:
+    from lnk_parser.link_index import parse_volume_serial_number
+
+    try:
+        return parse_volume_serial_number(value=value)
+    except ValueError:
+        raise ArgumentTypeError(f'{value!r} is not a volume serial number, such as 1A2B-3C4D.')
+
+
+class LinkIndexArgumentParser(TypedArgumentParser):
+
+    class Namespace:
+        command: str
+        database: Path
+        paths: list[Path]
+        recursive: bool
+        jump_lists: bool
+        workers: int
+        chunk_size: int
+        batch_size: int
+        system_encoding: str | None
+        target_prefix: str | None
+        machine_id: str | None
+        droid: UUID | None
+        volume_serial: int | None
+        arguments_contain: str | None
+        limit: int | None
+        format: str
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            *args,
+            **(
+                dict(description='A searchable SQLite index of parsed Shell Link (.LNK) files.') | kwargs
+            )
+        )
+
+        # The subcommands are plain argument parsers, as this class takes no arguments of its own beyond those of
+        # `ArgumentParser`.
+        subparsers = self.add_subparsers(dest='command', required=True, parser_class=ArgumentParser)
+
+        build_parser = subparsers.add_parser(
+            'build',
+            help='Parse LNK files and add them to an index, replacing any earlier rows of the same paths.',
+            description='Parse LNK files and add them to an index, replacing any earlier rows of the same paths.'
+        )
+
+        build_parser.add_argument(
+            'database',
+            help='The path of the SQLite database of the index. It is created if it does not exist.',
+            type=Path
+        )
+
+        build_parser.add_argument(
+            'paths',
+            help=(
+                'The path of an LNK file to be indexed, or of a directory whose LNK files (files with the .lnk suffix)'
+                ' are to be indexed.'
+            ),
+            nargs='+',
+            type=Path,
+            metavar='path'
+        )
+
+        build_parser.add_argument(
+            '-r', '--recursive',
+            help='Descend into the subdirectories of the provided directories.',
+            action='store_true'
+        )
+
+        build_parser.add_argument(
+            '-j', '--jump-lists',
+            help='Also index the LNK files embedded in the jump list files of the provided directories.',
+            action='store_true'
+        )
+
+        build_parser.add_argument(
+            '-w', '--workers',
+            help='The number of worker processes among which the parsing is spread.',
+            type=int,
+            default=1
+        )
+
+        build_parser.add_argument(
+            '--chunk-size',
+            help='The number of files sent to a worker process at a time.',
+            type=int,
+            default=16
+        )
+
+        build_parser.add_argument(
+            '--batch-size',
+            help='The number of results written to the index in each transaction.',
+            type=int,
+            default=1000
+        )
+
+        build_parser.add_argument(
+            '--system-encoding',
+            help=(
+                'The default encoding on the system from which the LNK files originated. Defaults to that of the'
+                ' current system.'
+            )
+        )
+
+        query_parser = subparsers.add_parser(
+            'query',
+            help='Find the LNK files in an index satisfying all of the provided criteria.',
+            description=(
+                'Find the LNK files in an index satisfying all of the provided criteria. Paths, machine IDs and'
+                ' arguments are matched case-insensitively.'
+            )
+        )
+
+        query_parser.add_argument(
+            'database',
+            help='The path of the SQLite database of the index.',
+            type=Path
+        )
+
+        query_parser.add_argument(
+            '--target-prefix',
+            help='A prefix of the target path, such as C:\\Users.',
+            metavar='PATH'
+        )
+
+        query_parser.add_argument(
+            '--machine-id',
+            help='The machine ID of the tracker data block.'
+        )
+
+        query_parser.add_argument(
+            '--droid',
+            help='The volume or object ID of either of the droids of the tracker data block.',
+            type=UUID
+        )
+
+        query_parser.add_argument(
+            '--volume-serial',
+            help='The serial number of the volume of the link info, such as 1A2B-3C4D.',
+            type=_parse_volume_serial_number
+        )
+
+        query_parser.add_argument(
+            '--arguments-contain',
+            help=(
+                'A substring of the command line arguments. A substring starting with a hyphen is given with an equals'
+                ' sign, such as --arguments-contain=-enc.'
+            ),
+            metavar='TEXT'
+        )
+
+        query_parser.add_argument(
+            '--limit',
+            help='The largest number of LNK files to output.',
+            type=int
+        )
+
+        query_parser.add_argument(
+            '--format',
+            help=(
+                'The output format: the path of each LNK file, or newline-delimited JSON with one object per LNK file,'
+                ' including its target path, arguments, machine ID, droids and volume.'
+            ),
+            choices=['text', 'ndjson'],
+            default='text'
+        )
+
+
+class FingerprintArgumentParser(TypedArgumentParser):
+
+    class Namespace:
+        paths: list[Path]
+        known: list[Path] | None
+        recursive: bool
+        jump_lists: bool
+        workers: int
+        chunk_size: int
+        system_encoding: str | None
+        permutations: int
+        bands: int
+        threshold: float
+        min_cluster_size: int
+        format: str
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            *args,
+            **(
+                dict(
+                    description=(
+                        'Cluster Shell Link (.LNK) files by the similarity of their structure, such as those made with'
+                        ' the same builder template, or match them against known ones.'
+                    )
+                ) | kwargs
+            )
+        )
+
+        self.add_argument(
+            'paths',
+            help=(
+                'The path of an LNK file to be clustered, or of a directory whose LNK files (files with the .lnk'
+                ' suffix) are to be clustered.'
+            ),
+            nargs='+',
+            type=Path,
+            metavar='path'
+        )
+
+        self.add_argument(
+            '--known',
+            help=(
+                'The path of a known LNK file, or of a directory of known LNK files, such as those of a campaign. May'
+                ' be provided several times. When provided, each LNK file is matched against the clusters of the known'
+                ' LNK files rather than clustered.'
+            ),
+            action='append',
+            type=Path,
+            metavar='PATH'
+        )
+
+        self.add_argument(
+            '-r', '--recursive',
+            help='Descend into the subdirectories of the provided directories.',
+            action='store_true'
+        )
+
+        self.add_argument(
+            '-j', '--jump-lists',
+            help='Also include the LNK files embedded in the jump list files of the provided directories.',
+            action='store_true'
+        )
+
+        self.add_argument(
+            '-w', '--workers',
+            help='The number of worker processes among which the parsing and fingerprinting is spread.',
+            type=int,
+            default=1
+        )
+
+        self.add_argument(
+            '--chunk-size',
+            help='The number of files sent to a worker process at a time.',
+            type=int,
+            default=16
+        )
+
+        self.add_argument(
+            '--system-encoding',
+            help=(
+                'The default encoding on the system from which the LNK files originated. Defaults to that of the'
+                ' current system.'
+            )
+        )
+
+        self.add_argument(
+            '--permutations',
+            help='The number of MinHash permutations, and thus the length of the signatures.',
+            type=int,
+            default=64
+        )
+
+        self.add_argument(
+            '--bands',
+            help=(
+                'The number of bands into which the signatures are split for locality-sensitive hashing; must divide'
+                ' the number of permutations. More bands find less similar LNK files, at the cost of more comparisons.'
+            ),
+            type=int,
+            default=16
+        )
+
+        self.add_argument(
+            '--threshold',
+            help='The estimated Jaccard similarity of the features from which LNK files are joined in a cluster.',
+            type=float,
+            default=0.7
+        )
+
+        self.add_argument(
+            '--min-cluster-size',
+            help='The size of the smallest cluster to output.',
+            type=int,
+            default=2
+        )
+
+        self.add_argument(
+            '--format',
+            help=(
+                'The output format: human-readable text, or newline-delimited JSON with one object per cluster, or per'
+                ' matched LNK file.'
+            ),
+            choices=['text', 'ndjson'],
+            default='text'
+        )
@@ -0,0 +1,436 @@
+"""
+Generation of synthetic corpora of shell links, for load testing and benchmarking.
+
+Each shell link of a corpus is derived deterministically from the corpus parameters and its index, so that a corpus can
+be regenerated exactly, and generated by several worker processes. The shape of the shell links (Unicode or not, the
+depth of the target path, the number of properties and the presence of a tracker data block) is controlled by the
+parameters.
+
+Run as a module to write a corpus:
+
+    $ python -m lnk_parser.corpus --count 1000000 --workers 8 --blob corpus.bin
+"""
+
+from __future__ import annotations
+from logging import Logger, getLogger
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from multiprocessing import Pool
+from os import PathLike
+from pathlib import Path
+from random import Random
+from typing import Final, Iterator, Type
+from uuid import UUID
+
+from msdsalgs.fscc.file_attributes import FileAttributes
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.structures.link_flags import LinkFlags, LinkFlagsMask
+from lnk_parser.structures.show_command import ShowCommand
+from lnk_parser.structures.link_target_id_list import LinkTargetIDList
+from lnk_parser.structures.shell_item.root_folder import RootFolderShellItem
+from lnk_parser.structures.shell_item.volume import VolumeShellItem
+from lnk_parser.structures.shell_item.file_entry import FileEntryShellItem
+from lnk_parser.structures.volume_shell_item_flags import VolumeShellItemFlags, VolumeShellItemFlagsMask
+from lnk_parser.structures.file_entry_shell_item_flags import FileEntryShellItemFlags, FileEntryShellItemFlagsMask
+from lnk_parser.structures.file_entry_extension_block import FileEntryExtensionBlock
+from lnk_parser.structures.extension_version import ExtensionVersion
+from lnk_parser.structures.ntfs_file_reference import NTFSFileReference
+from lnk_parser.structures.link_info import LinkInfo
+from lnk_parser.structures.link_info_flags import LinkInfoFlags, LinkInfoFlagsMask
+from lnk_parser.structures.volume_id import VolumeID
+from lnk_parser.structures.drive_type import DriveType
+from lnk_parser.structures.extra_data import ExtraData
+from lnk_parser.structures.extra_data.special_folder_data_block import SpecialFolderDataBlock
+from lnk_parser.structures.extra_data.known_folder_data_block import KnownFolderDataBlock
+from lnk_parser.structures.extra_data.tracker_data_block import TrackerDataBlock
+from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+from lnk_parser.structures.property_storage import PropertyStorage
+from lnk_parser.structures.serialized_property_value.serialized_property_value_integer_name import \
+    SerializedPropertyValueIntegerName
+
+LOG: Logger = getLogger(__name__)
+
+DEFAULT_SYSTEM_ENCODING: Final[str] = 'cp1252'
+
+MY_COMPUTER_CLSID: Final[UUID] = UUID('20d04fe0-3aea-1069-a2d8-08002b30309d')
+SUMMARY_INFORMATION_FORMAT_ID: Final[UUID] = UUID('46588ae2-4cbc-4338-bbfc-139326986dce')
+
+_ANSI_NAMES: Final[tuple[str, ...]] = (
+    'Users', 'Public', 'Documents', 'Downloads', 'Desktop', 'AppData', 'Roaming', 'Local', 'Temp', 'Program Files',
+    'Windows', 'System32', 'Projects', 'Reports', 'Invoices', 'Backup', 'Archive', 'Shared', 'Tools', 'Scripts',
+    'Rapports financiers', 'Übersicht', 'Åtgärder', 'Résumé'
+)
+_UNICODE_NAMES: Final[tuple[str, ...]] = _ANSI_NAMES + (
+    'Документы', 'プロジェクト', '文档', 'Αρχείο', 'Ānanda'
+)
+_FILE_EXTENSIONS: Final[tuple[str, ...]] = ('exe', 'docx', 'xlsx', 'pdf', 'txt', 'ps1', 'bat', 'hta', 'js', 'zip')
+_SHOW_COMMANDS: Final[tuple[ShowCommand, ...]] = (
+    ShowCommand.SW_SHOWNORMAL, ShowCommand.SW_SHOWMAXIMIZED, ShowCommand.SW_SHOWMINNOACTIVE
+)
+
+# 2010-01-01 and 2025-01-01.
+_MIN_TIMESTAMP: Final[int] = 1_262_304_000
+_MAX_TIMESTAMP: Final[int] = 1_735_689_600
+
+
+@dataclass(slots=True)
+class CorpusParameters:
+    """
+    The parameters controlling the shape of the shell links of a corpus.
+
+    The ratios are the probabilities of each shell link being Unicode-encoded and of it having a tracker data block.
+    """
+
+    seed: int = 0
+    unicode_ratio: float = 0.9
+    min_path_depth: int = 1
+    max_path_depth: int = 6
+    min_num_properties: int = 0
+    max_num_properties: int = 4
+    tracker_ratio: float = 0.8
+    system_default_encoding: str = DEFAULT_SYSTEM_ENCODING
+
+
+def _random_datetime(random: Random) -> datetime:
+    return datetime.fromtimestamp(random.randint(_MIN_TIMESTAMP, _MAX_TIMESTAMP), tz=timezone.utc).replace(
+        microsecond=random.randrange(1_000_000)
+    )
+
+
+def _random_dos_datetime(random: Random) -> datetime:
+    # MS-DOS times have a resolution of two seconds, and no time zone.
+    value = _random_datetime(random=random).replace(microsecond=0, tzinfo=None)
+    return value.replace(second=value.second - value.second % 2)
+
+
+def _random_dos_date(random: Random) -> datetime:
+    return _random_dos_datetime(random=random).replace(hour=0, minute=0, second=0)
+
+
+def _make_file_entry_shell_item(random: Random, name: str, is_directory: bool, is_unicode: bool) -> FileEntryShellItem:
+    modified = _random_dos_datetime(random=random)
+
+    return FileEntryShellItem(
+        flags=FileEntryShellItemFlagsMask.from_int(
+            value=(FileEntryShellItemFlags.IS_DIRECTORY if is_directory else FileEntryShellItemFlags.IS_FILE)
+            | (FileEntryShellItemFlags.HAS_UNICODE_STRINGS if is_unicode else 0)
+        ),
+        file_size=None if is_directory else random.randint(1, 2**32 - 1),
+        last_modified_date=modified.replace(hour=0, minute=0, second=0),
+        last_modified_time=timedelta(hours=modified.hour, minutes=modified.minute, seconds=modified.second),
+        file_attributes=FileAttributes.from_int(value=0x10 if is_directory else 0x20),
+        primary_name=name,
+        extension_block=FileEntryExtensionBlock(
+            extension_version=ExtensionVersion.WINDOWS_81_10,
+            creation_datetime=_random_dos_date(random=random),
+            last_access_datetime=_random_dos_date(random=random),
+            ntfs_file_reference=NTFSFileReference(
+                mft_entry_index=random.randrange(2**48).to_bytes(6, 'little'),
+                sequence_number=random.randint(1, 2**16 - 1)
+            ),
+            long_name=name,
+            localized_name=None,
+            first_extension_block_version_offset=0x14
+        )
+    )
+
+
+def _make_property_value(random: Random, property_id: int) -> SerializedPropertyValueIntegerName:
+    value_type = random.choice((0x001F, 0x0040, 0x0048, 0x0013))
+
+    # LPWSTR
+    if value_type == 0x001F:
+        value = f'S-1-5-21-{random.randrange(2**32)}-{random.randrange(2**32)}-{random.randint(1000, 9999)}'
+    # FILETIME
+    elif value_type == 0x0040:
+        value = _random_datetime(random=random)
+    # GUID
+    elif value_type == 0x0048:
+        value = UUID(int=random.getrandbits(128))
+    # UI4
+    else:
+        value = random.randrange(2**32).to_bytes(4, 'little')
+
+    return SerializedPropertyValueIntegerName(
+        value_size=0,
+        property_id=property_id,
+        value_type=value_type,
+        value=value
+    )
+
+
+def make_shell_link(index: int, parameters: CorpusParameters) -> ShellLink:
+    """
+    Make the shell link of a corpus at an index.
+
+    :param index: The index of the shell link in the corpus.
+    :param parameters: The parameters of the corpus.
+    :return: The shell link.
+    """
+
+    random = Random(f'{parameters.seed}:{index}')
+
+    is_unicode = random.random() < parameters.unicode_ratio
+    names = _UNICODE_NAMES if is_unicode else _ANSI_NAMES
+
+    directory_names = [
+        random.choice(names) for _ in range(random.randint(parameters.min_path_depth, parameters.max_path_depth))
+    ]
+    file_name = f'{random.choice(names)} {index}.{random.choice(_FILE_EXTENSIONS)}'
+    directory_path = '\\'.join(['C:', *directory_names])
+
+    command_line_arguments = random.choice(
+        (None, f'/c start "" "{file_name}"', f'-w hidden -nop -ep bypass -f {index}')
+    )
+    working_dir = random.choice((None, directory_path))
+
+    link_flags = LinkFlags.HasLinkTargetIDList | LinkFlags.HasLinkInfo | LinkFlags.HasIconLocation
+    if is_unicode:
+        link_flags |= LinkFlags.IsUnicode
+    if command_line_arguments is not None:
+        link_flags |= LinkFlags.HasArguments
+    if working_dir is not None:
+        link_flags |= LinkFlags.HasWorkingDir
+
+    extra_data_list: list[ExtraData] = [
+        SpecialFolderDataBlock(special_folder_id=random.choice((0x24, 0x25, 0x26)), item_id_offset=0x14 + 0x19)
+    ]
+
+    if random.random() < 0.5:
+        extra_data_list.append(
+            KnownFolderDataBlock(known_folder_id=random.getrandbits(128).to_bytes(16, 'little'), offset=0x14 + 0x19)
+        )
+
+    if random.random() < parameters.tracker_ratio:
+        extra_data_list.append(
+            TrackerDataBlock(
+                machine_id=f'desktop-{random.randrange(16**7):07x}',
+                droid=(UUID(int=random.getrandbits(128)), UUID(int=random.getrandbits(128))),
+                droid_birth=(UUID(int=random.getrandbits(128)), UUID(int=random.getrandbits(128)))
+            )
+        )
+
+    if num_properties := random.randint(parameters.min_num_properties, parameters.max_num_properties):
+        extra_data_list.append(
+            PropertyStoreDataBlock(
+                block_size=0,
+                property_storages=[
+                    PropertyStorage.from_properties(
+                        version=b'1SPS',
+                        format_id=SUMMARY_INFORMATION_FORMAT_ID,
+                        properties=[
+                            _make_property_value(random=random, property_id=property_id)
+                            for property_id in range(2, 2 + num_properties)
+                        ]
+                    )
+                ]
+            )
+        )
+
+    return ShellLink(
+        header=ShellLinkHeader(
+            link_flags=LinkFlagsMask.from_int(value=link_flags),
+            file_attributes=FileAttributes.from_int(value=0x20),
+            creation_time=_random_datetime(random=random),
+            access_time=_random_datetime(random=random),
+            write_time=_random_datetime(random=random),
+            file_size=random.randrange(2**32),
+            icon_index=random.randrange(64),
+            show_command=random.choice(_SHOW_COMMANDS),
+            hot_key=None
+        ),
+        link_target_id_list=LinkTargetIDList([
+            RootFolderShellItem(sort_index=0x50, shell_folder_identifier=MY_COMPUTER_CLSID, extension_block=b''),
+            VolumeShellItem(
+                flags=VolumeShellItemFlagsMask.from_int(
+                    value=(
+                        VolumeShellItemFlags.HAS_NAME | VolumeShellItemFlags.UNKNOWN_1 | VolumeShellItemFlags.UNKNOWN_2
+                    )
+                ),
+                other=b'C:\\' + bytes(19),
+                name='C:\\'
+            ),
+            *(
+                _make_file_entry_shell_item(random=random, name=name, is_directory=True, is_unicode=is_unicode)
+                for name in directory_names
+            ),
+            _make_file_entry_shell_item(random=random, name=file_name, is_directory=False, is_unicode=is_unicode)
+        ]),
+        link_info=LinkInfo(
+            link_info_size=0,
+            link_info_flags=LinkInfoFlagsMask.from_int(value=LinkInfoFlags.VolumeIDAndLocalBasePath),
+            volume_id=VolumeID(
+                drive_type=DriveType.DRIVE_FIXED,
+                drive_serial_number=random.getrandbits(32).to_bytes(4, 'little'),
+                volume_label=random.choice(('', 'OS', 'Data'))
+            ),
+            local_base_path=f'{directory_path}\\{file_name}',
+            common_path_suffix=''
+        ),
+        working_dir=working_dir,
+        command_line_arguments=command_line_arguments,
+        icon_location='%SystemRoot%\\System32\\shell32.dll',
+        extra_data_list=extra_data_list
+    )
+
+
+def make_shell_link_bytes(index: int, parameters: CorpusParameters) -> bytes:
+    """
+    Make the bytes of the shell link of a corpus at an index.
+
+    :param index: The index of the shell link in the corpus.
+    :param parameters: The parameters of the corpus.
+    :return: The bytes of the shell link.
+    """
+
+    return make_shell_link(index=index, parameters=parameters).to_bytes(
+        system_default_encoding=parameters.system_default_encoding
+    )
+
+
+def verify_shell_link_bytes(data: bytes, system_default_encoding: str | None = None) -> bool:
+    """
+    Check that the bytes of a shell link are reproduced exactly when the shell link is parsed and serialized again.
+
+    :param data: The bytes of a shell link, as produced by `ShellLink.to_bytes`.
+    :param system_default_encoding: The encoding with which the strings that are not Unicode-encoded were encoded.
+    :return: Whether the bytes are reproduced.
+    """
+
+    return ShellLink.from_bytes(data=data, system_default_encoding=system_default_encoding).to_bytes(
+        system_default_encoding=system_default_encoding
+    ) == data
+
+
+# Set in each worker process by `_initialize_worker`, so that only the indices need to be sent with each task.
+_PARAMETERS: CorpusParameters | None = None
+_VERIFY: bool = False
+
+
+def _initialize_worker(parameters: CorpusParameters, verify: bool) -> None:
+    global _PARAMETERS, _VERIFY
+
+    _PARAMETERS = parameters
+    _VERIFY = verify
+
+
+def _make_shell_link_bytes(index: int) -> bytes:
+    data = make_shell_link_bytes(index=index, parameters=_PARAMETERS)
+
+    if _VERIFY and not verify_shell_link_bytes(data=data, system_default_encoding=_PARAMETERS.system_default_encoding):
+        raise ValueError(f'The shell link at index {index} is not reproduced when parsed and serialized again.')
+
+    return data
+
+
+def iter_corpus(
+    count: int,
+    parameters: CorpusParameters,
+    num_workers: int = 1,
+    chunk_size: int = 256,
+    verify: bool = False
+) -> Iterator[bytes]:
+    """
+    Yield the bytes of the shell links of a corpus, in order of index.
+
+    :param count: The number of shell links in the corpus.
+    :param parameters: The parameters of the corpus.
+    :param num_workers: The number of worker processes. With one worker, the shell links are made in the current
+        process.
+    :param chunk_size: The number of shell links sent to a worker process at a time.
+    :param verify: Whether to check that each shell link is reproduced exactly when parsed and serialized again, raising
+        a `ValueError` otherwise.
+    :return: An iterator of the bytes of the shell links.
+    """
+
+    if num_workers <= 1:
+        _initialize_worker(parameters=parameters, verify=verify)
+        yield from map(_make_shell_link_bytes, range(count))
+    else:
+        with Pool(processes=num_workers, initializer=_initialize_worker, initargs=(parameters, verify)) as pool:
+            yield from pool.imap(_make_shell_link_bytes, range(count), chunksize=chunk_size)
+
+
+def write_corpus_files(output_dir: str | PathLike, shell_links_bytes: Iterator[bytes]) -> int:
+    """
+    Write the shell links of a corpus as separate LNK files, named after their indices.
+
+    :param output_dir: The path of the directory in which to write the files. It is created if it does not exist.
+    :param shell_links_bytes: The bytes of the shell links.
+    :return: The number of files written.
+    """
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    for index, data in enumerate(shell_links_bytes):
+        (output_dir / f'{index:08d}.lnk').write_bytes(data)
+        count += 1
+
+    return count
+
+
+def write_corpus_blob(path: str | PathLike, shell_links_bytes: Iterator[bytes]) -> int:
+    """
+    Write the shell links of a corpus one after another into a single file, from which they can be carved.
+
+    :param path: The path of the file to write.
+    :param shell_links_bytes: The bytes of the shell links.
+    :return: The number of shell links written.
+    """
+
+    count = 0
+    with open(path, 'wb') as blob_file:
+        for data in shell_links_bytes:
+            blob_file.write(data)
+            count += 1
+
+    return count
+
+
+def main():
+    from logging import INFO, StreamHandler, Formatter
+    from sys import stderr
+
+    from lnk_parser.cli import CorpusArgumentParser
+
+    args: Type[CorpusArgumentParser.Namespace] = CorpusArgumentParser().parse_args()
+
+    LOG.setLevel(level=INFO)
+    handler = StreamHandler(stream=stderr)
+    handler.setFormatter(fmt=Formatter(fmt='%(levelname)s: %(message)s'))
+    LOG.addHandler(hdlr=handler)
+
+    shell_links_bytes = iter_corpus(
+        count=args.count,
+        parameters=CorpusParameters(
+            seed=args.seed,
+            unicode_ratio=args.unicode_ratio,
+            min_path_depth=args.min_path_depth,
+            max_path_depth=args.max_path_depth,
+            min_num_properties=args.min_properties,
+            max_num_properties=args.max_properties,
+            tracker_ratio=args.tracker_ratio,
+            system_default_encoding=args.system_encoding
+        ),
+        num_workers=args.workers,
+        verify=args.verify
+    )
+
+    try:
+        if args.blob:
+            count = write_corpus_blob(path=args.output, shell_links_bytes=shell_links_bytes)
+        else:
+            count = write_corpus_files(output_dir=args.output, shell_links_bytes=shell_links_bytes)
+    except ValueError:
+        LOG.exception('The corpus could not be written.')
+        raise SystemExit(1)
+
+    LOG.info(f'Wrote {count} shell links to {args.output}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -56,3 +56,52 @@ class IncorrectTrackerDataBlockVersionError(ParsingError):
             expected_value=expected_version,
             observed_value=observed_version
         )
+
+
+class IncorrectCompoundFileSignatureError(ParsingError):
+    def __init__(self, observed_signature: bytes, expected_signature: bytes):
+        super().__init__(
+            message_header='Bad compound file signature.',
+            observed_value=observed_signature.hex(),
+            expected_value=expected_signature.hex()
+        )
+
+
+class SectorChainTooLongError(ParsingError):
+    def __init__(self, observed_length: int, maximum_length: int):
+        super().__init__(
+            message_header='Compound file sector chain is longer than the number of sectors; it may be cyclic.',
+            observed_value=observed_length,
+            expected_value=maximum_length,
+            expected_label='Expected at most'
+        )
+
+
+class StructureTooSmallError(ParsingError):
+    def __init__(self, structure_name: str, observed_size: int, minimum_size: int):
+        super().__init__(
+            message_header=f'The size of the {structure_name} structure is too small.',
+            observed_value=observed_size,
+            expected_value=minimum_size,
+            expected_label='Expected at least'
+        )
+
+
+class StructureOutOfBoundsError(ParsingError):
+    def __init__(self, structure_name: str, observed_end: int, maximum_end: int):
+        super().__init__(
+            message_header=f'The {structure_name} structure extends beyond the structure enclosing it.',
+            observed_value=observed_end,
+            expected_value=maximum_end,
+            expected_label='Expected to end at most at'
+        )
+
+
+class ParseBudgetExceededError(ParsingError):
+    def __init__(self, num_items: int, max_items: int):
+        super().__init__(
+            message_header='The number of items of the shell link exceeds the parse budget.',
+            observed_value=num_items,
+            expected_value=max_items,
+            expected_label='Expected at most'
+        )
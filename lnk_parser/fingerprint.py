@@ -0,0 +1,514 @@
+"""
+Structural fingerprints of shell links, clustered with MinHash and locality-sensitive hashing.
+
+Shell links made with the same builder template share their structure, whatever their targets: the link flags, the
+sequence of class type indicators of the link target ID list, the order of the extra data blocks, the format IDs and
+property IDs of the property stores, and often the volume, machine ID and MAC address of the machine on which the
+template was made. `extract_features` describes a shell link as a set of such features, `MinHasher` reduces the set to a
+fixed-size signature whose agreement with another estimates the Jaccard similarity of their feature sets, and
+`LshIndex` groups the signatures into clusters by hashing bands of them into buckets, so that each link is only compared
+with those sharing one of its buckets rather than with every other link.
+
+Run as a module to cluster LNK files, or to match them against those of known campaigns:
+
+    $ python -m lnk_parser.fingerprint --recursive --workers 8 /mnt/evidence
+    $ python -m lnk_parser.fingerprint --known campaigns/ --format ndjson samples/
+"""
+
+from __future__ import annotations
+from logging import Logger, getLogger
+from array import array
+from hashlib import blake2b
+from random import Random
+from typing import Final, Hashable, Iterable, Iterator, Type, TYPE_CHECKING
+from uuid import UUID
+
+from lnk_parser.scan import ScanResult, iter_lnk_paths, scan_paths
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.shell_item import ShellItem
+from lnk_parser.structures.shell_item.file_entry import FileEntryShellItem
+from lnk_parser.structures.shell_item.root_folder import RootFolderShellItem
+from lnk_parser.structures.shell_item.volume import VolumeShellItem
+from lnk_parser.structures.extra_data import UnsupportedExtraData
+from lnk_parser.structures.extra_data.tracker_data_block import TrackerDataBlock
+from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+from lnk_parser.structures.extra_data.known_folder_data_block import KnownFolderDataBlock
+from lnk_parser.structures.extra_data.special_folder_data_block import SpecialFolderDataBlock
+
+if TYPE_CHECKING:
+    from lnk_parser.cli import FingerprintArgumentParser
+
+LOG: Logger = getLogger(__name__)
+
+DEFAULT_NUM_PERMUTATIONS: Final[int] = 64
+DEFAULT_NUM_BANDS: Final[int] = 16
+DEFAULT_SIMILARITY_THRESHOLD: Final[float] = 0.7
+
+# The permutations are of the form `(a * x + b) mod p` over the hashes of the features, reduced to 61 bits.
+_MERSENNE_PRIME: Final[int] = (1 << 61) - 1
+
+
+def _get_class_type_indicator(shell_item: ShellItem | bytes) -> int | None:
+    if isinstance(shell_item, (FileEntryShellItem, VolumeShellItem)):
+        return min(shell_item.CLASS_TYPE_INDICATOR) | shell_item.flags.to_int()
+    elif isinstance(shell_item, RootFolderShellItem):
+        return next(iter(shell_item.CLASS_TYPE_INDICATOR))
+    elif isinstance(shell_item, ShellItem):
+        return None
+    else:
+        # The class type indicator follows the size field of the item.
+        return shell_item[2] if len(shell_item) > 2 else None
+
+
+def _format_mac_address(uuid: UUID) -> str | None:
+    # Version 1 UUIDs, such as the object IDs of droids, end in the MAC address of the machine that made them.
+    if uuid.version != 1:
+        return None
+
+    return ':'.join(f'{byte:02x}' for byte in uuid.node.to_bytes(6, byteorder='big'))
+
+
+def extract_features(shell_link: ShellLink) -> set[str]:
+    """
+    Describe the structure of a shell link as a set of features.
+
+    The features cover the header fields other than the times and the target file size, which only their presence and
+    magnitude contribute; the class type indicators of the link target ID list, in order and as consecutive pairs; the
+    presence and magnitude of the length of each string data field; the flags and volume of the link info; the
+    signatures of the extra data blocks, in order; the format IDs and property names of the property stores; the known
+    and special folder IDs; and the machine ID, droid volume IDs and MAC addresses of the tracker data block.
+
+    :param shell_link: The shell link to be described.
+    :return: The features of the shell link, each a string prefixed by its kind, such as `link_flag:HasArguments`.
+    """
+
+    header = shell_link.header
+    link_flags = header.link_flags.to_int()
+
+    features: set[str] = {
+        f'file_attributes:{header.file_attributes.to_int():#x}',
+        f'show_command:{header.show_command.name}',
+        f'icon_index:{header.icon_index}',
+        f'file_size_bits:{header.file_size.bit_length()}'
+    }
+
+    features.update(f'link_flag:{link_flag.name}' for link_flag in LinkFlags if link_flags & link_flag)
+    features.update(
+        f'{time_name}:unset'
+        for time_name, time in (
+            ('creation_time', header.creation_time),
+            ('access_time', header.access_time),
+            ('write_time', header.write_time)
+        )
+        if time is None
+    )
+
+    if header.hot_key is not None:
+        features.add(f'hot_key:{header.hot_key.to_bytes().hex()}')
+
+    if (link_target_id_list := shell_link.link_target_id_list) is not None:
+        class_type_indicators = [
+            f'{class_type_indicator:02x}' if class_type_indicator is not None else '?'
+            for class_type_indicator in map(_get_class_type_indicator, link_target_id_list)
+        ]
+
+        features.add(f'id_list:{",".join(class_type_indicators)}')
+        features.update(
+            f'id_list_pair:{first},{second}'
+            for first, second in zip(class_type_indicators, class_type_indicators[1:])
+        )
+        features.update(
+            f'root_folder:{shell_item.shell_folder_identifier}'
+            for shell_item in link_target_id_list
+            if isinstance(shell_item, RootFolderShellItem)
+        )
+
+    for field_name, value in (
+        ('name_string', shell_link.name_string),
+        ('relative_path', shell_link.relative_path),
+        ('working_dir', shell_link.working_dir),
+        ('command_line_arguments', shell_link.command_line_arguments),
+        ('icon_location', shell_link.icon_location)
+    ):
+        if value is not None:
+            features.add(f'{field_name}_length_bits:{len(value).bit_length()}')
+
+    # Builders pad the arguments with whitespace to push the payload out of view in the properties dialog.
+    if arguments := shell_link.command_line_arguments:
+        if num_leading_whitespace := len(arguments) - len(arguments.lstrip()):
+            features.add(f'command_line_arguments_padding_bits:{num_leading_whitespace.bit_length()}')
+
+    if (link_info := shell_link.link_info) is not None:
+        features.add(f'link_info_flags:{link_info.link_info_flags.to_int():#x}')
+
+        if (volume_id := link_info.volume_id) is not None:
+            features.add(f'drive_type:{volume_id.drive_type.name}')
+            features.add(f'volume_serial_number:{volume_id.drive_serial_number.hex()}')
+            features.add(f'volume_label:{volume_id.volume_label.lower()}')
+
+    signatures: list[str] = []
+    for extra_data in shell_link.extra_data_list:
+        signature = extra_data.signature if isinstance(extra_data, UnsupportedExtraData) else extra_data.SIGNATURE
+        signatures.append(f'{signature:08x}')
+        features.add(f'extra_data:{signature:08x}')
+
+        if isinstance(extra_data, TrackerDataBlock):
+            features.add(f'machine_id:{extra_data.machine_id.lower()}')
+            features.update(f'droid_volume_id:{droid[0]}' for droid in (extra_data.droid, extra_data.droid_birth))
+            features.update(
+                f'mac_address:{mac_address}'
+                for droid in (extra_data.droid, extra_data.droid_birth)
+                if (mac_address := _format_mac_address(uuid=droid[1])) is not None
+            )
+        elif isinstance(extra_data, PropertyStoreDataBlock):
+            for property_storage in extra_data.property_storages:
+                features.add(f'property_storage:{property_storage.format_id}')
+                features.update(
+                    f'property:{property_storage.format_id}/{property_name}'
+                    for property_name in property_storage.property_names()
+                )
+        elif isinstance(extra_data, KnownFolderDataBlock):
+            features.add(f'known_folder:{UUID(bytes_le=bytes(extra_data.known_folder_id))}')
+        elif isinstance(extra_data, SpecialFolderDataBlock):
+            features.add(f'special_folder:{extra_data.special_folder_id}')
+
+    features.add(f'extra_data_order:{",".join(signatures)}')
+
+    return features
+
+
+def hash_feature(feature: str) -> int:
+    """
+    Hash a feature to an integer below the modulus of the MinHash permutations.
+
+    Unlike `hash`, the hash is the same in every process, so that signatures made by different processes and runs can be
+    compared.
+
+    :param feature: The feature to be hashed.
+    :return: The hash of the feature.
+    """
+
+    return int.from_bytes(blake2b(feature.encode(), digest_size=8).digest(), byteorder='little') & _MERSENNE_PRIME
+
+
+class MinHasher:
+    """
+    Makes MinHash signatures of feature sets.
+
+    The fraction of the positions at which the signatures of two sets agree estimates the Jaccard similarity of the
+    sets, with a standard error of at most `0.5 / sqrt(num_permutations)`. Signatures made with the same number of
+    permutations and seed are comparable.
+    """
+
+    __slots__ = ('num_permutations', 'seed', '_permutations')
+
+    def __init__(self, num_permutations: int = DEFAULT_NUM_PERMUTATIONS, seed: int = 0):
+        """
+        :param num_permutations: The number of permutations, and thus the length of the signatures.
+        :param seed: The seed from which the permutations are drawn.
+        """
+
+        if num_permutations < 1:
+            raise ValueError(f'The number of permutations must be positive, not {num_permutations}.')
+
+        self.num_permutations = num_permutations
+        self.seed = seed
+
+        random = Random(seed)
+        self._permutations: tuple[tuple[int, int], ...] = tuple(
+            (random.randrange(1, _MERSENNE_PRIME), random.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_permutations)
+        )
+
+    def __getstate__(self) -> tuple[int, int]:
+        return self.num_permutations, self.seed
+
+    def __setstate__(self, state: tuple[int, int]) -> None:
+        self.__init__(*state)
+
+    def make_signature(self, features: Iterable[str]) -> tuple[int, ...]:
+        """
+        Make the MinHash signature of a set of features.
+
+        :param features: The features.
+        :return: The signature, with one value per permutation. The signature of an empty set consists of the modulus
+            of the permutations, which no other signature contains.
+        """
+
+        hashes = [hash_feature(feature=feature) for feature in set(features)]
+        if not hashes:
+            return (_MERSENNE_PRIME,) * self.num_permutations
+
+        return tuple(min([(a * h + b) % _MERSENNE_PRIME for h in hashes]) for a, b in self._permutations)
+
+
+def estimate_similarity(signature: Iterable[int], other_signature: Iterable[int]) -> float:
+    """
+    Estimate the Jaccard similarity of two feature sets from their MinHash signatures.
+
+    :param signature: The signature of a feature set.
+    :param other_signature: The signature of another feature set, made by the same `MinHasher`.
+    :return: The fraction of the positions at which the signatures agree.
+    """
+
+    num_positions = 0
+    num_agreeing = 0
+    for value, other_value in zip(signature, other_signature, strict=True):
+        num_positions += 1
+        num_agreeing += value == other_value
+
+    return num_agreeing / num_positions if num_positions else 0.0
+
+
+_MIN_HASHER: Final[MinHasher] = MinHasher()
+
+
+def make_signature(path: str, shell_link: ShellLink, min_hasher: MinHasher = _MIN_HASHER) -> tuple[int, ...]:
+    """
+    Make the MinHash signature of the features of a shell link.
+
+    Meant to be passed as the `process` function of `scan_paths`, so that the signatures are made in the workers; to use
+    another `MinHasher`, bind it with `functools.partial`.
+
+    :param path: The path of the file from which the shell link was parsed.
+    :param shell_link: The shell link.
+    :param min_hasher: The MinHash signature maker.
+    :return: The signature of the features of the shell link.
+    """
+
+    return min_hasher.make_signature(features=extract_features(shell_link=shell_link))
+
+
+class LshIndex:
+    """
+    Clusters MinHash signatures with locality-sensitive hashing.
+
+    Each signature is split into bands of consecutive values, and each band is hashed into a bucket. A signature added
+    to the index is compared only with the first signature of each of its buckets already occupied, and is joined to the
+    cluster of each whose estimated similarity reaches the threshold, so that adding `n` signatures takes time linear in
+    `n` and the number of bands. Two feature sets with Jaccard similarity `s` share a bucket with probability
+    `1 - (1 - s ** r) ** b`, for `b` bands of `r` values; with the default of 16 bands of 4 values of 64-value
+    signatures, sets with a similarity of 0.7 share a bucket with a probability of about 0.99, so that few links similar
+    enough to be joined are missed, while the comparisons weed out the less similar links sharing a bucket.
+    """
+
+    __slots__ = ('num_bands', 'rows_per_band', 'threshold', '_keys', '_signatures', '_parents', '_buckets')
+
+    def __init__(
+        self,
+        num_permutations: int = DEFAULT_NUM_PERMUTATIONS,
+        num_bands: int = DEFAULT_NUM_BANDS,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ):
+        """
+        :param num_permutations: The length of the signatures to be added.
+        :param num_bands: The number of bands into which the signatures are split; must divide their length.
+        :param threshold: The estimated similarity from which signatures sharing a bucket are joined in a cluster.
+        """
+
+        if num_bands < 1 or num_permutations % num_bands:
+            raise ValueError(
+                f'The number of bands {num_bands} does not divide the signature length {num_permutations}.'
+            )
+
+        self.num_bands = num_bands
+        self.rows_per_band = num_permutations // num_bands
+        self.threshold = threshold
+
+        self._keys: list[Hashable] = []
+        # The signatures are stored back to back in an unboxed array, to limit the memory used by large indexes.
+        self._signatures: array = array('Q')
+        self._parents: list[int] = []
+        # The hash of each band of each bucket, mapped to the position of the first signature in it.
+        self._buckets: list[dict[int, int]] = [{} for _ in range(num_bands)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _get_signature(self, position: int) -> array:
+        signature_length = self.num_bands * self.rows_per_band
+        return self._signatures[position * signature_length:(position + 1) * signature_length]
+
+    def _iter_band_hashes(self, signature: tuple[int, ...]) -> Iterator[tuple[dict[int, int], int]]:
+        if len(signature) != self.num_bands * self.rows_per_band:
+            raise ValueError(
+                f'The signature has {len(signature)} values rather than {self.num_bands * self.rows_per_band}.'
+            )
+
+        for band_index, buckets in enumerate(self._buckets):
+            start = band_index * self.rows_per_band
+            yield buckets, hash(signature[start:start + self.rows_per_band])
+
+    def _find(self, position: int) -> int:
+        parents = self._parents
+        while (parent := parents[position]) != position:
+            # Path halving, so that the trees stay shallow.
+            parents[position] = parent = parents[parent]
+            position = parent
+
+        return position
+
+    def _union(self, position: int, other_position: int) -> None:
+        root = self._find(position=position)
+        other_root = self._find(position=other_position)
+
+        # The first position of a cluster is its root, so that it represents the cluster whatever the order in which
+        # the cluster was joined.
+        if root < other_root:
+            self._parents[other_root] = root
+        elif other_root < root:
+            self._parents[root] = other_root
+
+    def _iter_similar_positions(self, signature: tuple[int, ...]) -> Iterator[tuple[int, float]]:
+        positions: set[int] = set()
+        for buckets, band_hash in self._iter_band_hashes(signature=signature):
+            if (position := buckets.get(band_hash)) is not None and position not in positions:
+                positions.add(position)
+                similarity = estimate_similarity(signature, self._get_signature(position=position))
+                if similarity >= self.threshold:
+                    yield position, similarity
+
+    def add(self, key: Hashable, signature: tuple[int, ...]) -> None:
+        """
+        Add a signature to the index, joining it to the clusters of the similar signatures sharing its buckets.
+
+        :param key: The key by which the signature is referred to, such as the path of its shell link.
+        :param signature: A MinHash signature.
+        :return: None
+        """
+
+        position = len(self._keys)
+        similar_positions = [similar_position for similar_position, _ in self._iter_similar_positions(signature)]
+
+        self._keys.append(key)
+        self._signatures.extend(signature)
+        self._parents.append(position)
+
+        for buckets, band_hash in self._iter_band_hashes(signature=signature):
+            buckets.setdefault(band_hash, position)
+
+        for similar_position in similar_positions:
+            self._union(position=similar_position, other_position=position)
+
+    def query(self, signature: tuple[int, ...]) -> list[tuple[Hashable, float]]:
+        """
+        Find the clusters of the index that a signature would be joined to, without adding it.
+
+        :param signature: A MinHash signature.
+        :return: The key of the first signature of each cluster, paired with the highest estimated similarity of the
+            signature with a signature of the cluster sharing one of its buckets, by decreasing similarity.
+        """
+
+        cluster_similarities: dict[int, float] = {}
+        for position, similarity in self._iter_similar_positions(signature=signature):
+            root = self._find(position=position)
+            cluster_similarities[root] = max(similarity, cluster_similarities.get(root, 0.0))
+
+        return sorted(
+            ((self._keys[root], similarity) for root, similarity in cluster_similarities.items()),
+            key=lambda key_and_similarity: key_and_similarity[1],
+            reverse=True
+        )
+
+    def clusters(self, min_size: int = 1) -> list[list[Hashable]]:
+        """
+        Return the clusters of the index.
+
+        :param min_size: The size of the smallest cluster to be returned.
+        :return: The keys of each cluster, in the order in which they were added, the clusters by decreasing size.
+        """
+
+        clusters: dict[int, list[Hashable]] = {}
+        for position, key in enumerate(self._keys):
+            clusters.setdefault(self._find(position=position), []).append(key)
+
+        return sorted(
+            (cluster for cluster in clusters.values() if len(cluster) >= min_size),
+            key=len,
+            reverse=True
+        )
+
+
+def _scan_signatures(
+    paths: Iterable[str],
+    args: Type[FingerprintArgumentParser.Namespace],
+    min_hasher: MinHasher
+) -> Iterator[ScanResult]:
+    from functools import partial
+
+    return scan_paths(
+        paths=iter_lnk_paths(paths=paths, recursive=args.recursive, include_jump_lists=args.jump_lists),
+        process=partial(make_signature, min_hasher=min_hasher),
+        num_workers=args.workers,
+        chunk_size=args.chunk_size,
+        system_default_encoding=args.system_encoding
+    )
+
+
+def _iter_signatures(results: Iterable[ScanResult]) -> Iterator[tuple[str, tuple[int, ...]]]:
+    for result in results:
+        if result.is_error:
+            LOG.warning(f'Unable to parse {result.path}: {result.error_type}: {result.error_message}')
+            continue
+
+        yield result.path, result.output
+
+
+def main():
+    from logging import INFO, StreamHandler, Formatter
+    from sys import stderr, stdout
+    from json import dumps
+
+    from lnk_parser.cli import FingerprintArgumentParser
+
+    args: Type[FingerprintArgumentParser.Namespace] = FingerprintArgumentParser().parse_args()
+
+    LOG.setLevel(level=INFO)
+    handler = StreamHandler(stream=stderr)
+    handler.setFormatter(fmt=Formatter(fmt='%(levelname)s: %(message)s'))
+    LOG.addHandler(hdlr=handler)
+
+    try:
+        min_hasher = MinHasher(num_permutations=args.permutations)
+        lsh_index = LshIndex(num_permutations=args.permutations, num_bands=args.bands, threshold=args.threshold)
+    except ValueError as e:
+        LOG.error(e)
+        raise SystemExit(1)
+
+    if args.known:
+        known_results = _scan_signatures(paths=args.known, args=args, min_hasher=min_hasher)
+        for path, signature in _iter_signatures(results=known_results):
+            lsh_index.add(key=path, signature=signature)
+
+        LOG.info(f'Indexed {len(lsh_index)} known LNK files.')
+
+        results = _scan_signatures(paths=args.paths, args=args, min_hasher=min_hasher)
+        for path, signature in _iter_signatures(results=results):
+            matches = lsh_index.query(signature=signature)
+            if args.format == 'ndjson':
+                match_objects = [dict(path=key, similarity=round(similarity, 3)) for key, similarity in matches]
+                stdout.write(f'{dumps(dict(path=path, matches=match_objects), separators=(",", ":"))}\n')
+            elif matches:
+                stdout.write(f'{path}: {", ".join(f"{key} ({similarity:.2f})" for key, similarity in matches)}\n')
+            else:
+                stdout.write(f'{path}: no match\n')
+
+        return
+
+    results = _scan_signatures(paths=args.paths, args=args, min_hasher=min_hasher)
+    for path, signature in _iter_signatures(results=results):
+        lsh_index.add(key=path, signature=signature)
+
+    clusters = lsh_index.clusters(min_size=args.min_cluster_size)
+    LOG.info(f'Found {len(clusters)} clusters among {len(lsh_index)} LNK files.')
+
+    for cluster in clusters:
+        if args.format == 'ndjson':
+            stdout.write(f'{dumps(dict(size=len(cluster), paths=cluster), separators=(",", ":"))}\n')
+        else:
+            stdout.write(f'{len(cluster)} LNK files:\n' + ''.join(f'  {path}\n' for path in cluster))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Decoding of shell link headers in batches, into columns of NumPy arrays.
+
+Many headers packed one after another in a single buffer are decoded at once through a structured dtype, without
+making any Python objects per header. Requires NumPy, which is an optional dependency (the `numpy` extra).
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, fields
+from os import PathLike
+from typing import ByteString, Final, Iterable
+
+import numpy as np
+
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+
+# The fields of the shell link header, in the order and with the sizes of the `ShellLinkHeader` layout.
+HEADER_DTYPE: Final[np.dtype] = np.dtype([
+    ('header_size', '<u4'),
+    ('link_clsid', 'S16'),
+    ('link_flags', '<u4'),
+    ('file_attributes', '<u4'),
+    ('creation_time', '<u8'),
+    ('access_time', '<u8'),
+    ('write_time', '<u8'),
+    ('file_size', '<u4'),
+    ('icon_index', '<u4'),
+    ('show_command', '<u4'),
+    ('hot_key', '<u2'),
+    ('reserved', 'V10')
+])
+
+if HEADER_DTYPE.itemsize != ShellLinkHeader.SIZE:
+    raise RuntimeError(f'The header dtype has the size {HEADER_DTYPE.itemsize} rather than {ShellLinkHeader.SIZE}.')
+
+if HEADER_DTYPE.names[:-1] != ShellLinkHeader.LAYOUT.field_names:
+    raise RuntimeError(f'The header dtype has the fields {HEADER_DTYPE.names} rather than those of the header layout.')
+
+# The number of microseconds between the FILETIME epoch (1601-01-01) and the Unix epoch (1970-01-01).
+_FILETIME_EPOCH_OFFSET_US: Final[int] = 11_644_473_600_000_000
+
+
+@dataclass(slots=True)
+class HeaderColumns:
+    """
+    The fields of a batch of shell link headers, as one array per field.
+
+    Headers whose header size and link CLSID fields are incorrect are marked as invalid; their other fields are decoded
+    as they are. Unset (zero) times are `NaT`.
+    """
+
+    is_valid: np.ndarray
+    link_flags: np.ndarray
+    file_attributes: np.ndarray
+    creation_time: np.ndarray
+    access_time: np.ndarray
+    write_time: np.ndarray
+    file_size: np.ndarray
+    icon_index: np.ndarray
+    show_command: np.ndarray
+    hot_key: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.is_valid)
+
+    def as_dict(self) -> dict[str, np.ndarray]:
+        """
+        Return the columns by field name, without copying them, e.g. for making a `pandas.DataFrame`.
+
+        :return: A map from the name of each field to its column.
+        """
+
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+def filetimes_to_datetime64(filetimes: np.ndarray) -> np.ndarray:
+    """
+    Convert FILETIME values to datetimes with microsecond resolution.
+
+    :param filetimes: An array of FILETIME values, the numbers of 100-nanosecond intervals since 1601-01-01 UTC.
+    :return: An array of `datetime64[us]` values, in UTC; `NaT` where the FILETIME value is zero.
+    """
+
+    datetimes = ((filetimes // 10).astype(np.int64) - _FILETIME_EPOCH_OFFSET_US).view('datetime64[us]')
+    datetimes[filetimes == 0] = np.datetime64('NaT')
+
+    return datetimes
+
+
+def decode_headers(data: ByteString | memoryview, count: int | None = None, offset: int = 0) -> HeaderColumns:
+    """
+    Decode a batch of shell link headers packed one after another in a buffer.
+
+    :param data: The buffer containing the headers.
+    :param count: The number of headers to decode. Defaults to all headers from the offset to the end of the buffer,
+        whose size must then be a multiple of the header size.
+    :param offset: The offset in the buffer of the first header.
+    :return: The columns of the fields of the headers.
+    """
+
+    records = np.frombuffer(data, dtype=HEADER_DTYPE, count=-1 if count is None else count, offset=offset)
+
+    # The fields are copied out of the records, so that the columns are contiguous and do not keep the buffer alive.
+    return HeaderColumns(
+        is_valid=(records['header_size'] == ShellLinkHeader.SIZE) & (
+            records['link_clsid'] == ShellLinkHeader.LINK_CLSID.bytes_le
+        ),
+        link_flags=records['link_flags'].copy(),
+        file_attributes=records['file_attributes'].copy(),
+        creation_time=filetimes_to_datetime64(filetimes=records['creation_time']),
+        access_time=filetimes_to_datetime64(filetimes=records['access_time']),
+        write_time=filetimes_to_datetime64(filetimes=records['write_time']),
+        file_size=records['file_size'].copy(),
+        icon_index=records['icon_index'].copy(),
+        show_command=records['show_command'].copy(),
+        hot_key=records['hot_key'].copy()
+    )
+
+
+def read_headers(paths: Iterable[str | PathLike]) -> tuple[list[str], bytearray]:
+    """
+    Read the headers of files into a single buffer, as expected by `decode_headers`.
+
+    Files that cannot be read, or that are shorter than a header, are given a header of null bytes, which is decoded as
+    invalid, so that the headers remain aligned with the paths.
+
+    :param paths: The paths of LNK files.
+    :return: The paths, as strings, and the buffer of their headers.
+    """
+
+    path_list: list[str] = []
+    buffer = bytearray()
+
+    for path in paths:
+        path_list.append(str(path))
+        try:
+            with open(path, 'rb') as lnk_file:
+                header_bytes = lnk_file.read(ShellLinkHeader.SIZE)
+        except OSError:
+            header_bytes = b''
+
+        buffer += header_bytes if len(header_bytes) == ShellLinkHeader.SIZE else bytes(ShellLinkHeader.SIZE)
+
+    return path_list, buffer
@@ -0,0 +1,148 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ByteString, Final
+from struct import Struct, calcsize
+from datetime import datetime
+
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.structures.show_command import ShowCommand
+from lnk_parser.utils import datetime_to_filetime
+
+# The fields of the shell link header on which the filter is evaluated, in the order of the header layout.
+_FILTER_FIELD_NAMES: Final[frozenset[str]] = frozenset({
+    'link_flags', 'file_attributes', 'creation_time', 'access_time', 'write_time', 'file_size', 'show_command'
+})
+
+
+def _make_filter_fields_struct(layout: StructLayout) -> Struct:
+    """
+    Make a struct decoding only the fields of a layout on which the filter is evaluated.
+
+    The other fields are skipped as padding, and the time fields are decoded as integers rather than as bytes.
+
+    :param layout: The layout of the shell link header.
+    :return: A struct decoding the filter fields of the shell link header.
+    """
+
+    struct_format = '<'
+    num_padding_bytes = 0
+
+    for field_name, field_format in layout.fields:
+        if field_name not in _FILTER_FIELD_NAMES:
+            num_padding_bytes += calcsize(f'<{field_format}')
+            continue
+
+        if num_padding_bytes:
+            struct_format += f'{num_padding_bytes}x'
+            num_padding_bytes = 0
+
+        struct_format += 'Q' if field_format == '8s' else field_format
+
+    return Struct(struct_format)
+
+
+_FILTER_FIELDS_STRUCT: Final[Struct] = _make_filter_fields_struct(layout=ShellLinkHeader.LAYOUT)
+
+
+def _filetime_range(time_range: tuple[datetime | None, datetime | None] | None) -> tuple[int, int] | None:
+    if time_range is None:
+        return None
+
+    start, end = time_range
+
+    return (
+        datetime_to_filetime(value=start) if start is not None else 0,
+        datetime_to_filetime(value=end) if end is not None else 2**64 - 1
+    )
+
+
+@dataclass
+class HeaderFilter:
+    """
+    A predicate on the fields of a shell link header, evaluated on the header bytes alone.
+
+    Each criterion that is set must be satisfied for the header to match. A time criterion is not satisfied by an unset
+    (zero) time.
+    """
+
+    required_link_flags: LinkFlags = LinkFlags(0)
+    excluded_link_flags: LinkFlags = LinkFlags(0)
+    required_file_attributes: int = 0
+    show_commands: frozenset[ShowCommand] | None = None
+    creation_time_range: tuple[datetime | None, datetime | None] | None = None
+    access_time_range: tuple[datetime | None, datetime | None] | None = None
+    write_time_range: tuple[datetime | None, datetime | None] | None = None
+    min_file_size: int | None = None
+    max_file_size: int | None = None
+
+    def __post_init__(self):
+        self._creation_filetime_range = _filetime_range(time_range=self.creation_time_range)
+        self._access_filetime_range = _filetime_range(time_range=self.access_time_range)
+        self._write_filetime_range = _filetime_range(time_range=self.write_time_range)
+
+    def to_key(self) -> str:
+        """
+        Serialize the criteria of the filter into a key that is equal for filters having equal criteria.
+
+        The times are serialized as the FILETIME values they are compared as, and the show commands in order.
+
+        :return: The serialized criteria of the filter.
+        """
+
+        return '|'.join(
+            str(criterion) for criterion in (
+                int(self.required_link_flags),
+                int(self.excluded_link_flags),
+                self.required_file_attributes,
+                sorted(show_command.value for show_command in self.show_commands)
+                if self.show_commands is not None else None,
+                self._creation_filetime_range,
+                self._access_filetime_range,
+                self._write_filetime_range,
+                self.min_file_size,
+                self.max_file_size
+            )
+        )
+
+    def matches(self, data: ByteString | memoryview, base_offset: int = 0) -> bool:
+        """
+        Check whether a shell link header matches the filter.
+
+        :param data: A byte sequence containing the bytes constituting the shell link header.
+        :param base_offset: The offset from the start of the byte sequence of the shell link header.
+        :return: Whether the shell link header matches the filter.
+        """
+
+        (
+            link_flags, file_attributes, creation_time, access_time, write_time, file_size, show_command
+        ) = _FILTER_FIELDS_STRUCT.unpack_from(data, base_offset)
+
+        if link_flags & self.required_link_flags != self.required_link_flags:
+            return False
+
+        if link_flags & self.excluded_link_flags:
+            return False
+
+        if file_attributes & self.required_file_attributes != self.required_file_attributes:
+            return False
+
+        if self.show_commands is not None and show_command not in self.show_commands:
+            return False
+
+        for filetime, filetime_range in (
+            (creation_time, self._creation_filetime_range),
+            (access_time, self._access_filetime_range),
+            (write_time, self._write_filetime_range)
+        ):
+            if filetime_range is not None and not (filetime and filetime_range[0] <= filetime <= filetime_range[1]):
+                return False
+
+        if self.min_file_size is not None and file_size < self.min_file_size:
+            return False
+
+        if self.max_file_size is not None and file_size > self.max_file_size:
+            return False
+
+        return True
@@ -0,0 +1,356 @@
+"""
+Opt-in instrumentation of parsing.
+
+When a collector is installed with `set_collector`, the parser reports each stage of a shell link that it parses -- the
+header, each shell item, the link info, each string data field and each extra data block -- with the time it took, the
+number of bytes it covered and its outcome. No collector is installed by default, in which case the cost of a stage to
+the parser is a check of whether one is.
+
+The stages are named `header`, `link_info`, `string_data.<field name>`, `shell_item.0x<class type indicator>`,
+`extra_data.0x<signature>` for supported extra data blocks and `extra_data.unsupported` for the others. When scanning
+with a `process` function, such as one rendering the output, its application to each parsed shell link is the stage
+`process`. The outcome of a stage is `ok`, `unsupported` for shell items and extra data blocks that are kept undecoded,
+or `error` if parsing the structure raised an exception.
+
+The collector is global to the process: parsing in worker processes is not observed by a collector installed in the
+parent process.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from os import PathLike, fspath, getpid, replace
+from threading import Lock, local
+from time import monotonic, perf_counter_ns
+from typing import Final, Iterator
+
+OUTCOME_OK: Final[str] = 'ok'
+OUTCOME_UNSUPPORTED: Final[str] = 'unsupported'
+OUTCOME_ERROR: Final[str] = 'error'
+
+# The upper bounds of the duration histogram buckets, in nanoseconds, from one microsecond to a tenth of a second.
+DEFAULT_DURATION_BUCKETS_NS: Final[tuple[int, ...]] = (
+    1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 10_000_000, 100_000_000
+)
+
+
+class Collector(ABC):
+    """
+    A receiver of the observations of parse stages. A collector may be called from several threads at once.
+    """
+
+    @abstractmethod
+    def record(self, stage: str, duration_ns: int, num_bytes: int, outcome: str) -> None:
+        """
+        Record an observation of a parse stage.
+
+        :param stage: The name of the stage.
+        :param duration_ns: The time the stage took, in nanoseconds.
+        :param num_bytes: The number of bytes the stage covered; zero if it failed.
+        :param outcome: The outcome of the stage.
+        :return: None
+        """
+
+        raise NotImplementedError
+
+    def observe(self, stage: str, start_ns: int, num_bytes: int, outcome: str = OUTCOME_OK) -> int:
+        """
+        Record an observation of a parse stage that started at a time and ends now.
+
+        :param stage: The name of the stage.
+        :param start_ns: The time at which the stage started, from `time.perf_counter_ns`.
+        :param num_bytes: The number of bytes the stage covered; zero if it failed.
+        :param outcome: The outcome of the stage.
+        :return: The time after the observation has been recorded, from which a following stage may be timed.
+        """
+
+        self.record(stage=stage, duration_ns=perf_counter_ns() - start_ns, num_bytes=num_bytes, outcome=outcome)
+        return perf_counter_ns()
+
+
+_collector: Collector | None = None
+
+
+def get_collector() -> Collector | None:
+    """
+    Return the installed collector.
+
+    :return: The installed collector, or `None` if parsing is not instrumented.
+    """
+
+    return _collector
+
+
+def set_collector(collector: Collector | None) -> Collector | None:
+    """
+    Install a collector, to which the stages of all subsequent parsing in the process are reported.
+
+    :param collector: The collector to be installed, or `None` to stop instrumenting parsing.
+    :return: The previously installed collector.
+    """
+
+    global _collector
+
+    previous_collector = _collector
+    _collector = collector
+
+    return previous_collector
+
+
+@contextmanager
+def collecting(collector: Collector) -> Iterator[Collector]:
+    """
+    Install a collector for the duration of a `with` block, restoring the previously installed one afterwards.
+
+    :param collector: The collector to be installed.
+    :return: The installed collector.
+    """
+
+    previous_collector = set_collector(collector)
+    try:
+        yield collector
+    finally:
+        set_collector(previous_collector)
+
+
+@dataclass(slots=True)
+class StageStatistics:
+    """
+    The accumulated observations of a parse stage.
+    """
+
+    # The number of durations in each bucket; the last bucket holds those beyond the upper bound of every other.
+    duration_bucket_counts: list[int]
+    duration_sum_ns: int = 0
+    num_bytes: int = 0
+    outcome_counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return sum(self.outcome_counts.values())
+
+    def copy(self) -> StageStatistics:
+        return StageStatistics(
+            duration_bucket_counts=list(self.duration_bucket_counts),
+            duration_sum_ns=self.duration_sum_ns,
+            num_bytes=self.num_bytes,
+            outcome_counts=dict(self.outcome_counts)
+        )
+
+
+class HistogramCollector(Collector):
+    """
+    A collector that accumulates, in memory, a histogram of the durations of each stage together with the number of
+    bytes it covered and the count of each of its outcomes.
+    """
+
+    def __init__(self, duration_buckets_ns: tuple[int, ...] = DEFAULT_DURATION_BUCKETS_NS):
+        """
+        :param duration_buckets_ns: The upper bounds of the duration histogram buckets, in nanoseconds.
+        """
+
+        self.duration_buckets_ns: tuple[int, ...] = tuple(sorted(duration_buckets_ns))
+        self._stage_to_statistics: dict[str, StageStatistics] = {}
+        self._lock = Lock()
+
+    def record(self, stage: str, duration_ns: int, num_bytes: int, outcome: str) -> None:
+        bucket_index = bisect_left(self.duration_buckets_ns, duration_ns)
+
+        with self._lock:
+            if (stage_statistics := self._stage_to_statistics.get(stage)) is None:
+                stage_statistics = self._stage_to_statistics[stage] = StageStatistics(
+                    duration_bucket_counts=[0] * (len(self.duration_buckets_ns) + 1)
+                )
+
+            stage_statistics.duration_bucket_counts[bucket_index] += 1
+            stage_statistics.duration_sum_ns += duration_ns
+            stage_statistics.num_bytes += num_bytes
+            stage_statistics.outcome_counts[outcome] = stage_statistics.outcome_counts.get(outcome, 0) + 1
+
+    def snapshot(self) -> dict[str, StageStatistics]:
+        """
+        Return a copy of the statistics accumulated so far.
+
+        :return: A map from the name of each observed stage to its statistics, ordered by name.
+        """
+
+        with self._lock:
+            return {
+                stage: stage_statistics.copy()
+                for stage, stage_statistics in sorted(self._stage_to_statistics.items())
+            }
+
+    def reset(self) -> None:
+        """
+        Discard the statistics accumulated so far.
+
+        :return: None
+        """
+
+        with self._lock:
+            self._stage_to_statistics.clear()
+
+    def to_prometheus_text(self, namespace: str = 'lnk_parser') -> str:
+        """
+        Render the statistics accumulated so far in the Prometheus text exposition format.
+
+        Each stage is a value of the `stage` label of three metrics: the histogram `<namespace>_stage_duration_seconds`,
+        and the counters `<namespace>_stage_bytes_total` and `<namespace>_stage_outcomes_total`, the latter also
+        labelled by `outcome`.
+
+        :param namespace: The prefix of the names of the metrics.
+        :return: The metrics in the Prometheus text exposition format.
+        """
+
+        stage_to_statistics = self.snapshot()
+        upper_bounds = [f'{bound_ns / 1e9:g}' for bound_ns in self.duration_buckets_ns] + ['+Inf']
+
+        lines: list[str] = [
+            f'# HELP {namespace}_stage_duration_seconds The time taken to parse each stage.',
+            f'# TYPE {namespace}_stage_duration_seconds histogram'
+        ]
+        for stage, stage_statistics in stage_to_statistics.items():
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(upper_bounds, stage_statistics.duration_bucket_counts):
+                cumulative_count += bucket_count
+                lines.append(
+                    f'{namespace}_stage_duration_seconds_bucket{{stage="{stage}",le="{upper_bound}"}}'
+                    f' {cumulative_count}'
+                )
+            lines.append(
+                f'{namespace}_stage_duration_seconds_sum{{stage="{stage}"}} {stage_statistics.duration_sum_ns / 1e9}'
+            )
+            lines.append(f'{namespace}_stage_duration_seconds_count{{stage="{stage}"}} {cumulative_count}')
+
+        lines.extend((
+            f'# HELP {namespace}_stage_bytes_total The number of bytes covered by each stage.',
+            f'# TYPE {namespace}_stage_bytes_total counter'
+        ))
+        for stage, stage_statistics in stage_to_statistics.items():
+            lines.append(f'{namespace}_stage_bytes_total{{stage="{stage}"}} {stage_statistics.num_bytes}')
+
+        lines.extend((
+            f'# HELP {namespace}_stage_outcomes_total The number of times each stage had each outcome.',
+            f'# TYPE {namespace}_stage_outcomes_total counter'
+        ))
+        for stage, stage_statistics in stage_to_statistics.items():
+            for outcome, outcome_count in sorted(stage_statistics.outcome_counts.items()):
+                lines.append(
+                    f'{namespace}_stage_outcomes_total{{stage="{stage}",outcome="{outcome}"}} {outcome_count}'
+                )
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus_text(self, path: str | PathLike, namespace: str = 'lnk_parser') -> None:
+        """
+        Write the statistics accumulated so far to a file in the Prometheus text exposition format.
+
+        The file is replaced atomically, so that it may be read at any time, such as by the textfile collector of the
+        Prometheus node exporter.
+
+        :param path: The path of the file to be written.
+        :param namespace: The prefix of the names of the metrics.
+        :return: None
+        """
+
+        path = fspath(path)
+        temporary_path = f'{path}.{getpid()}.tmp'
+
+        with open(temporary_path, 'w', encoding='utf-8') as temporary_file:
+            temporary_file.write(self.to_prometheus_text(namespace=namespace))
+
+        replace(temporary_path, path)
+
+
+class StageDurationCollector(Collector):
+    """
+    A collector that sums the durations of the stages of each parse separately, for attributing them to the file
+    being parsed. A parse is delimited by `start` and `stop`, called in the thread that parses; stages recorded outside
+    of a parse are discarded.
+    """
+
+    def __init__(self):
+        self._local = local()
+
+    def start(self) -> None:
+        """
+        Start summing the durations of the stages recorded by the current thread.
+
+        :return: None
+        """
+
+        self._local.stage_durations_ns = {}
+
+    def stop(self) -> dict[str, int]:
+        """
+        Stop summing the durations of the stages recorded by the current thread.
+
+        :return: A map from the name of each stage recorded since `start` to the sum of its durations, in nanoseconds.
+        """
+
+        stage_durations_ns: dict[str, int] = getattr(self._local, 'stage_durations_ns', None) or {}
+        self._local.stage_durations_ns = None
+
+        return stage_durations_ns
+
+    def record(self, stage: str, duration_ns: int, num_bytes: int, outcome: str) -> None:
+        if (stage_durations_ns := getattr(self._local, 'stage_durations_ns', None)) is not None:
+            stage_durations_ns[stage] = stage_durations_ns.get(stage, 0) + duration_ns
+
+
+class PrometheusTextfileCollector(HistogramCollector):
+    """
+    A histogram collector that also dumps its statistics to a file in the Prometheus text exposition format, at most
+    once per interval while stages are recorded, and when it is closed.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike,
+        write_interval: float = 15.0,
+        namespace: str = 'lnk_parser',
+        duration_buckets_ns: tuple[int, ...] = DEFAULT_DURATION_BUCKETS_NS
+    ):
+        """
+        :param path: The path of the file to be written.
+        :param write_interval: The minimum number of seconds between writes of the file while stages are recorded.
+        :param namespace: The prefix of the names of the metrics.
+        :param duration_buckets_ns: The upper bounds of the duration histogram buckets, in nanoseconds.
+        """
+
+        super().__init__(duration_buckets_ns=duration_buckets_ns)
+
+        self.path = path
+        self.write_interval = write_interval
+        self.namespace = namespace
+        self._next_write_time = monotonic() + write_interval
+        self._write_lock = Lock()
+
+    def record(self, stage: str, duration_ns: int, num_bytes: int, outcome: str) -> None:
+        super().record(stage=stage, duration_ns=duration_ns, num_bytes=num_bytes, outcome=outcome)
+
+        # The file is written by whichever thread finds the interval elapsed; the others do not wait for it.
+        if monotonic() >= self._next_write_time and self._write_lock.acquire(blocking=False):
+            try:
+                self._next_write_time = monotonic() + self.write_interval
+                self.write_prometheus_text(path=self.path, namespace=self.namespace)
+            finally:
+                self._write_lock.release()
+
+    def close(self) -> None:
+        """
+        Write the file with the statistics accumulated so far.
+
+        :return: None
+        """
+
+        with self._write_lock:
+            self.write_prometheus_text(path=self.path, namespace=self.namespace)
+
+    def __enter__(self) -> PrometheusTextfileCollector:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+from logging import Logger, getLogger
+from dataclasses import dataclass
+from typing import Final, Iterator, TYPE_CHECKING
+from os import fspath, PathLike
+from mmap import mmap, ACCESS_READ
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.carving import find_shell_link_offsets
+from lnk_parser.header_filter import HeaderFilter
+
+# The compound file and DestList structures are imported when an automatic destinations jump list is first parsed, so
+# that scanning LNK files alone does not pay for importing them.
+if TYPE_CHECKING:
+    from lnk_parser.structures.compound_file import CompoundFile, CompoundFileDirectoryEntry
+    from lnk_parser.structures.dest_list import DestListEntry
+
+LOG: Logger = getLogger(__name__)
+
+AUTOMATIC_DESTINATIONS_SUFFIX: Final[str] = '.automaticdestinations-ms'
+CUSTOM_DESTINATIONS_SUFFIX: Final[str] = '.customdestinations-ms'
+
+DEST_LIST_STREAM_NAME: Final[str] = 'DestList'
+
+
+@dataclass(slots=True)
+class JumpListEntry:
+    shell_link: ShellLink
+    stream_name: str | None = None
+    offset: int | None = None
+    dest_list_entry: DestListEntry | None = None
+
+    def make_path(self, jump_list_path: str) -> str:
+        """
+        Make the path by which the shell link of the entry is referred to.
+
+        :param jump_list_path: The path of the jump list file of the entry.
+        :return: The path of the shell link, consisting of the jump list path followed by the stream name of the entry,
+            or the offset of the shell link when the entry has no stream.
+        """
+
+        return f'{jump_list_path}:{self.stream_name}' if self.stream_name is not None else (
+            f'{jump_list_path}@0x{self.offset:x}'
+        )
+
+
+def is_jump_list_path(path: str | PathLike) -> bool:
+    return fspath(path).lower().endswith((AUTOMATIC_DESTINATIONS_SUFFIX, CUSTOM_DESTINATIONS_SUFFIX))
+
+
+def iter_automatic_destinations_entries(
+    data: bytes | mmap,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None
+) -> Iterator[JumpListEntry]:
+    """
+    Yield the entries of an automatic destinations jump list, a compound file with one stream per shell link.
+
+    The shell links are parsed in place where their streams are stored contiguously. Each entry is accompanied by the
+    DestList entry referring to its stream, if any. Streams that cannot be parsed are logged and skipped.
+
+    :param data: The byte sequence constituting the jump list, such as a memory-mapped file.
+    :param system_default_encoding: The default encoding on the system on which the jump list was generated.
+    :param header_filter: A filter evaluated on the header of each shell link before it is parsed; shell links whose
+        headers do not match are skipped.
+    :return: An iterator of jump list entries.
+    """
+
+    from lnk_parser.structures.compound_file import CompoundFile
+
+    data_view = memoryview(data)
+    try:
+        yield from _iter_automatic_destinations_entries(
+            compound_file=CompoundFile.from_bytes(data=data_view),
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        )
+    finally:
+        data_view.release()
+
+
+def _stream_view(
+    compound_file: CompoundFile,
+    directory_entry: CompoundFileDirectoryEntry
+) -> tuple[memoryview, int | None]:
+    """
+    Make a view of exactly the data of a stream, so that a malformed structure in it cannot be read past its end.
+
+    :param compound_file: The compound file in which the stream is stored.
+    :param directory_entry: The directory entry of the stream.
+    :return: The view of the stream data, and the offset of the stream within the compound file if its sectors are
+        contiguous there.
+    """
+
+    stream_data, stream_offset, stream_size = compound_file.locate_stream(directory_entry=directory_entry)
+
+    return (
+        memoryview(stream_data)[stream_offset:stream_offset + stream_size],
+        stream_offset if stream_data is compound_file.data else None
+    )
+
+
+def _iter_automatic_destinations_entries(
+    compound_file: CompoundFile,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None
+) -> Iterator[JumpListEntry]:
+
+    from lnk_parser.structures.dest_list import DestList
+
+    stream_name_to_dest_list_entry: dict[str, DestListEntry] = {}
+    shell_link_stream_entries = []
+    for stream_entry in compound_file.iter_streams():
+        if stream_entry.name == DEST_LIST_STREAM_NAME:
+            with _stream_view(compound_file=compound_file, directory_entry=stream_entry)[0] as stream_view:
+                stream_name_to_dest_list_entry = {
+                    dest_list_entry.stream_name: dest_list_entry
+                    for dest_list_entry in DestList.from_bytes(data=stream_view).entries
+                }
+        else:
+            shell_link_stream_entries.append(stream_entry)
+
+    for stream_entry in shell_link_stream_entries:
+        stream_view, stream_offset = _stream_view(compound_file=compound_file, directory_entry=stream_entry)
+
+        with stream_view:
+            try:
+                if header_filter is not None and not header_filter.matches(data=stream_view):
+                    continue
+
+                shell_link = ShellLink.from_bytes(data=stream_view, system_default_encoding=system_default_encoding)
+            except Exception as e:
+                LOG.warning(f'Unable to parse the jump list stream {stream_entry.name}: {e.__class__.__name__}: {e}')
+                continue
+
+        yield JumpListEntry(
+            shell_link=shell_link,
+            stream_name=stream_entry.name,
+            offset=stream_offset,
+            dest_list_entry=stream_name_to_dest_list_entry.get(stream_entry.name)
+        )
+
+
+def iter_custom_destinations_entries(
+    data: bytes | mmap,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None
+) -> Iterator[JumpListEntry]:
+    """
+    Yield the entries of a custom destinations jump list, in which the shell links are stored one after another.
+
+    The shell links are located by their signatures and parsed in place. Signature hits that cannot be parsed are logged
+    and skipped.
+
+    :param data: The byte sequence constituting the jump list, such as a memory-mapped file.
+    :param system_default_encoding: The default encoding on the system on which the jump list was generated.
+    :param header_filter: A filter evaluated on the header of each shell link before it is parsed; shell links whose
+        headers do not match are skipped.
+    :return: An iterator of jump list entries.
+    """
+
+    data_view = memoryview(data)
+    try:
+        for offset in find_shell_link_offsets(data=data):
+            try:
+                if header_filter is not None and not header_filter.matches(data=data_view, base_offset=offset):
+                    continue
+
+                shell_link = ShellLink.from_bytes(
+                    data=data_view,
+                    base_offset=offset,
+                    system_default_encoding=system_default_encoding
+                )
+            except Exception as e:
+                LOG.warning(f'Unable to parse the shell link at offset 0x{offset:x}: {e.__class__.__name__}: {e}')
+                continue
+
+            yield JumpListEntry(shell_link=shell_link, offset=offset)
+    finally:
+        data_view.release()
+
+
+def iter_jump_list_entries(
+    path: str | PathLike,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    data: bytes | None = None
+) -> Iterator[JumpListEntry]:
+    """
+    Yield the entries of a jump list file, whose format is determined by its suffix.
+
+    The file is memory-mapped for as long as the iterator is consumed, unless its bytes are provided.
+
+    :param path: The path of an automatic or custom destinations jump list file.
+    :param system_default_encoding: The default encoding on the system on which the jump list was generated.
+    :param header_filter: A filter evaluated on the header of each shell link before it is parsed; shell links whose
+        headers do not match are skipped.
+    :param data: The bytes of the jump list file, such as those of an archive member, in which case the file is not
+        read and its path only determines its format.
+    :return: An iterator of jump list entries.
+    """
+
+    path = fspath(path)
+
+    if path.lower().endswith(AUTOMATIC_DESTINATIONS_SUFFIX):
+        iter_entries = iter_automatic_destinations_entries
+    elif path.lower().endswith(CUSTOM_DESTINATIONS_SUFFIX):
+        iter_entries = iter_custom_destinations_entries
+    else:
+        raise ValueError(f'The path {path} does not have the suffix of a jump list file.')
+
+    if data is not None:
+        yield from iter_entries(data=data, system_default_encoding=system_default_encoding, header_filter=header_filter)
+        return
+
+    with open(path, 'rb') as jump_list_file, mmap(jump_list_file.fileno(), 0, access=ACCESS_READ) as mapped:
+        yield from iter_entries(
+            data=mapped,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        )
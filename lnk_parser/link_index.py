@@ -0,0 +1,614 @@
+"""
+A searchable index of parsed shell links, stored in an SQLite database.
+
+The index is built from scan results whose outputs are made by `make_link_record`, and normalizes each shell link into
+tables of its own:
+
+- `links`: the header fields and string data of each shell link, together with its target path, keyed on `id`.
+- `id_list_items`: the items of the link target ID list of each link, by position.
+- `link_infos`: the link info of each link, referring to a row of `volumes` for its volume ID.
+- `volumes`: the distinct volume IDs, by drive type, serial number and label.
+- `extra_data_blocks`: the extra data blocks of each link, by position.
+- `tracker_data`: the machine ID and droids of the tracker data block of each link.
+- `parse_errors`: the files that could not be parsed.
+
+The target path, machine ID, droids and volume serial number are indexed, and the command line arguments are indexed
+for substring search in the full-text table `link_arguments` where SQLite provides the FTS5 trigram tokenizer.
+
+Run as a module to build an index or to query it:
+
+    $ python -m lnk_parser.link_index build links.db --recursive /mnt/evidence
+    $ python -m lnk_parser.link_index query links.db --machine-id desktop-4e2b9kl
+"""
+
+from __future__ import annotations
+from logging import Logger, getLogger
+from dataclasses import dataclass, field
+from typing import Any, Final, Iterable, Iterator, Type, TYPE_CHECKING
+from os import fspath, PathLike
+from itertools import islice
+from uuid import UUID
+from sqlite3 import connect as sqlite3_connect, Connection, OperationalError, Row
+
+from lnk_parser.scan import ScanResult, iter_lnk_paths, scan_paths
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_item import ShellItem
+from lnk_parser.structures.shell_item.file_entry import FileEntryShellItem
+from lnk_parser.structures.shell_item.root_folder import RootFolderShellItem
+from lnk_parser.structures.shell_item.volume import VolumeShellItem
+from lnk_parser.structures.extra_data import ExtraData, UnsupportedExtraData
+from lnk_parser.structures.extra_data.tracker_data_block import TrackerDataBlock
+
+if TYPE_CHECKING:
+    from lnk_parser.cli import LinkIndexArgumentParser
+
+LOG: Logger = getLogger(__name__)
+
+# Incremented when the layout of the index database changes.
+INDEX_SCHEMA_VERSION: Final[int] = 1
+
+# The number of scan results written to the index in each transaction.
+DEFAULT_BATCH_SIZE: Final[int] = 1000
+
+_SCHEMA_STATEMENTS: Final[tuple[str, ...]] = (
+    'CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)',
+    (
+        'CREATE TABLE IF NOT EXISTS links ('
+        'id INTEGER PRIMARY KEY, path TEXT NOT NULL, target_path TEXT COLLATE NOCASE, '
+        'link_flags INTEGER NOT NULL, file_attributes INTEGER NOT NULL, '
+        'creation_time TEXT, access_time TEXT, write_time TEXT, file_size INTEGER NOT NULL, show_command TEXT, '
+        'name_string TEXT, relative_path TEXT, working_dir TEXT, command_line_arguments TEXT, icon_location TEXT'
+        ')'
+    ),
+    'CREATE INDEX IF NOT EXISTS links_path ON links (path)',
+    'CREATE INDEX IF NOT EXISTS links_target_path ON links (target_path)',
+    # The type of an item is the name of its shell item class; items of unsupported classes have no type, but their
+    # class type indicator.
+    (
+        'CREATE TABLE IF NOT EXISTS id_list_items ('
+        'link_id INTEGER NOT NULL REFERENCES links (id), position INTEGER NOT NULL, '
+        'type TEXT, class_type_indicator INTEGER, name TEXT, file_size INTEGER, last_modified TEXT, '
+        'PRIMARY KEY (link_id, position)'
+        ') WITHOUT ROWID'
+    ),
+    (
+        'CREATE TABLE IF NOT EXISTS volumes ('
+        'id INTEGER PRIMARY KEY, drive_type TEXT NOT NULL, serial_number INTEGER NOT NULL, label TEXT NOT NULL, '
+        'UNIQUE (serial_number, drive_type, label)'
+        ')'
+    ),
+    (
+        'CREATE TABLE IF NOT EXISTS link_infos ('
+        'link_id INTEGER PRIMARY KEY REFERENCES links (id), link_info_flags INTEGER NOT NULL, '
+        'volume_id INTEGER REFERENCES volumes (id), local_base_path TEXT, common_path_suffix TEXT'
+        ')'
+    ),
+    'CREATE INDEX IF NOT EXISTS link_infos_volume_id ON link_infos (volume_id)',
+    # The type of a block is the name of its extra data class; unsupported blocks have no type.
+    (
+        'CREATE TABLE IF NOT EXISTS extra_data_blocks ('
+        'link_id INTEGER NOT NULL REFERENCES links (id), position INTEGER NOT NULL, '
+        'signature INTEGER NOT NULL, type TEXT, '
+        'PRIMARY KEY (link_id, position)'
+        ') WITHOUT ROWID'
+    ),
+    (
+        'CREATE TABLE IF NOT EXISTS tracker_data ('
+        'link_id INTEGER PRIMARY KEY REFERENCES links (id), machine_id TEXT NOT NULL COLLATE NOCASE, '
+        'droid_volume_id TEXT NOT NULL, droid_object_id TEXT NOT NULL, '
+        'birth_droid_volume_id TEXT NOT NULL, birth_droid_object_id TEXT NOT NULL'
+        ')'
+    ),
+    'CREATE INDEX IF NOT EXISTS tracker_data_machine_id ON tracker_data (machine_id)',
+    'CREATE INDEX IF NOT EXISTS tracker_data_droid_volume_id ON tracker_data (droid_volume_id)',
+    'CREATE INDEX IF NOT EXISTS tracker_data_droid_object_id ON tracker_data (droid_object_id)',
+    'CREATE INDEX IF NOT EXISTS tracker_data_birth_droid_volume_id ON tracker_data (birth_droid_volume_id)',
+    'CREATE INDEX IF NOT EXISTS tracker_data_birth_droid_object_id ON tracker_data (birth_droid_object_id)',
+    (
+        'CREATE TABLE IF NOT EXISTS parse_errors ('
+        'path TEXT PRIMARY KEY, error_type TEXT NOT NULL, error_message TEXT NOT NULL'
+        ') WITHOUT ROWID'
+    )
+)
+
+# Keyed on the ID of the link, as its `rowid`; absent where SQLite lacks the FTS5 trigram tokenizer.
+_ARGUMENTS_TABLE_STATEMENT: Final[str] = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS link_arguments USING fts5(command_line_arguments, tokenize='trigram')"
+)
+
+# The tables whose rows belong to a link, by `link_id`.
+_LINK_CHILD_TABLES: Final[tuple[str, ...]] = ('id_list_items', 'link_infos', 'extra_data_blocks', 'tracker_data')
+
+# Follows every string with a given prefix in the `NOCASE` collation, which compares the UTF-8 bytes of strings.
+_MAX_CHARACTER: Final[str] = '\U0010ffff'
+
+
+@dataclass(slots=True)
+class LinkRecord:
+    """
+    The rows describing a shell link in the index, without the ID of the link, which is assigned when it is added.
+
+    Unless noted otherwise, the tuples hold the values of the columns of the corresponding tables, in the order of the
+    columns, following the `id` and `path` columns of `links` and the `link_id` and `position` columns of the others.
+    """
+
+    path: str
+    link: tuple
+    id_list_items: list[tuple] = field(default_factory=list)
+    # The link info flags, local base path and common path suffix of the link info.
+    link_info: tuple | None = None
+    # The drive type, serial number and label of the volume ID of the link info.
+    volume: tuple[str, int, str] | None = None
+    extra_data_blocks: list[tuple] = field(default_factory=list)
+    tracker_data: tuple | None = None
+
+
+def get_target_path(shell_link: ShellLink) -> str | None:
+    """
+    Return the path of the target of a shell link.
+
+    The path is that of the link info, its local base path followed by its common path suffix, or else that made from
+    the items of the link target ID list.
+
+    :param shell_link: A shell link.
+    :return: The path of the target of the shell link, or `None` if it has neither.
+    """
+
+    if (link_info := shell_link.link_info) is not None and link_info.local_base_path:
+        return link_info.local_base_path + (link_info.common_path_suffix or '')
+
+    if shell_link.link_target_id_list is not None and (id_list_path := shell_link.link_target_id_list.path) is not None:
+        return str(id_list_path)
+
+    return None
+
+
+def _make_id_list_item_row(shell_item: ShellItem | bytes) -> tuple:
+    if isinstance(shell_item, FileEntryShellItem):
+        last_modified = shell_item.last_modified_datetime
+        return (
+            type(shell_item).__name__,
+            None,
+            shell_item.primary_name,
+            shell_item.file_size,
+            last_modified.isoformat() if last_modified is not None else None
+        )
+    elif isinstance(shell_item, VolumeShellItem):
+        return type(shell_item).__name__, None, shell_item.name, None, None
+    elif isinstance(shell_item, RootFolderShellItem):
+        return type(shell_item).__name__, None, str(shell_item.shell_folder_identifier), None, None
+    elif isinstance(shell_item, ShellItem):
+        return type(shell_item).__name__, None, None, None, None
+    else:
+        # The class type indicator follows the size field of the item.
+        return None, shell_item[2] if len(shell_item) > 2 else None, None, None, None
+
+
+def _make_extra_data_block_row(extra_data: ExtraData) -> tuple:
+    if isinstance(extra_data, UnsupportedExtraData):
+        return extra_data.signature, None
+
+    return extra_data.SIGNATURE, type(extra_data).__name__
+
+
+def make_link_record(path: str, shell_link: ShellLink) -> LinkRecord:
+    """
+    Make the rows describing a shell link in the index.
+
+    Meant to be passed as the `process` function of `scan_paths`, so that the rows are made in the workers.
+
+    :param path: The path of the file from which the shell link was parsed.
+    :param shell_link: The shell link to be indexed.
+    :return: The rows describing the shell link.
+    """
+
+    header = shell_link.header
+
+    link_record = LinkRecord(
+        path=path,
+        link=(
+            get_target_path(shell_link=shell_link),
+            header.link_flags.to_int(),
+            header.file_attributes.to_int(),
+            header.creation_time.isoformat() if header.creation_time is not None else None,
+            header.access_time.isoformat() if header.access_time is not None else None,
+            header.write_time.isoformat() if header.write_time is not None else None,
+            header.file_size,
+            header.show_command.name,
+            shell_link.name_string,
+            shell_link.relative_path,
+            shell_link.working_dir,
+            shell_link.command_line_arguments,
+            shell_link.icon_location
+        ),
+        id_list_items=[
+            _make_id_list_item_row(shell_item=shell_item)
+            for shell_item in shell_link.link_target_id_list or ()
+        ],
+        extra_data_blocks=[
+            _make_extra_data_block_row(extra_data=extra_data)
+            for extra_data in shell_link.extra_data_list
+        ]
+    )
+
+    if (link_info := shell_link.link_info) is not None:
+        link_record.link_info = (
+            link_info.link_info_flags.to_int(),
+            link_info.local_base_path,
+            link_info.common_path_suffix
+        )
+
+        if (volume_id := link_info.volume_id) is not None:
+            link_record.volume = (
+                volume_id.drive_type.name,
+                int.from_bytes(volume_id.drive_serial_number, byteorder='little'),
+                volume_id.volume_label
+            )
+
+    # A shell link has at most one tracker data block; should a malformed one have more, the first is indexed.
+    for extra_data in shell_link.extra_data_list:
+        if isinstance(extra_data, TrackerDataBlock):
+            link_record.tracker_data = (
+                extra_data.machine_id,
+                str(extra_data.droid[0]),
+                str(extra_data.droid[1]),
+                str(extra_data.droid_birth[0]),
+                str(extra_data.droid_birth[1])
+            )
+            break
+
+    return link_record
+
+
+def format_volume_serial_number(serial_number: int) -> str:
+    """
+    Format a volume serial number the way Windows displays it, as two groups of four hexadecimal digits.
+
+    :param serial_number: A volume serial number.
+    :return: The formatted volume serial number.
+    """
+
+    return f'{serial_number >> 16:04X}-{serial_number & 0xFFFF:04X}'
+
+
+def parse_volume_serial_number(value: str) -> int:
+    """
+    Parse a volume serial number, as displayed by Windows, such as `1A2B-3C4D`, or as hexadecimal digits.
+
+    :param value: The volume serial number to be parsed.
+    :return: The volume serial number.
+    """
+
+    serial_number = int(value.replace('-', ''), 16)
+    if not 0 <= serial_number <= 0xFFFFFFFF:
+        raise ValueError(f'The volume serial number {value} is not 32 bits.')
+
+    return serial_number
+
+
+class LinkIndex:
+    """
+    A searchable index of parsed shell links, stored in an SQLite database.
+
+    Adding the results of a path replaces the rows previously added for that path, so that an index can be refreshed by
+    building it again over the same files. An index is meant to be written by one process at a time.
+    """
+
+    def __init__(self, path: str | PathLike):
+        """
+        :param path: The path of the database file. It is created if it does not exist.
+        """
+
+        self.path = fspath(path)
+
+        self._connection: Connection = sqlite3_connect(self.path)
+        self._connection.row_factory = Row
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+
+        # The IDs of volumes already looked up, by their drive type, serial number and label.
+        self._volume_ids: dict[tuple[str, int, str], int] = {}
+
+        with self._connection:
+            self._connection.execute(_SCHEMA_STATEMENTS[0])
+
+            schema_version_row = self._connection.execute(
+                "SELECT value FROM metadata WHERE key = 'schema_version'"
+            ).fetchone()
+
+            if schema_version_row is not None and schema_version_row[0] != str(INDEX_SCHEMA_VERSION):
+                raise ValueError(
+                    f'The index {self.path} has the schema version {schema_version_row[0]} rather than'
+                    f' {INDEX_SCHEMA_VERSION}; it must be built anew.'
+                )
+
+            for statement in _SCHEMA_STATEMENTS[1:]:
+                self._connection.execute(statement)
+
+            try:
+                self._connection.execute(_ARGUMENTS_TABLE_STATEMENT)
+            except OperationalError as e:
+                LOG.warning(f'The command line arguments are not indexed for substring search: {e}')
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('schema_version', ?)",
+                (str(INDEX_SCHEMA_VERSION),)
+            )
+
+        self.has_arguments_table: bool = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'link_arguments'"
+        ).fetchone() is not None
+
+        self._next_link_id: int = self._connection.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM links').fetchone()[0]
+
+    def _get_volume_id(self, volume: tuple[str, int, str]) -> int:
+        if (volume_id := self._volume_ids.get(volume)) is None:
+            self._connection.execute(
+                'INSERT OR IGNORE INTO volumes (drive_type, serial_number, label) VALUES (?, ?, ?)',
+                volume
+            )
+            volume_id = self._connection.execute(
+                'SELECT id FROM volumes WHERE serial_number = ? AND drive_type = ? AND label = ?',
+                (volume[1], volume[0], volume[2])
+            ).fetchone()[0]
+            self._volume_ids[volume] = volume_id
+
+        return volume_id
+
+    def add_many(self, results: Iterable[ScanResult]) -> int:
+        """
+        Add scan results to the index, in a single transaction.
+
+        The outputs of results that are not errors must have been made by `make_link_record`. A path occurring more than
+        once, such as a file named both by itself and by its directory, is added once, from its last result.
+
+        :param results: The scan results to be added.
+        :return: The number of distinct paths added.
+        """
+
+        path_to_result: dict[str, ScanResult] = {result.path: result for result in results}
+        results = list(path_to_result.values())
+        paths = [(path,) for path in path_to_result]
+
+        link_rows: list[tuple] = []
+        id_list_item_rows: list[tuple] = []
+        link_info_rows: list[tuple] = []
+        extra_data_block_rows: list[tuple] = []
+        tracker_data_rows: list[tuple] = []
+        argument_rows: list[tuple[int, str]] = []
+        error_rows: list[tuple[str, str, str]] = []
+
+        with self._connection:
+            for table_name in _LINK_CHILD_TABLES:
+                self._connection.executemany(
+                    f'DELETE FROM {table_name} WHERE link_id IN (SELECT id FROM links WHERE path = ?)',
+                    paths
+                )
+            if self.has_arguments_table:
+                self._connection.executemany(
+                    'DELETE FROM link_arguments WHERE rowid IN (SELECT id FROM links WHERE path = ?)',
+                    paths
+                )
+            self._connection.executemany('DELETE FROM links WHERE path = ?', paths)
+            self._connection.executemany('DELETE FROM parse_errors WHERE path = ?', paths)
+
+            for result in results:
+                if result.is_error:
+                    error_rows.append((result.path, result.error_type, result.error_message))
+                    continue
+
+                link_record: LinkRecord = result.output
+                link_id = self._next_link_id
+                self._next_link_id += 1
+
+                link_rows.append((link_id, link_record.path, *link_record.link))
+                id_list_item_rows.extend(
+                    (link_id, position, *row) for position, row in enumerate(link_record.id_list_items)
+                )
+                if link_record.link_info is not None:
+                    link_info_rows.append((
+                        link_id,
+                        link_record.link_info[0],
+                        self._get_volume_id(volume=link_record.volume) if link_record.volume is not None else None,
+                        *link_record.link_info[1:]
+                    ))
+                extra_data_block_rows.extend(
+                    (link_id, position, *row) for position, row in enumerate(link_record.extra_data_blocks)
+                )
+                if link_record.tracker_data is not None:
+                    tracker_data_rows.append((link_id, *link_record.tracker_data))
+                # The command line arguments precede the icon location, the last column of the link row.
+                if self.has_arguments_table and (command_line_arguments := link_record.link[-2]) is not None:
+                    argument_rows.append((link_id, command_line_arguments))
+
+            self._connection.executemany(f'INSERT INTO links VALUES ({", ".join("?" * 15)})', link_rows)
+            self._connection.executemany('INSERT INTO id_list_items VALUES (?, ?, ?, ?, ?, ?, ?)', id_list_item_rows)
+            self._connection.executemany('INSERT INTO link_infos VALUES (?, ?, ?, ?, ?)', link_info_rows)
+            self._connection.executemany('INSERT INTO extra_data_blocks VALUES (?, ?, ?, ?)', extra_data_block_rows)
+            self._connection.executemany('INSERT INTO tracker_data VALUES (?, ?, ?, ?, ?, ?)', tracker_data_rows)
+            if argument_rows:
+                self._connection.executemany(
+                    'INSERT INTO link_arguments (rowid, command_line_arguments) VALUES (?, ?)',
+                    argument_rows
+                )
+            self._connection.executemany('INSERT INTO parse_errors VALUES (?, ?, ?)', error_rows)
+
+        return len(results)
+
+    def add_results(self, results: Iterable[ScanResult], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Add scan results to the index, in transactions of `batch_size` results each.
+
+        :param results: The scan results to be added.
+        :param batch_size: The number of results added in each transaction.
+        :return: The number of distinct paths added in each transaction, summed.
+        """
+
+        num_results = 0
+
+        results_iterator = iter(results)
+        while batch := list(islice(results_iterator, batch_size)):
+            num_results += self.add_many(results=batch)
+
+        return num_results
+
+    def query(
+        self,
+        target_path_prefix: str | None = None,
+        machine_id: str | None = None,
+        droid: UUID | None = None,
+        volume_serial_number: int | None = None,
+        arguments_substring: str | None = None,
+        limit: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Find the shell links in the index satisfying all of the provided criteria.
+
+        Paths, machine IDs and arguments are matched case-insensitively, with only ASCII letters folded.
+
+        :param target_path_prefix: A prefix of the target path, such as `C:\\Users`.
+        :param machine_id: The machine ID of the tracker data block.
+        :param droid: The volume or object ID of either of the droids of the tracker data block.
+        :param volume_serial_number: The serial number of the volume ID of the link info.
+        :param arguments_substring: A substring of the command line arguments.
+        :param limit: The largest number of shell links to find.
+        :return: An iterator of the path, target path, command line arguments and working directory, and the machine ID,
+            droids and volume of each shell link found.
+        """
+
+        conditions: list[str] = []
+        parameters: list[Any] = []
+
+        if target_path_prefix is not None:
+            conditions.append('links.target_path >= ? AND links.target_path < ?')
+            parameters.extend((target_path_prefix, target_path_prefix + _MAX_CHARACTER))
+
+        if machine_id is not None:
+            conditions.append('tracker_data.machine_id = ?')
+            parameters.append(machine_id)
+
+        # The links are looked up by subqueries, which the query planner resolves through the index of each column,
+        # where it would otherwise scan all links.
+        if droid is not None:
+            conditions.append(
+                'links.id IN ('
+                'SELECT link_id FROM tracker_data WHERE droid_volume_id = ? '
+                'UNION SELECT link_id FROM tracker_data WHERE droid_object_id = ? '
+                'UNION SELECT link_id FROM tracker_data WHERE birth_droid_volume_id = ? '
+                'UNION SELECT link_id FROM tracker_data WHERE birth_droid_object_id = ?'
+                ')'
+            )
+            parameters.extend((str(droid),) * 4)
+
+        if volume_serial_number is not None:
+            conditions.append(
+                'links.id IN ('
+                'SELECT link_id FROM link_infos WHERE volume_id IN (SELECT id FROM volumes WHERE serial_number = ?)'
+                ')'
+            )
+            parameters.append(volume_serial_number)
+
+        if arguments_substring is not None:
+            # The full-text table narrows the links down to those whose arguments contain the trigrams of the substring,
+            # treating `%` and `_` as wildcards; the links are then matched exactly.
+            if self.has_arguments_table:
+                conditions.append(
+                    'links.id IN (SELECT rowid FROM link_arguments WHERE command_line_arguments LIKE ?)'
+                )
+                parameters.append(f'%{arguments_substring}%')
+
+            conditions.append('instr(lower(links.command_line_arguments), lower(?)) > 0')
+            parameters.append(arguments_substring)
+
+        statement = (
+            'SELECT links.path, links.target_path, links.command_line_arguments, links.working_dir, '
+            'tracker_data.machine_id, tracker_data.droid_volume_id, tracker_data.droid_object_id, '
+            'tracker_data.birth_droid_volume_id, tracker_data.birth_droid_object_id, '
+            'volumes.drive_type, volumes.serial_number AS volume_serial_number, volumes.label AS volume_label '
+            'FROM links '
+            'LEFT JOIN tracker_data ON tracker_data.link_id = links.id '
+            'LEFT JOIN link_infos ON link_infos.link_id = links.id '
+            'LEFT JOIN volumes ON volumes.id = link_infos.volume_id'
+        )
+        if conditions:
+            statement += f' WHERE {" AND ".join(conditions)}'
+        if limit is not None:
+            statement += ' LIMIT ?'
+            parameters.append(limit)
+
+        for row in self._connection.execute(statement, parameters):
+            link = dict(row)
+            if link['volume_serial_number'] is not None:
+                link['volume_serial_number'] = format_volume_serial_number(serial_number=link['volume_serial_number'])
+            yield link
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> LinkIndex:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _build(args: Type[LinkIndexArgumentParser.Namespace]) -> None:
+    results = scan_paths(
+        paths=iter_lnk_paths(paths=args.paths, recursive=args.recursive, include_jump_lists=args.jump_lists),
+        process=make_link_record,
+        num_workers=args.workers,
+        ordered=False,
+        chunk_size=args.chunk_size,
+        system_default_encoding=args.system_encoding
+    )
+
+    with LinkIndex(path=args.database) as link_index:
+        num_results = link_index.add_results(results=results, batch_size=args.batch_size)
+
+    LOG.info(f'Indexed {num_results} results in {args.database}.')
+
+
+def _query(args: Type[LinkIndexArgumentParser.Namespace]) -> None:
+    from sys import stdout
+    from json import dumps
+
+    with LinkIndex(path=args.database) as link_index:
+        for link in link_index.query(
+            target_path_prefix=args.target_prefix,
+            machine_id=args.machine_id,
+            droid=args.droid,
+            volume_serial_number=args.volume_serial,
+            arguments_substring=args.arguments_contain,
+            limit=args.limit
+        ):
+            if args.format == 'ndjson':
+                stdout.write(f'{dumps(link, ensure_ascii=False, separators=(",", ":"))}\n')
+            else:
+                stdout.write(f'{link["path"]}\n')
+
+
+def main():
+    from logging import INFO, StreamHandler, Formatter
+    from sys import stderr
+
+    from lnk_parser.cli import LinkIndexArgumentParser
+
+    args: Type[LinkIndexArgumentParser.Namespace] = LinkIndexArgumentParser().parse_args()
+
+    LOG.setLevel(level=INFO)
+    handler = StreamHandler(stream=stderr)
+    handler.setFormatter(fmt=Formatter(fmt='%(levelname)s: %(message)s'))
+    LOG.addHandler(hdlr=handler)
+
+    try:
+        if args.command == 'build':
+            _build(args=args)
+        else:
+            _query(args=args)
+    except ValueError as e:
+        LOG.error(e)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
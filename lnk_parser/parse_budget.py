@@ -0,0 +1,43 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Final
+
+from lnk_parser.exceptions import ParseBudgetExceededError
+
+
+@dataclass(frozen=True, slots=True)
+class ParseLimits:
+    """
+    Limits on the parsing of a single shell link, which bound the work that a crafted file can cause.
+
+    The structures of a shell link must lie within `max_bytes` bytes of its start; data beyond them is not read, as if
+    the data ended there. At most `max_items` items whose number is taken from the file -- shell items, extra data
+    blocks, property storages and property values -- are parsed.
+    """
+
+    max_bytes: int = 4 * 2**20
+    max_items: int = 2**16
+
+
+DEFAULT_PARSE_LIMITS: Final[ParseLimits] = ParseLimits()
+
+
+@dataclass(slots=True)
+class ParseBudget:
+    """
+    The items of a single shell link parsed so far, counted against the limit on their number.
+    """
+
+    max_items: int
+    num_items: int = 0
+
+    def spend_item(self) -> None:
+        """
+        Count an item that is about to be parsed, raising `ParseBudgetExceededError` if the limit is exceeded.
+
+        :return: None
+        """
+
+        self.num_items += 1
+        if self.num_items > self.max_items:
+            raise ParseBudgetExceededError(num_items=self.num_items, max_items=self.max_items)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from typing import Any
+from dataclasses import is_dataclass, fields
+from json import JSONEncoder
+from uuid import UUID
+from datetime import datetime, timedelta
+from pathlib import PurePath
+
+from msdsalgs.utils import Mask
+from string_utils_py import text_align_delimiter, underline
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_item import ShellItem
+from lnk_parser.structures.extra_data import ExtraData
+
+
+class ShellLinkJSONEncoder(JSONEncoder):
+    """
+    A JSON encoder for shell links and their structures.
+
+    Structures are encoded as objects of their public fields, and of the attributes named in their `LAZY_FIELDS`, which
+    are decoded on first access, with shell items and extra data structures also carrying the name of their class under
+    `type`. Masks are encoded as their integer values, byte sequences as hex strings, times in ISO 8601 format and time
+    deltas as seconds.
+    """
+
+    def default(self, o: Any) -> Any:
+        if is_dataclass(o):
+            obj: dict[str, Any] = {'type': o.__class__.__name__} if isinstance(o, (ShellItem, ExtraData)) else {}
+            for dataclass_field in fields(o):
+                if not dataclass_field.name.startswith('_'):
+                    obj[dataclass_field.name] = getattr(o, dataclass_field.name)
+            for lazy_field_name in getattr(o, 'LAZY_FIELDS', ()):
+                obj[lazy_field_name] = getattr(o, lazy_field_name)
+            return obj
+        elif isinstance(o, Mask):
+            return o.to_int()
+        elif isinstance(o, (bytes, bytearray, memoryview)):
+            return bytes(o).hex()
+        elif isinstance(o, datetime):
+            return o.isoformat()
+        elif isinstance(o, timedelta):
+            return o.total_seconds()
+        elif isinstance(o, (UUID, PurePath)):
+            return str(o)
+
+        return super().default(o)
+
+
+_JSON_ENCODER = ShellLinkJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def render_text(path: str, shell_link: ShellLink) -> str:
+    """
+    Render a shell link as human-readable text, headed by the path of its file.
+
+    :param path: The path of the file from which the shell link was parsed.
+    :param shell_link: The shell link to be rendered.
+    :return: The text representation of the shell link.
+    """
+
+    return text_align_delimiter(
+        text=(
+            f'{underline(string=path, underline_character="=")}\n'
+            f'{shell_link}'
+        ),
+        delimiter=': ',
+        put_non_match_after_delimiter=False
+    )
+
+
+def render_ndjson(path: str, shell_link: ShellLink) -> str:
+    """
+    Render a shell link as a single-line JSON object, together with the path of its file.
+
+    :param path: The path of the file from which the shell link was parsed.
+    :param shell_link: The shell link to be rendered.
+    :return: The JSON representation of the shell link, without a trailing newline.
+    """
+
+    return _JSON_ENCODER.encode({'path': path, 'shell_link': shell_link})
+
+
+def render_ndjson_error(path: str, error_type: str, error_message: str) -> str:
+    """
+    Render an error that occurred when parsing a file as a single-line JSON object.
+
+    :param path: The path of the file that could not be parsed.
+    :param error_type: The name of the type of the error.
+    :param error_message: The message of the error.
+    :return: The JSON representation of the error, without a trailing newline.
+    """
+
+    return _JSON_ENCODER.encode({'path': path, 'error': {'type': error_type, 'message': error_message}})
@@ -0,0 +1,590 @@
+from __future__ import annotations
+from logging import Logger, getLogger
+from dataclasses import dataclass, field
+from typing import Any, ByteString, Callable, Final, Iterable, Iterator, TYPE_CHECKING
+from os import scandir, fspath, stat, PathLike
+from pathlib import Path
+from itertools import islice
+from functools import partial
+from contextlib import nullcontext, contextmanager
+from time import perf_counter_ns
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.header_filter import HeaderFilter
+from lnk_parser.jump_list import is_jump_list_path, iter_jump_list_entries
+from lnk_parser.utils import resolve_encoding
+from lnk_parser.instrumentation import StageDurationCollector, get_collector, set_collector, collecting, OUTCOME_ERROR
+
+if TYPE_CHECKING:
+    from lnk_parser.scan_cache import ScanCache
+
+LOG: Logger = getLogger(__name__)
+
+LNK_FILE_SUFFIX = '.lnk'
+
+# The stage in which the `process` function of a scan is applied to a parsed shell link.
+PROCESS_STAGE: Final[str] = 'process'
+
+# The modules whose error types are recorded by their bare names; the types of other modules are qualified by theirs.
+_UNQUALIFIED_ERROR_MODULE_NAMES: Final[frozenset[str]] = frozenset({'builtins', 'lnk_parser.exceptions'})
+
+# The number of paths looked up in the scan cache at a time, before their misses are parsed.
+CACHE_BATCH_SIZE: Final[int] = 4096
+
+# Set in each worker process by `_initialize_worker`, so that only the path needs to be sent with each task.
+_PROCESS: Callable[[str, ShellLink], Any] | None = None
+_SYSTEM_DEFAULT_ENCODING: str | None = None
+_HEADER_FILTER: HeaderFilter | None = None
+_COLLECT_STATISTICS: bool = False
+
+
+@dataclass(slots=True)
+class ParseStatistics:
+    """
+    The statistics of parsing a file, from opening it to processing its shell links.
+    """
+
+    duration_ns: int
+    num_bytes: int
+    # The time spent in each parse stage, as named by `lnk_parser.instrumentation`; empty unless a
+    # `StageDurationCollector` is installed.
+    stage_durations_ns: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ScanResult:
+    path: str
+    output: Any | None = None
+    error_type: str | None = None
+    error_message: str | None = None
+    statistics: ParseStatistics | None = None
+
+    @property
+    def is_error(self) -> bool:
+        return self.error_type is not None
+
+    @classmethod
+    def from_error(cls, path: str, error: BaseException) -> ScanResult:
+        """
+        Make the result of a path whose scan failed.
+
+        The type of the error is recorded by its name, qualified by the name of its module unless it is a built-in
+        exception or one of `lnk_parser.exceptions`, so that e.g. `struct.error` is not recorded as just `error`.
+
+        :param path: The path whose scan failed.
+        :param error: The error with which the scan failed.
+        :return: The result of the path.
+        """
+
+        error_class = type(error)
+        error_type = (
+            error_class.__qualname__ if error_class.__module__ in _UNQUALIFIED_ERROR_MODULE_NAMES
+            else f'{error_class.__module__}.{error_class.__qualname__}'
+        )
+
+        return cls(path=path, error_type=error_type, error_message=str(error))
+
+
+def iter_lnk_paths(
+    paths: Iterable[str | PathLike],
+    recursive: bool = False,
+    include_jump_lists: bool = False
+) -> Iterator[str]:
+    """
+    Yield the paths of the LNK files to be parsed.
+
+    Paths of files are yielded as they are. Directories are expanded into the files within them having the `.lnk`
+    suffix (case-insensitively), and are descended into if `recursive` is set. Symbolic links to directories are not
+    followed.
+
+    :param paths: Paths of LNK files or of directories containing LNK files.
+    :param recursive: Whether to descend into subdirectories of the provided directories.
+    :param include_jump_lists: Whether to also expand directories into the jump list files within them.
+    :return: An iterator of LNK file paths.
+    """
+
+    for path in paths:
+        path = fspath(path)
+
+        if not Path(path).is_dir():
+            yield path
+            continue
+
+        directory_stack: list[str] = [path]
+        while directory_stack:
+            try:
+                with scandir(directory_stack.pop()) as directory_entries:
+                    for directory_entry in directory_entries:
+                        if directory_entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                directory_stack.append(directory_entry.path)
+                        elif directory_entry.name.lower().endswith(LNK_FILE_SUFFIX):
+                            yield directory_entry.path
+                        elif include_jump_lists and is_jump_list_path(path=directory_entry.name):
+                            yield directory_entry.path
+            except OSError as e:
+                LOG.warning(f'Unable to list the directory {e.filename}: {e.strerror}')
+
+
+def _initialize_worker(
+    process: Callable[[str, ShellLink], Any] | None,
+    system_default_encoding: str | None,
+    header_filter: HeaderFilter | None,
+    collect_statistics: bool = False
+) -> None:
+    global _PROCESS, _SYSTEM_DEFAULT_ENCODING, _HEADER_FILTER, _COLLECT_STATISTICS
+
+    _PROCESS = process
+    _SYSTEM_DEFAULT_ENCODING = system_default_encoding
+    _HEADER_FILTER = header_filter
+    _COLLECT_STATISTICS = collect_statistics
+
+    if collect_statistics:
+        set_collector(StageDurationCollector())
+
+
+def _make_result(
+    path: str,
+    shell_link: ShellLink,
+    process: Callable[[str, ShellLink], Any] | None
+) -> ScanResult:
+    if process is None:
+        return ScanResult(path=path, output=shell_link)
+
+    if (collector := get_collector()) is None:
+        return ScanResult(path=path, output=process(path, shell_link))
+
+    # The processing, such as rendering the output, is timed as a stage of its own, so that it is not counted as time
+    # spent outside of the stages of the parse.
+    start_ns = perf_counter_ns()
+    try:
+        output = process(path, shell_link)
+    except Exception:
+        collector.observe(stage=PROCESS_STAGE, start_ns=start_ns, num_bytes=0, outcome=OUTCOME_ERROR)
+        raise
+
+    collector.observe(stage=PROCESS_STAGE, start_ns=start_ns, num_bytes=0)
+
+    return ScanResult(path=path, output=output)
+
+
+def _parse_file(
+    path: str,
+    process: Callable[[str, ShellLink], Any] | None,
+    system_default_encoding: str | None,
+    header_filter: HeaderFilter | None
+) -> list[ScanResult]:
+    try:
+        if is_jump_list_path(path=path):
+            return [
+                _make_result(
+                    path=jump_list_entry.make_path(jump_list_path=path),
+                    shell_link=jump_list_entry.shell_link,
+                    process=process
+                )
+                for jump_list_entry in iter_jump_list_entries(
+                    path=path,
+                    system_default_encoding=system_default_encoding,
+                    header_filter=header_filter
+                )
+            ]
+
+        with open(path, 'rb') as lnk_file:
+            if header_filter is not None and not header_filter.matches(data=lnk_file.read(ShellLinkHeader.SIZE)):
+                return []
+
+            shell_link = ShellLink.from_fd(fd=lnk_file.fileno(), system_default_encoding=system_default_encoding)
+
+        return [_make_result(path=path, shell_link=shell_link, process=process)]
+    except Exception as e:
+        return [ScanResult.from_error(path=path, error=e)]
+
+
+def parse_path(
+    path: str,
+    process: Callable[[str, ShellLink], Any] | None = None,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    collect_statistics: bool = False
+) -> list[ScanResult]:
+    """
+    Parse the LNK file at a path, or each of the LNK files embedded in the jump list file at a path.
+
+    A file that cannot be read or parsed produces a result describing the error rather than raising an exception.
+
+    :param path: The path of an LNK file or a jump list file.
+    :param process: A function applied to the path and the shell link of each parsed file, whose return value becomes
+        the output of the result. Defaults to producing the shell link itself.
+    :param system_default_encoding: The default encoding on the system on which the LNK file was generated.
+    :param header_filter: A filter evaluated on the header of each LNK file before it is parsed.
+    :param collect_statistics: Whether to attach the statistics of parsing the file to its first result. The time of
+        each parse stage is included if a `StageDurationCollector` is installed.
+    :return: The results of the file; none if it is skipped by the header filter, and one for each of its embedded LNK
+        files if it is a jump list file.
+    """
+
+    if not collect_statistics:
+        return _parse_file(
+            path=path,
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        )
+
+    return _parse_measured(
+        parse=partial(
+            _parse_file,
+            path=path,
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        ),
+        get_num_bytes=partial(_get_file_size, path=path)
+    )
+
+
+def _get_file_size(path: str) -> int:
+    try:
+        return stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _parse_measured(parse: Callable[[], list[ScanResult]], get_num_bytes: Callable[[], int]) -> list[ScanResult]:
+    """
+    Parse a file and attach the statistics of parsing it to its first result.
+
+    :param parse: A function parsing the file.
+    :param get_num_bytes: A function producing the size of the file.
+    :return: The results of the file.
+    """
+
+    collector = get_collector()
+    stage_duration_collector = collector if isinstance(collector, StageDurationCollector) else None
+
+    if stage_duration_collector is not None:
+        stage_duration_collector.start()
+    start_ns = perf_counter_ns()
+
+    results = parse()
+
+    duration_ns = perf_counter_ns() - start_ns
+    stage_durations_ns = stage_duration_collector.stop() if stage_duration_collector is not None else {}
+
+    if results:
+        results[0].statistics = ParseStatistics(
+            duration_ns=duration_ns,
+            num_bytes=get_num_bytes(),
+            stage_durations_ns=stage_durations_ns
+        )
+
+    return results
+
+
+def parse_data(
+    path: str,
+    data: ByteString | memoryview,
+    process: Callable[[str, ShellLink], Any] | None = None,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    collect_statistics: bool = False
+) -> list[ScanResult]:
+    """
+    Parse the bytes of an LNK file, or of a jump list file, recognized by the suffix of its path.
+
+    A file that cannot be parsed produces a result describing the error rather than raising an exception.
+
+    :param path: The path, or another name, by which the LNK file is referred to in its result.
+    :param data: The bytes of the LNK file.
+    :param process: A function applied to the path and the shell link of the parsed file, whose return value becomes
+        the output of the result. Defaults to producing the shell link itself.
+    :param system_default_encoding: The default encoding on the system on which the LNK file was generated.
+    :param header_filter: A filter evaluated on the header of the LNK file before it is parsed.
+    :param collect_statistics: Whether to attach the statistics of parsing the file to its first result. The time of
+        each parse stage is included if a `StageDurationCollector` is installed.
+    :return: The result of the file; none if it is skipped by the header filter, and one for each of its embedded LNK
+        files if it is a jump list file.
+    """
+
+    if not collect_statistics:
+        return _parse_data(
+            path=path,
+            data=data,
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        )
+
+    return _parse_measured(
+        parse=partial(
+            _parse_data,
+            path=path,
+            data=data,
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter
+        ),
+        get_num_bytes=lambda: len(data)
+    )
+
+
+def _parse_data(
+    path: str,
+    data: ByteString | memoryview,
+    process: Callable[[str, ShellLink], Any] | None,
+    system_default_encoding: str | None,
+    header_filter: HeaderFilter | None
+) -> list[ScanResult]:
+    try:
+        if is_jump_list_path(path=path):
+            return [
+                _make_result(
+                    path=jump_list_entry.make_path(jump_list_path=path),
+                    shell_link=jump_list_entry.shell_link,
+                    process=process
+                )
+                for jump_list_entry in iter_jump_list_entries(
+                    path=path,
+                    system_default_encoding=system_default_encoding,
+                    header_filter=header_filter,
+                    data=data
+                )
+            ]
+
+        if header_filter is not None and not header_filter.matches(data=data):
+            return []
+
+        shell_link = ShellLink.from_bytes(data=data, system_default_encoding=system_default_encoding)
+
+        return [_make_result(path=path, shell_link=shell_link, process=process)]
+    except Exception as e:
+        return [ScanResult.from_error(path=path, error=e)]
+
+
+def _parse_path(path: str) -> list[ScanResult]:
+    return parse_path(
+        path=path,
+        process=_PROCESS,
+        system_default_encoding=_SYSTEM_DEFAULT_ENCODING,
+        header_filter=_HEADER_FILTER,
+        collect_statistics=_COLLECT_STATISTICS
+    )
+
+
+def _parse_path_keyed(path: str, parse: Callable[[str], list[ScanResult]]) -> tuple[str, list[ScanResult]]:
+    return path, parse(path)
+
+
+def _make_cache_context(
+    process: Callable[[str, ShellLink], Any] | None,
+    system_default_encoding: str | None,
+    header_filter: HeaderFilter | None
+) -> str:
+    process_name = f'{process.__module__}.{process.__qualname__}' if process is not None else None
+    header_filter_key = header_filter.to_key() if header_filter is not None else None
+    return f'{process_name}|{resolve_encoding(system_default_encoding)}|{header_filter_key}'
+
+
+def _scan_paths_cached(
+    paths: Iterable[str],
+    cache: ScanCache,
+    parse: Callable[[str], list[ScanResult]],
+    map_paths: Callable[[Callable[[str], tuple[str, list[ScanResult]]], Iterable[str]], Iterator],
+    ordered: bool
+) -> Iterator[ScanResult]:
+    """
+    Produce the results of files from the scan cache, parsing only the files whose results are not cached.
+
+    The paths are processed in batches: the cached results of a batch are looked up, its remaining files are parsed, and
+    their results are stored.
+
+    :param paths: The paths of the files to be parsed.
+    :param cache: The scan cache.
+    :param parse: The function parsing the file at a path.
+    :param map_paths: A function mapping a function over paths, such as `map` or the `imap` method of a pool.
+    :param ordered: Whether to produce the results in the order of `paths`.
+    :return: An iterator of scan results.
+    """
+
+    from lnk_parser.scan_cache import get_file_identity
+
+    paths_iterator = iter(paths)
+    while batch := list(islice(paths_iterator, CACHE_BATCH_SIZE)):
+        file_identities = {path: get_file_identity(path=path) for path in batch}
+        cached_results = cache.get_many(
+            entries=(
+                (path, file_identity) for path, file_identity in file_identities.items() if file_identity is not None
+            )
+        )
+
+        parsed_results: Iterator[tuple[str, list[ScanResult]]] = map_paths(
+            partial(_parse_path_keyed, parse=parse),
+            (path for path in batch if path not in cached_results)
+        )
+
+        new_entries = []
+        if ordered:
+            for path in batch:
+                if (results := cached_results.get(path)) is None:
+                    _, results = next(parsed_results)
+                    if (file_identity := file_identities[path]) is not None:
+                        new_entries.append((path, file_identity, results))
+                yield from results
+        else:
+            for path in batch:
+                if (results := cached_results.get(path)) is not None:
+                    yield from results
+
+            for path, results in parsed_results:
+                if (file_identity := file_identities[path]) is not None:
+                    new_entries.append((path, file_identity, results))
+                yield from results
+
+        cache.put_many(entries=new_entries)
+
+
+@contextmanager
+def scan_session(
+    process: Callable[[str, ShellLink], Any] | None = None,
+    num_workers: int = 1,
+    ordered: bool = True,
+    max_tasks_per_worker: int | None = None,
+    chunk_size: int = 16,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    cache_path: str | PathLike | None = None,
+    use_threads: bool = False,
+    collect_statistics: bool = False
+) -> Iterator[Callable[[Iterable[str]], Iterator[ScanResult]]]:
+    """
+    Open the cache and start the pool of worker processes or threads once, for scanning several batches of paths.
+
+    The parameters are those of `scan_paths`. The batches are to be scanned one at a time, each to completion, within
+    the session.
+
+    :return: A context manager providing a function that scans a batch of paths as `scan_paths` would.
+    """
+
+    # The cache and the pools are imported only when used, as importing `sqlite3` and `multiprocessing` would be a large
+    # part of the startup time of parsing a single file.
+    if cache_path is not None:
+        from lnk_parser.scan_cache import ScanCache
+
+        cache_context = ScanCache(
+            path=cache_path,
+            context=_make_cache_context(
+                process=process,
+                system_default_encoding=system_default_encoding,
+                header_filter=header_filter
+            )
+        )
+    else:
+        cache_context = nullcontext()
+
+    if num_workers <= 1 or use_threads:
+        # The settings are bound to the function rather than set as the worker globals, so that scans made concurrently
+        # within the current process do not interfere with each other.
+        parse = partial(
+            parse_path,
+            process=process,
+            system_default_encoding=system_default_encoding,
+            header_filter=header_filter,
+            collect_statistics=collect_statistics
+        )
+        collector_context = collecting(StageDurationCollector()) if collect_statistics else nullcontext()
+        if num_workers > 1:
+            from multiprocessing.pool import ThreadPool
+
+            pool_context = ThreadPool(processes=num_workers)
+        else:
+            pool_context = nullcontext()
+    else:
+        from multiprocessing import Pool
+
+        parse = _parse_path
+        collector_context = nullcontext()
+        pool_context = Pool(
+            processes=num_workers,
+            initializer=_initialize_worker,
+            initargs=(process, system_default_encoding, header_filter, collect_statistics),
+            # The pool counts the chunks of paths that a worker has been sent, rather than the files, so the number of
+            # files is rounded up to a whole number of chunks.
+            maxtasksperchild=-(-max_tasks_per_worker // chunk_size) if max_tasks_per_worker is not None else None
+        )
+
+    with cache_context as cache, collector_context, pool_context as pool:
+        if pool is not None:
+            map_paths = partial(pool.imap if ordered else pool.imap_unordered, chunksize=chunk_size)
+        else:
+            map_paths = map
+
+        def scan(paths: Iterable[str]) -> Iterator[ScanResult]:
+            if cache is not None:
+                return _scan_paths_cached(paths=paths, cache=cache, parse=parse, map_paths=map_paths, ordered=ordered)
+
+            return (result for results in map_paths(parse, paths) for result in results)
+
+        yield scan
+
+
+def scan_paths(
+    paths: Iterable[str],
+    process: Callable[[str, ShellLink], Any] | None = None,
+    num_workers: int = 1,
+    ordered: bool = True,
+    max_tasks_per_worker: int | None = None,
+    chunk_size: int = 16,
+    system_default_encoding: str | None = None,
+    header_filter: HeaderFilter | None = None,
+    cache_path: str | PathLike | None = None,
+    use_threads: bool = False,
+    collect_statistics: bool = False
+) -> Iterator[ScanResult]:
+    """
+    Parse LNK files, possibly spreading the work across a pool of worker processes or threads.
+
+    A file that cannot be read or parsed does not stop the scan; a result describing the error is produced instead.
+    Jump list files, recognized by their suffixes, produce one result for each of their embedded LNK files.
+
+    :param paths: The paths of the LNK files, or jump list files, to be parsed.
+    :param process: A function applied to the path and the shell link of each parsed file, in the worker, whose return
+        value becomes the output of the result. Must be picklable, and return a picklable value, when more than one
+        worker is used. Defaults to producing the shell link itself.
+    :param num_workers: The number of worker processes, or threads. With one worker, the files are parsed in the current
+        thread.
+    :param ordered: Whether to produce the results in the order of `paths` rather than in order of completion.
+    :param max_tasks_per_worker: The number of files a worker process parses before it is replaced by a fresh one,
+        bounding the memory usage of long-running scans. As the files are sent in chunks, the number is rounded up to a
+        multiple of `chunk_size`. Defaults to never replacing the workers.
+    :param chunk_size: The number of paths sent to a worker process at a time.
+    :param system_default_encoding: The default encoding on the system on which the LNK files were generated.
+    :param header_filter: A filter evaluated on the header of each file before it is parsed; files whose headers do not
+        match are skipped without producing a result.
+    :param cache_path: The path of an SQLite database in which the results are cached across scans. The results of a
+        file are reused, instead of parsing the file, as long as its path, device and inode numbers, size and
+        modification time are unchanged, and the results were produced by the same parser version with the same
+        `process` function (by qualified name), system encoding and header filter.
+    :param use_threads: Whether the workers are threads of the current process rather than processes. The threads only
+        parse in parallel on free-threaded builds of CPython, but avoid the cost of sending the results between
+        processes, and `process` and its return values need not be picklable. `max_tasks_per_worker` is not applied.
+    :param collect_statistics: Whether to attach the statistics of parsing each file, including the time of each parse
+        stage, to its first result; see `ParseStatistics`. A `StageDurationCollector` is installed, in the current
+        process for the duration of the scan, or in the worker processes. The results produced from the cache carry no
+        statistics.
+    :return: An iterator of scan results.
+    """
+
+    with scan_session(
+        process=process,
+        num_workers=num_workers,
+        ordered=ordered,
+        max_tasks_per_worker=max_tasks_per_worker,
+        chunk_size=chunk_size,
+        system_default_encoding=system_default_encoding,
+        header_filter=header_filter,
+        cache_path=cache_path,
+        use_threads=use_threads,
+        collect_statistics=collect_statistics
+    ) as scan:
+        yield from scan(paths)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+from logging import Logger, getLogger
+from typing import Final, Iterable
+from itertools import islice
+from os import stat, fspath, PathLike
+from pathlib import Path
+from hashlib import sha256
+from functools import cache
+from dataclasses import replace
+from pickle import dumps as pickle_dumps, loads as pickle_loads, HIGHEST_PROTOCOL
+from sqlite3 import connect as sqlite3_connect, Connection
+
+from lnk_parser.scan import ScanResult
+
+LOG: Logger = getLogger(__name__)
+
+# Incremented when the layout of the cache database changes.
+CACHE_SCHEMA_VERSION: Final[int] = 1
+
+# The number of paths looked up in a single query, below SQLite's smallest default limit on the number of parameters.
+_LOOKUP_CHUNK_SIZE: Final[int] = 500
+
+# The device number, inode number, size and modification time (in nanoseconds) of a file.
+FileIdentity = tuple[int, int, int, int]
+
+
+@cache
+def get_parser_version() -> str:
+    """
+    Return a version identifier of the parser, derived from the contents of its source files.
+
+    Any change to the parser's source, and thereby possibly to the results it produces, yields a new identifier.
+
+    :return: The version identifier of the parser.
+    """
+
+    package_dir = Path(__file__).parent
+
+    digest = sha256(str(CACHE_SCHEMA_VERSION).encode())
+    for source_path in sorted(package_dir.rglob('*.py')):
+        digest.update(source_path.relative_to(package_dir).as_posix().encode())
+        digest.update(source_path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def get_file_identity(path: str | PathLike) -> FileIdentity | None:
+    """
+    Return the identity of the file at a path, which changes when the file is replaced or modified.
+
+    :param path: The path of a file.
+    :return: The identity of the file, or `None` if the file cannot be stat'ed.
+    """
+
+    try:
+        stat_result = stat(path)
+    except OSError:
+        return None
+
+    return stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns
+
+
+class ScanCache:
+    """
+    An on-disk cache of scan results, stored in an SQLite database.
+
+    The results of a file are keyed on its path and on a context describing how the results were produced (the
+    function applied to each shell link, the system encoding and the header filter), and are valid as long as the
+    identity of the file is unchanged. All results are discarded when the database was written by another version of
+    the parser.
+
+    The results are stored pickled; the database must only be read if it is trusted.
+    """
+
+    def __init__(self, path: str | PathLike, context: str = ''):
+        """
+        :param path: The path of the database file. It is created if it does not exist.
+        :param context: A description of how the results are produced; results cached in other contexts are not used.
+        """
+
+        self.path = fspath(path)
+        self.context = context
+
+        self._connection: Connection = sqlite3_connect(self.path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS scan_results ('
+                'path TEXT NOT NULL, context TEXT NOT NULL, '
+                'device INTEGER NOT NULL, inode INTEGER NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, '
+                'results BLOB NOT NULL, '
+                'PRIMARY KEY (path, context)'
+                ') WITHOUT ROWID'
+            )
+
+            parser_version_row = self._connection.execute(
+                "SELECT value FROM metadata WHERE key = 'parser_version'"
+            ).fetchone()
+
+            if parser_version_row is None or parser_version_row[0] != get_parser_version():
+                if parser_version_row is not None:
+                    LOG.info(f'The scan cache {self.path} was written by another parser version; it is cleared.')
+
+                self._connection.execute('DELETE FROM scan_results')
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES ('parser_version', ?)",
+                    (get_parser_version(),)
+                )
+
+    def get(self, path: str, file_identity: FileIdentity) -> list[ScanResult] | None:
+        """
+        Return the cached results of a file.
+
+        :param path: The path of the file.
+        :param file_identity: The current identity of the file.
+        :return: The cached results of the file, or `None` if there are none for its current identity.
+        """
+
+        return self.get_many(entries=[(path, file_identity)]).get(path)
+
+    def get_many(self, entries: Iterable[tuple[str, FileIdentity]]) -> dict[str, list[ScanResult]]:
+        """
+        Return the cached results of files, looking them up a chunk of paths per query.
+
+        :param entries: The path and current identity of each file.
+        :return: The cached results of each file having results for its current identity, by path.
+        """
+
+        cached_results: dict[str, list[ScanResult]] = {}
+
+        entries_iterator = iter(entries)
+        while chunk := dict(islice(entries_iterator, _LOOKUP_CHUNK_SIZE)):
+            rows = self._connection.execute(
+                'SELECT path, device, inode, size, mtime_ns, results FROM scan_results '
+                f'WHERE context = ? AND path IN ({", ".join("?" * len(chunk))})',
+                (self.context, *chunk)
+            )
+
+            for path, *file_identity, results in rows:
+                if tuple(file_identity) == chunk[path]:
+                    cached_results[path] = pickle_loads(results)
+
+        return cached_results
+
+    def put_many(self, entries: Iterable[tuple[str, FileIdentity, list[ScanResult]]]) -> None:
+        """
+        Store the results of files, replacing any previously cached results of the same paths.
+
+        The parse statistics of the results are not stored, as they describe the parse that produced them rather than
+        the file. Nor are the results of files with an error result, so that a file that could not be read or parsed,
+        possibly for a transient reason such as a sharing violation, is parsed again by the next scan.
+
+        :param entries: The path, identity and results of each file.
+        :return: None
+        """
+
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO scan_results (path, context, device, inode, size, mtime_ns, results) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    (
+                        path,
+                        self.context,
+                        *file_identity,
+                        pickle_dumps(
+                            [
+                                replace(result, statistics=None) if result.statistics is not None else result
+                                for result in results
+                            ],
+                            protocol=HIGHEST_PROTOCOL
+                        )
+                    )
+                    for path, file_identity, results in entries
+                    if not any(result.is_error for result in results)
+                )
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> ScanCache:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
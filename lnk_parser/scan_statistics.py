@@ -0,0 +1,151 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from heapq import heappush, heappushpop
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Iterator
+
+from lnk_parser.scan import ScanResult
+
+
+class ScanStatistics:
+    """
+    Statistics of a scan, accumulated from its results: the throughput, the split of the parse time among the parse
+    stages, the number of errors of each type and the slowest files.
+
+    The throughput and the time split are computed from the results that carry parse statistics (see `scan_paths`);
+    the others, such as results produced from the cache, are only counted.
+    """
+
+    def __init__(self, num_slowest: int = 10):
+        """
+        :param num_slowest: The number of slowest files to keep.
+        """
+
+        self.num_slowest = num_slowest
+
+        self._start_time = monotonic()
+        self._num_results = 0
+        self._num_parsed_files = 0
+        self._num_parsed_bytes = 0
+        self._parse_time_ns = 0
+        self._stage_durations_ns: dict[str, int] = {}
+        self._error_type_counts: dict[str, int] = {}
+        # A min-heap of the duration, path and size of the slowest files.
+        self._slowest_files: list[tuple[int, str, int]] = []
+        self._lock = Lock()
+
+    def add(self, result: ScanResult) -> None:
+        """
+        Account for a result of the scan.
+
+        :param result: A result of the scan.
+        :return: None
+        """
+
+        with self._lock:
+            self._num_results += 1
+
+            if result.is_error:
+                self._error_type_counts[result.error_type] = self._error_type_counts.get(result.error_type, 0) + 1
+
+            if (parse_statistics := result.statistics) is None:
+                return
+
+            self._num_parsed_files += 1
+            self._num_parsed_bytes += parse_statistics.num_bytes
+            self._parse_time_ns += parse_statistics.duration_ns
+
+            for stage, duration_ns in parse_statistics.stage_durations_ns.items():
+                self._stage_durations_ns[stage] = self._stage_durations_ns.get(stage, 0) + duration_ns
+
+            if self.num_slowest > 0:
+                slowest_file = (parse_statistics.duration_ns, result.path, parse_statistics.num_bytes)
+                if len(self._slowest_files) < self.num_slowest:
+                    heappush(self._slowest_files, slowest_file)
+                else:
+                    heappushpop(self._slowest_files, slowest_file)
+
+    def format_report(self) -> str:
+        """
+        Format a report of the statistics accumulated so far.
+
+        The time of processing the shell links of a file, such as rendering them, is reported as the stage `process`,
+        and the time not spent in any stage, such as the time spent opening and reading the file, as `other`. A parse
+        time per second of elapsed time near the number of workers indicates that they are kept busy.
+
+        :return: The report, ending with a newline.
+        """
+
+        with self._lock:
+            elapsed_time = max(monotonic() - self._start_time, 1e-9)
+            parse_time = self._parse_time_ns / 1e9
+
+            lines: list[str] = [
+                f'Elapsed time: {elapsed_time:.1f} s',
+                f'Results: {self._num_results} ({sum(self._error_type_counts.values())} errors)',
+                (
+                    f'Parsed files: {self._num_parsed_files} ({self._num_parsed_bytes / 1e6:.2f} MB), '
+                    f'{self._num_parsed_files / elapsed_time:.1f} files/s, '
+                    f'{self._num_parsed_bytes / 1e6 / elapsed_time:.2f} MB/s'
+                ),
+                f'Parse time: {parse_time:.2f} s ({parse_time / elapsed_time:.2f} s per second elapsed)'
+            ]
+
+            if self._parse_time_ns:
+                stage_durations_ns = dict(self._stage_durations_ns)
+                stage_durations_ns['other'] = max(self._parse_time_ns - sum(self._stage_durations_ns.values()), 0)
+
+                lines.append('Parse time split:')
+                for stage, duration_ns in sorted(stage_durations_ns.items(), key=lambda item: item[1], reverse=True):
+                    lines.append(
+                        f'  {duration_ns / self._parse_time_ns:>6.1%}  {duration_ns / 1e9:>9.3f} s  {stage}'
+                    )
+
+            if self._error_type_counts:
+                lines.append('Errors:')
+                for error_type, num_errors in sorted(
+                    self._error_type_counts.items(),
+                    key=lambda item: item[1],
+                    reverse=True
+                ):
+                    lines.append(f'  {num_errors:>8}  {error_type}')
+
+            if self._slowest_files:
+                lines.append('Slowest files:')
+                for duration_ns, path, num_bytes in sorted(self._slowest_files, reverse=True):
+                    lines.append(f'  {duration_ns / 1e6:>9.2f} ms  {num_bytes:>10} B  {path}')
+
+        return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def reporting_periodically(
+    scan_statistics: ScanStatistics,
+    interval: float,
+    write: Callable[[str], Any]
+) -> Iterator[None]:
+    """
+    Write reports of scan statistics periodically, from a background thread, for the duration of a `with` block.
+
+    The reports are written even while no results are produced, such as when parsing is stuck on a file.
+
+    :param scan_statistics: The statistics to be reported.
+    :param interval: The number of seconds between reports.
+    :param write: A function writing a report, such as the `write` method of a stream.
+    :return: None
+    """
+
+    stop_event = Event()
+
+    def report() -> None:
+        while not stop_event.wait(timeout=interval):
+            write(scan_statistics.format_report())
+
+    report_thread = Thread(target=report, name='scan-statistics-reporter', daemon=True)
+    report_thread.start()
+    try:
+        yield
+    finally:
+        stop_event.set()
+        report_thread.join()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from collections import namedtuple
+from struct import Struct
+from typing import Any, ByteString, Callable, Iterable
+
+# The named tuple types are made at runtime from the field names of each layout, which a type checker cannot follow;
+# they are made through a name typed as producing `Any`, so that the accesses of their fields are not rejected.
+_make_tuple_class: Callable[[str, list[str]], Any] = namedtuple
+
+
+class StructLayout:
+    """
+    The layout of a fixed-size, little-endian section of a structure, described field by field.
+
+    The field descriptions are compiled into a single `struct.Struct`, so that all fields of the section are decoded, or
+    encoded, in one call. The decoded fields are produced as a named tuple.
+    """
+
+    def __init__(self, name: str, fields: Iterable[tuple[str | None, str]]):
+        """
+        :param name: The name of the named tuple type produced when decoding.
+        :param fields: The name and `struct` format character(s) of each field, in order. A field whose name is `None`
+            is padding, or otherwise unused, and must have a pad byte (`x`) format.
+        """
+
+        self.fields: tuple[tuple[str | None, str], ...] = tuple(fields)
+
+        field_names: list[str] = []
+        struct_format = '<'
+
+        for field_name, field_format in self.fields:
+            if field_name is None:
+                if not field_format.endswith('x'):
+                    raise ValueError(f'The unnamed field with the format {field_format!r} is not padding.')
+            else:
+                field_names.append(field_name)
+
+            struct_format += field_format
+
+        self.struct = Struct(struct_format)
+        self.tuple_class: Any = _make_tuple_class(name, field_names)
+
+    @property
+    def size(self) -> int:
+        return self.struct.size
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return self.tuple_class._fields
+
+    def unpack_from(self, data: ByteString | memoryview, offset: int = 0) -> Any:
+        """
+        Decode the fields of the section.
+
+        :param data: A byte sequence containing the bytes constituting the section.
+        :param offset: The offset from the start of the byte sequence of the section.
+        :return: The decoded fields of the section.
+        """
+
+        return self.tuple_class._make(self.struct.unpack_from(data, offset))
+
+    def pack(self, **field_values) -> bytes:
+        """
+        Encode the fields of the section. Padding is encoded as null bytes.
+
+        :param field_values: The value of each named field.
+        :return: The bytes constituting the section.
+        """
+
+        return self.struct.pack(*self.tuple_class(**field_values))
@@ -0,0 +1,298 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import ByteString, ClassVar, Iterator
+from struct import unpack_from as struct_unpack_from
+from enum import IntEnum
+
+from lnk_parser.exceptions import IncorrectCompoundFileSignatureError, SectorChainTooLongError
+from lnk_parser.struct_layout import StructLayout
+
+
+class DirectoryEntryType(IntEnum):
+    UNKNOWN_OR_UNALLOCATED = 0x00
+    STORAGE_OBJECT = 0x01
+    STREAM_OBJECT = 0x02
+    ROOT_STORAGE_OBJECT = 0x05
+
+
+@dataclass(slots=True)
+class CompoundFileDirectoryEntry:
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='CompoundFileDirectoryEntryFields',
+        fields=(
+            ('name', '64s'),
+            ('name_size', 'H'),
+            ('object_type', 'B'),
+            ('color_flag', 'B'),
+            ('left_sibling_id', 'I'),
+            ('right_sibling_id', 'I'),
+            ('child_id', 'I'),
+            ('clsid', '16s'),
+            ('state_bits', 'I'),
+            ('creation_time', '8s'),
+            ('modified_time', '8s'),
+            ('starting_sector', 'I'),
+            ('stream_size', 'Q')
+        )
+    )
+    SIZE: ClassVar[int] = LAYOUT.size
+
+    name: str
+    object_type: DirectoryEntryType
+    starting_sector: int
+    stream_size: int
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0) -> CompoundFileDirectoryEntry:
+        """
+        Make a compound file directory entry from a sequence of bytes.
+
+        :param data: A byte sequence from which to extract the bytes constituting the directory entry.
+        :param base_offset: The offset from the start of the byte sequence from where to start extracting.
+        :return: A compound file directory entry.
+        """
+
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
+
+        name_size: int = min(fields.name_size, 64)
+
+        return cls(
+            name=fields.name[:max(name_size - 2, 0)].decode(encoding='utf-16-le'),
+            object_type=DirectoryEntryType(fields.object_type),
+            starting_sector=fields.starting_sector,
+            stream_size=fields.stream_size
+        )
+
+
+@dataclass(slots=True)
+class CompoundFile:
+    """
+    A read-only view of a compound file (OLE2 structured storage), as specified in [MS-CFB].
+
+    The compound file keeps referring to the byte sequence it was made from; streams that are stored contiguously are
+    located in it rather than copied out.
+    """
+
+    SIGNATURE: ClassVar[bytes] = bytes.fromhex('d0cf11e0a1b11ae1')
+    HEADER_SIZE: ClassVar[int] = 512
+
+    MAX_REGULAR_SECTOR: ClassVar[int] = 0xFFFFFFFA
+
+    # The header fields preceding the first 109 DIFAT entries.
+    HEADER_LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='CompoundFileHeaderFields',
+        fields=(
+            ('signature', '8s'),
+            ('clsid', '16s'),
+            ('minor_version', 'H'),
+            ('major_version', 'H'),
+            ('byte_order', 'H'),
+            ('sector_shift', 'H'),
+            ('mini_sector_shift', 'H'),
+            (None, '6x'),
+            ('num_directory_sectors', 'I'),
+            ('num_fat_sectors', 'I'),
+            ('first_directory_sector', 'I'),
+            ('transaction_signature_number', 'I'),
+            ('mini_stream_cutoff_size', 'I'),
+            ('first_mini_fat_sector', 'I'),
+            ('num_mini_fat_sectors', 'I'),
+            ('first_difat_sector', 'I'),
+            ('num_difat_sectors', 'I')
+        )
+    )
+    NUM_HEADER_DIFAT_ENTRIES: ClassVar[int] = 109
+
+    data: memoryview = field(repr=False)
+    sector_size: int
+    mini_sector_size: int
+    mini_stream_cutoff_size: int
+    fat: list[int] = field(repr=False)
+    mini_fat: list[int] = field(repr=False)
+    directory_entries: list[CompoundFileDirectoryEntry]
+    mini_stream_data: memoryview | bytes = field(default=b'', repr=False)
+    mini_stream_offset: int = field(default=0, repr=False)
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview) -> CompoundFile:
+        """
+        Make a compound file from a sequence of bytes.
+
+        :param data: The byte sequence constituting the compound file.
+        :return: A compound file.
+        """
+
+        data = memoryview(data)
+
+        if (signature := bytes(data[:len(cls.SIGNATURE)])) != cls.SIGNATURE:
+            raise IncorrectCompoundFileSignatureError(observed_signature=signature, expected_signature=cls.SIGNATURE)
+
+        header_fields = cls.HEADER_LAYOUT.unpack_from(data, 0)
+
+        sector_size = 1 << header_fields.sector_shift
+        mini_sector_size = 1 << header_fields.mini_sector_shift
+        mini_stream_cutoff_size: int = header_fields.mini_stream_cutoff_size
+
+        num_sectors = max((len(data) - cls.HEADER_SIZE) // sector_size, 0)
+        num_sector_entries = sector_size // 4
+
+        # The first 109 FAT sector locations are in the header; the remaining ones are in the DIFAT sector chain, in
+        # which the last entry of each sector is the location of the next one.
+        fat_sectors = list(
+            struct_unpack_from(f'<{cls.NUM_HEADER_DIFAT_ENTRIES}I', buffer=data, offset=cls.HEADER_LAYOUT.size)
+        )
+        difat_sector = header_fields.first_difat_sector
+        for _ in range(num_sectors):
+            if difat_sector > cls.MAX_REGULAR_SECTOR:
+                break
+            difat_entries = struct_unpack_from(
+                f'<{num_sector_entries}I',
+                buffer=data,
+                offset=(difat_sector + 1) * sector_size
+            )
+            fat_sectors.extend(difat_entries[:-1])
+            difat_sector = difat_entries[-1]
+
+        fat: list[int] = []
+        for fat_sector in fat_sectors[:header_fields.num_fat_sectors]:
+            fat.extend(
+                struct_unpack_from(f'<{num_sector_entries}I', buffer=data, offset=(fat_sector + 1) * sector_size)
+            )
+
+        compound_file = cls(
+            data=data,
+            sector_size=sector_size,
+            mini_sector_size=mini_sector_size,
+            mini_stream_cutoff_size=mini_stream_cutoff_size,
+            fat=fat,
+            mini_fat=[],
+            directory_entries=[]
+        )
+
+        for sector in compound_file._sector_chain(first_sector=header_fields.first_mini_fat_sector, table=fat):
+            compound_file.mini_fat.extend(
+                struct_unpack_from(f'<{num_sector_entries}I', buffer=data, offset=(sector + 1) * sector_size)
+            )
+
+        for sector in compound_file._sector_chain(first_sector=header_fields.first_directory_sector, table=fat):
+            sector_offset = (sector + 1) * sector_size
+            compound_file.directory_entries.extend(
+                CompoundFileDirectoryEntry.from_bytes(
+                    data=data,
+                    base_offset=sector_offset + entry_offset
+                )
+                for entry_offset in range(0, sector_size, CompoundFileDirectoryEntry.SIZE)
+            )
+
+        if compound_file.directory_entries:
+            compound_file.mini_stream_data, compound_file.mini_stream_offset = compound_file._locate_chain(
+                data=data,
+                base_offset=sector_size,
+                chain=compound_file._sector_chain(first_sector=compound_file.root_entry.starting_sector, table=fat),
+                unit_size=sector_size,
+                size=compound_file.root_entry.stream_size
+            )
+
+        return compound_file
+
+    def _sector_chain(self, first_sector: int, table: list[int]) -> list[int]:
+        chain: list[int] = []
+
+        sector = first_sector
+        while sector <= self.MAX_REGULAR_SECTOR:
+            if len(chain) >= len(table):
+                raise SectorChainTooLongError(observed_length=len(chain) + 1, maximum_length=len(table))
+            chain.append(sector)
+            sector = table[sector]
+
+        return chain
+
+    @property
+    def root_entry(self) -> CompoundFileDirectoryEntry:
+        return self.directory_entries[0]
+
+    def iter_streams(self) -> Iterator[CompoundFileDirectoryEntry]:
+        """
+        Yield the directory entries of the streams of the compound file.
+
+        :return: An iterator of stream directory entries.
+        """
+
+        return (
+            directory_entry
+            for directory_entry in self.directory_entries
+            if directory_entry.object_type is DirectoryEntryType.STREAM_OBJECT
+        )
+
+    def _locate_chain(
+        self,
+        data: memoryview | bytes,
+        base_offset: int,
+        chain: list[int],
+        unit_size: int,
+        size: int
+    ) -> tuple[memoryview | bytes, int]:
+        """
+        Locate the data of a chain of sectors, copying it out only if the sectors are not contiguous.
+
+        :param data: The byte sequence in which the sectors are located.
+        :param base_offset: The offset in the byte sequence of sector zero.
+        :param chain: The sector chain.
+        :param unit_size: The sector size.
+        :param size: The number of bytes of data in the chain.
+        :return: The byte sequence in which the data is located and its offset there.
+        """
+
+        if not chain:
+            return b'', 0
+
+        if all(next_sector == sector + 1 for sector, next_sector in zip(chain, chain[1:])):
+            return data, base_offset + chain[0] * unit_size
+
+        return b''.join(
+            data[base_offset + sector * unit_size:base_offset + (sector + 1) * unit_size]
+            for sector in chain
+        )[:size], 0
+
+    def locate_stream(self, directory_entry: CompoundFileDirectoryEntry) -> tuple[memoryview | bytes, int, int]:
+        """
+        Locate the data of a stream.
+
+        The data of a stream whose sectors are contiguous is located within the byte sequence of the compound file; the
+        data of other streams is copied out into a new byte sequence.
+
+        :param directory_entry: The directory entry of the stream.
+        :return: The byte sequence in which the stream data is located, its offset there, and its size.
+        """
+
+        size = directory_entry.stream_size
+
+        if size >= self.mini_stream_cutoff_size:
+            data, offset = self._locate_chain(
+                data=self.data,
+                base_offset=self.sector_size,
+                chain=self._sector_chain(first_sector=directory_entry.starting_sector, table=self.fat),
+                unit_size=self.sector_size,
+                size=size
+            )
+        else:
+            data, offset = self._locate_chain(
+                data=self.mini_stream_data,
+                base_offset=self.mini_stream_offset,
+                chain=self._sector_chain(first_sector=directory_entry.starting_sector, table=self.mini_fat),
+                unit_size=self.mini_sector_size,
+                size=size
+            )
+
+        return data, offset, size
+
+    def read_stream(self, directory_entry: CompoundFileDirectoryEntry) -> bytes:
+        """
+        Read the data of a stream into a new byte sequence.
+
+        :param directory_entry: The directory entry of the stream.
+        :return: The stream data.
+        """
+
+        data, offset, size = self.locate_stream(directory_entry=directory_entry)
+        return bytes(data[offset:offset + size])
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, InitVar
+from typing import ByteString, ClassVar
+from struct import unpack_from as struct_unpack_from
+from uuid import UUID
+from datetime import datetime
+
+from msdsalgs.time import filetime_to_datetime
+
+from lnk_parser.struct_layout import StructLayout
+
+
+@dataclass(slots=True)
+class DestListEntry:
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='DestListEntryFields',
+        fields=(
+            ('checksum', '8s'),
+            ('droid_volume_identifier', '16s'),
+            ('droid_file_identifier', '16s'),
+            ('birth_droid_volume_identifier', '16s'),
+            ('birth_droid_file_identifier', '16s'),
+            ('hostname', '16s'),
+            ('entry_number', 'I'),
+            (None, '4x'),
+            ('last_modification_time', '8s'),
+            ('pin_status', 'i')
+        )
+    )
+    # The fields following the common ones in DestLists of version 2 and later; the path size follows them.
+    V2_LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='DestListEntryV2Fields',
+        fields=(
+            (None, '4x'),
+            ('access_count', 'I'),
+            (None, '8x')
+        )
+    )
+
+    droid_volume_identifier: UUID
+    droid_file_identifier: UUID
+    birth_droid_volume_identifier: UUID
+    birth_droid_file_identifier: UUID
+    hostname: str
+    entry_number: int
+    last_modification_time: datetime | None
+    pin_status: int
+    access_count: int | None
+    path: str
+    entry_size: InitVar[int]
+    _entry_size: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self, entry_size: int):
+        self._entry_size = entry_size
+
+    @property
+    def size(self) -> int:
+        return self._entry_size
+
+    @property
+    def stream_name(self) -> str:
+        """The name of the stream containing the shell link of the entry in an automatic destinations jump list."""
+        return f'{self.entry_number:x}'
+
+    @property
+    def is_pinned(self) -> bool:
+        return self.pin_status != -1
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0, version: int = 1) -> DestListEntry:
+        """
+        Make a DestList entry from a sequence of bytes.
+
+        :param data: A byte sequence from which to extract the bytes constituting the DestList entry.
+        :param base_offset: The offset from the start of the byte sequence from where to start extracting.
+        :param version: The format version of the DestList, as given in its header.
+        :return: A DestList entry.
+        """
+
+        data = memoryview(data)
+
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
+        path_size_offset = base_offset + cls.LAYOUT.size
+
+        if version >= 2:
+            access_count: int | None = cls.V2_LAYOUT.unpack_from(data, path_size_offset).access_count
+            path_size_offset += cls.V2_LAYOUT.size
+            trailer_size = 4
+        else:
+            access_count = None
+            trailer_size = 0
+
+        path_size: int = struct_unpack_from('<H', buffer=data, offset=path_size_offset)[0] * 2
+        path_offset = path_size_offset + 2
+
+        return cls(
+            droid_volume_identifier=UUID(bytes_le=fields.droid_volume_identifier),
+            droid_file_identifier=UUID(bytes_le=fields.droid_file_identifier),
+            birth_droid_volume_identifier=UUID(bytes_le=fields.birth_droid_volume_identifier),
+            birth_droid_file_identifier=UUID(bytes_le=fields.birth_droid_file_identifier),
+            hostname=fields.hostname.split(b'\x00', 1)[0].decode(encoding='ascii'),
+            entry_number=fields.entry_number,
+            last_modification_time=filetime_to_datetime(filetime=fields.last_modification_time),
+            pin_status=fields.pin_status,
+            access_count=access_count,
+            path=str(data[path_offset:path_offset + path_size], encoding='utf-16-le'),
+            entry_size=path_offset + path_size + trailer_size - base_offset
+        )
+
+
+@dataclass(slots=True)
+class DestList:
+    HEADER_LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='DestListHeaderFields',
+        fields=(
+            ('version', 'I'),
+            ('num_entries', 'I'),
+            ('num_pinned_entries', 'I'),
+            (None, '4x'),
+            ('last_entry_number', 'Q'),
+            ('num_actions', 'Q')
+        )
+    )
+    HEADER_SIZE: ClassVar[int] = HEADER_LAYOUT.size
+
+    version: int
+    num_pinned_entries: int
+    last_entry_number: int
+    num_actions: int
+    entries: list[DestListEntry] = field(default_factory=list)
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0) -> DestList:
+        """
+        Make a DestList, the stream of an automatic destinations jump list describing its entries, from a sequence of
+        bytes.
+
+        :param data: A byte sequence from which to extract the bytes constituting the DestList.
+        :param base_offset: The offset from the start of the byte sequence from where to start extracting.
+        :return: A DestList.
+        """
+
+        data = memoryview(data)
+
+        header_fields = cls.HEADER_LAYOUT.unpack_from(data, base_offset)
+
+        entries: list[DestListEntry] = []
+        offset = base_offset + cls.HEADER_SIZE
+        for _ in range(header_fields.num_entries):
+            entry = DestListEntry.from_bytes(data=data, base_offset=offset, version=header_fields.version)
+            entries.append(entry)
+            offset += entry.size
+
+        return cls(
+            version=header_fields.version,
+            num_pinned_entries=header_fields.num_pinned_entries,
+            last_entry_number=header_fields.last_entry_number,
+            num_actions=header_fields.num_actions,
+            entries=entries
+        )
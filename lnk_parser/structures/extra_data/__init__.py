@@ -1,45 +1,76 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import ClassVar, Type, ByteString
+from typing import ClassVar, Type, ByteString, Final, Mapping
+from types import MappingProxyType
 from abc import ABC, abstractmethod
 from struct import unpack_from as struct_unpack_from
 
-from lnk_parser.exceptions import IncorrectExtraDataSignatureError, IncorrectExtraDataBlockSizeError
+from lnk_parser.exceptions import IncorrectExtraDataSignatureError, IncorrectExtraDataBlockSizeError, \
+    StructureTooSmallError
 from lnk_parser.utils import _format_str
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.parse_budget import ParseBudget
 
+# The block size and signature fields that begin every extra data block.
+EXTRA_DATA_HEADER_LAYOUT: Final[StructLayout] = StructLayout(
+    name='ExtraDataHeaderFields',
+    fields=(
+        ('block_size', 'I'),
+        ('signature', 'I')
+    )
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class ExtraData(ABC):
     SIGNATURE: ClassVar[int] = NotImplemented
     BLOCK_SIZE: ClassVar[int] = NotImplemented
 
-    SIGNATURE_TO_EXTRA_DATA_CLASS: ClassVar[dict[int, Type[ExtraData]]] = {}
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes the extra data structure occupies, for advancing past it.
 
-    @classmethod
-    def register_extra_data(cls, extra_data_class: Type[ExtraData]) -> Type[ExtraData]:
-        cls.SIGNATURE_TO_EXTRA_DATA_CLASS[extra_data_class.SIGNATURE] = extra_data_class
-        return extra_data_class
+        :return: The size of the extra data structure.
+        """
+
+        return self.BLOCK_SIZE
 
     @classmethod
     @abstractmethod
-    def _from_bytes(cls, data: memoryview, base_offset: int = 0, strict: bool = True) -> ExtraData:
+    def _from_bytes(
+        cls,
+        data: memoryview,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> ExtraData:
         raise NotImplementedError
 
     @classmethod
-    def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0, strict: bool = True) -> ExtraData | None:
-
-        from lnk_parser.structures.extra_data.special_folder_data_block import SpecialFolderDataBlock
-        from lnk_parser.structures.extra_data.tracker_data_block import TrackerDataBlock
-        from lnk_parser.structures.extra_data.known_folder_data_block import KnownFolderDataBlock
-        from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+    def from_bytes(
+        cls,
+        data: ByteString | memoryview,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> ExtraData | None:
 
         data = memoryview(data)
 
-        # The `TerminalBlock` has been reached.
+        # The `TerminalBlock`, which consists of the block size field alone, has been reached.
         if 0 <= struct_unpack_from('<I', buffer=data, offset=base_offset)[0] < 4:
             return None
 
-        signature: int = struct_unpack_from('<I', buffer=data, offset=base_offset+4)[0]
+        block_size, signature = EXTRA_DATA_HEADER_LAYOUT.unpack_from(data, base_offset)
+
+        # Any other block is at least as large as its block size and signature fields.
+        if block_size < EXTRA_DATA_HEADER_LAYOUT.size:
+            raise StructureTooSmallError(
+                structure_name='ExtraData',
+                observed_size=block_size,
+                minimum_size=EXTRA_DATA_HEADER_LAYOUT.size
+            )
 
         if cls != ExtraData:
             if signature != cls.SIGNATURE:
@@ -49,31 +80,46 @@ class ExtraData(ABC):
                     class_name=cls.__name__
                 )
 
-            if strict and (block_size := struct_unpack_from('<I', buffer=data, offset=base_offset)[0]) != cls.BLOCK_SIZE:
+            if strict and block_size != cls.BLOCK_SIZE:
                 raise IncorrectExtraDataBlockSizeError(
                     observed_block_size=block_size,
                     expected_block_size=cls.BLOCK_SIZE,
                     class_name=cls.__name__
                 )
 
-            return cls._from_bytes(data=data, base_offset=base_offset, strict=strict)
+            return cls._from_bytes(data=data, base_offset=base_offset, strict=strict, budget=budget)
         else:
-            return cls.SIGNATURE_TO_EXTRA_DATA_CLASS[signature]._from_bytes(
+            return SIGNATURE_TO_EXTRA_DATA_CLASS[signature]._from_bytes(
                 data=data,
                 base_offset=base_offset,
-                strict=strict
+                strict=strict,
+                budget=budget
             )
 
+    @abstractmethod
+    def to_bytes(self) -> bytes:
+        """
+        Make the sequence of bytes constituting the extra data structure.
+
+        :return: The bytes of the extra data structure.
+        """
+
+        raise NotImplementedError
+
     @abstractmethod
     def __str__(self) -> str:
         raise NotImplementedError
 
 
-@dataclass
+@dataclass(slots=True)
 class UnsupportedExtraData(ExtraData):
     signature: int
     block_size: int
 
+    @property
+    def size(self) -> int:
+        return self.block_size
+
     def __str__(self) -> str:
         return _format_str(
             string=(
@@ -85,11 +131,34 @@ class UnsupportedExtraData(ExtraData):
 
     @classmethod
     def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0, strict: bool = True) -> UnsupportedExtraData:
-        return cls(
-            signature=struct_unpack_from('<I', buffer=data, offset=base_offset+4)[0],
-            block_size=struct_unpack_from('<I', buffer=data, offset=base_offset)[0]
-        )
+        block_size, signature = EXTRA_DATA_HEADER_LAYOUT.unpack_from(data, base_offset)
+
+        return cls(signature=signature, block_size=block_size)
 
     @classmethod
-    def _from_bytes(cls, data: bytes, base_offset: int = 0, strict: bool = True) -> ExtraData:
+    def _from_bytes(
+        cls,
+        data: bytes,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> ExtraData:
         pass
+
+    def to_bytes(self) -> bytes:
+        # The data of the structure is not retained; it is encoded as null bytes.
+        return EXTRA_DATA_HEADER_LAYOUT.pack(block_size=self.block_size, signature=self.signature) + bytes(
+            max(self.block_size - EXTRA_DATA_HEADER_LAYOUT.size, 0)
+        )
+
+
+# The concrete classes are imported after `ExtraData` is defined, as they derive from it.
+from lnk_parser.structures.extra_data.special_folder_data_block import SpecialFolderDataBlock
+from lnk_parser.structures.extra_data.tracker_data_block import TrackerDataBlock
+from lnk_parser.structures.extra_data.known_folder_data_block import KnownFolderDataBlock
+from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+
+SIGNATURE_TO_EXTRA_DATA_CLASS: Final[Mapping[int, Type[ExtraData]]] = MappingProxyType({
+    extra_data_class.SIGNATURE: extra_data_class
+    for extra_data_class in (SpecialFolderDataBlock, TrackerDataBlock, KnownFolderDataBlock, PropertyStoreDataBlock)
+})
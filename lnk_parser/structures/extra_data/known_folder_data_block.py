@@ -1,26 +1,49 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar
-from struct import unpack_from as struct_unpack_from
 
 from lnk_parser.structures.extra_data import ExtraData
 from lnk_parser.utils import _format_str
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.parse_budget import ParseBudget
 
 
-@ExtraData.register_extra_data
-@dataclass
+@dataclass(slots=True)
 class KnownFolderDataBlock(ExtraData):
     BLOCK_SIZE: ClassVar[int] = 0x0000001C
     SIGNATURE: ClassVar[int] = 0xA000000B
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='KnownFolderDataBlockFields',
+        fields=(
+            ('block_size', 'I'),
+            ('signature', 'I'),
+            ('known_folder_id', '16s'),
+            ('offset', 'I')
+        )
+    )
+
     known_folder_id: bytes
     offset: int
 
     @classmethod
-    def _from_bytes(cls, data: memoryview, base_offset: int = 0, strict: bool = True) -> KnownFolderDataBlock:
-        return cls(
-            known_folder_id=bytes(data[base_offset+8:base_offset+24]),
-            offset=struct_unpack_from('<I', buffer=data, offset=base_offset+24)[0]
+    def _from_bytes(
+        cls,
+        data: memoryview,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> KnownFolderDataBlock:
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
+
+        return cls(known_folder_id=fields.known_folder_id, offset=fields.offset)
+
+    def to_bytes(self) -> bytes:
+        return self.LAYOUT.pack(
+            block_size=self.BLOCK_SIZE,
+            signature=self.SIGNATURE,
+            known_folder_id=self.known_folder_id,
+            offset=self.offset
         )
 
     def __str__(self) -> str:
@@ -1,43 +1,99 @@
 from __future__ import annotations
 from dataclasses import dataclass, field, InitVar
 from typing import ClassVar
+from uuid import UUID
 
 from lnk_parser.structures.extra_data import ExtraData
 from lnk_parser.structures.property_storage import PropertyStorage
+from lnk_parser.structures.serialized_property_value import SerializedPropertyValue
 from lnk_parser.utils import _format_str
+from lnk_parser.structures.extra_data import EXTRA_DATA_HEADER_LAYOUT
+from lnk_parser.parse_budget import ParseBudget
+from lnk_parser.exceptions import StructureOutOfBoundsError
 
 
-@ExtraData.register_extra_data
-@dataclass
+@dataclass(slots=True)
 class PropertyStoreDataBlock(ExtraData):
+    """
+    A block of property storages. The property values are decoded when looked up; see `PropertyStorage`.
+    """
+
     SIGNATURE: ClassVar[int] = 0xA0000009
 
     block_size: InitVar[int]
     property_storages: list[PropertyStorage] = field(default_factory=list)
+    _size: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self, block_size: int):
         # NOTE: It seems these cover four more bytes than what `block_size` specifies...
-        PropertyStoreDataBlock.BLOCK_SIZE = block_size + 4
+        self._size = block_size + 4
+
+    @property
+    def size(self) -> int:
+        return self._size
 
     @classmethod
-    def _from_bytes(cls, data: memoryview, base_offset: int = 0, strict: bool = True) -> PropertyStoreDataBlock:
+    def _from_bytes(
+        cls,
+        data: memoryview,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> PropertyStoreDataBlock:
 
         data = data[base_offset:]
         offset = 0
 
+        declared_block_size, _ = EXTRA_DATA_HEADER_LAYOUT.unpack_from(data, offset)
+
         # Skipping block size and signature.
         offset += 8
 
         property_storages: list[PropertyStorage] = []
-        while property_storage := PropertyStorage.from_bytes(data=data, base_offset=offset):
+        while property_storage := PropertyStorage.from_bytes(data=data, base_offset=offset, budget=budget):
             property_storages.append(property_storage)
             offset += property_storage.storage_size
 
+            if offset > declared_block_size:
+                raise StructureOutOfBoundsError(
+                    structure_name='PropertyStorage',
+                    observed_end=offset,
+                    maximum_end=declared_block_size
+                )
+
         return cls(
             block_size=offset,
             property_storages=property_storages
         )
 
+    def get_property(self, format_id: UUID, property_name: int | str) -> SerializedPropertyValue | None:
+        """
+        Look up a property, decoding only its value.
+
+        :param format_id: The format ID of the property storage of the property.
+        :param property_name: The integer ID or string name of the property.
+        :return: The first property with the format ID and name, or `None` if there is none.
+        """
+
+        for property_storage in self.property_storages:
+            if property_storage.format_id != format_id:
+                continue
+
+            if (property_entry := property_storage.get_property(property_name=property_name)) is not None:
+                return property_entry
+
+        return None
+
+    def to_bytes(self) -> bytes:
+        property_storages_bytes = b''.join(
+            property_storage.to_bytes() for property_storage in self.property_storages
+        ) + bytes(4)
+
+        return EXTRA_DATA_HEADER_LAYOUT.pack(
+            block_size=EXTRA_DATA_HEADER_LAYOUT.size + len(property_storages_bytes),
+            signature=self.SIGNATURE
+        ) + property_storages_bytes
+
     def __str__(self) -> str:
 
         property_storages_string: str = '\n'.join(str(property_storage) for property_storage in self.property_storages)
@@ -1,26 +1,49 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar
-from struct import unpack_from as struct_unpack_from
 
 from lnk_parser.structures.extra_data import ExtraData
 from lnk_parser.utils import _format_str
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.parse_budget import ParseBudget
 
 
-@ExtraData.register_extra_data
-@dataclass
+@dataclass(slots=True)
 class SpecialFolderDataBlock(ExtraData):
     BLOCK_SIZE: ClassVar[int] = 0x00000010
     SIGNATURE: ClassVar[int] = 0xA0000005
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='SpecialFolderDataBlockFields',
+        fields=(
+            ('block_size', 'I'),
+            ('signature', 'I'),
+            ('special_folder_id', 'I'),
+            ('item_id_offset', 'I')
+        )
+    )
+
     special_folder_id: int
     item_id_offset: int
 
     @classmethod
-    def _from_bytes(cls, data: memoryview, base_offset: int = 0, strict: bool = True) -> SpecialFolderDataBlock:
-        return cls(
-            special_folder_id=struct_unpack_from('<I', buffer=data, offset=base_offset+8)[0],
-            item_id_offset=struct_unpack_from('<I', buffer=data, offset=base_offset+12)[0]
+    def _from_bytes(
+        cls,
+        data: memoryview,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> SpecialFolderDataBlock:
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
+
+        return cls(special_folder_id=fields.special_folder_id, item_id_offset=fields.item_id_offset)
+
+    def to_bytes(self) -> bytes:
+        return self.LAYOUT.pack(
+            block_size=self.BLOCK_SIZE,
+            signature=self.SIGNATURE,
+            special_folder_id=self.special_folder_id,
+            item_id_offset=self.item_id_offset
         )
 
     def __str__(self) -> str:
@@ -1,16 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar
-from struct import unpack_from as struct_unpack_from
 from uuid import UUID
 
 from lnk_parser.structures.extra_data import ExtraData
 from lnk_parser.exceptions import IncorrectTrackerDataBlockLengthError, IncorrectTrackerDataBlockVersionError
 from lnk_parser.utils import _format_str
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.parse_budget import ParseBudget
 
 
-@ExtraData.register_extra_data
-@dataclass
+@dataclass(slots=True)
 class TrackerDataBlock(ExtraData):
     BLOCK_SIZE: ClassVar[int] = 0x00000060
     SIGNATURE: ClassVar[int] = 0xA0000003
@@ -18,33 +18,72 @@ class TrackerDataBlock(ExtraData):
     LENGTH: ClassVar[int] = 0x00000058
     VERSION: ClassVar[int] = 0x00000000
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='TrackerDataBlockFields',
+        fields=(
+            ('block_size', 'I'),
+            ('signature', 'I'),
+            ('length', 'I'),
+            ('version', 'I'),
+            ('machine_id', '16s'),
+            ('droid_volume_identifier', '16s'),
+            ('droid_file_identifier', '16s'),
+            ('birth_droid_volume_identifier', '16s'),
+            ('birth_droid_file_identifier', '16s')
+        )
+    )
+
     machine_id: str
     droid: tuple[UUID, UUID]
     droid_birth: tuple[UUID, UUID]
 
     @classmethod
-    def _from_bytes(cls, data: memoryview, base_offset: int = 0, strict: bool = True) -> TrackerDataBlock:
+    def _from_bytes(
+        cls,
+        data: memoryview,
+        base_offset: int = 0,
+        strict: bool = True,
+        budget: ParseBudget | None = None
+    ) -> TrackerDataBlock:
+
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
 
         if strict:
-            if (length := struct_unpack_from('<I', buffer=data, offset=base_offset+8)[0]) != cls.LENGTH:
-                raise IncorrectTrackerDataBlockLengthError(observed_length=length, expected_length=cls.LENGTH)
+            if fields.length != cls.LENGTH:
+                raise IncorrectTrackerDataBlockLengthError(observed_length=fields.length, expected_length=cls.LENGTH)
 
-            if (version := struct_unpack_from('<I', buffer=data, offset=base_offset+12)[0]) != cls.VERSION:
-                raise IncorrectTrackerDataBlockVersionError(observed_version=version, expected_version=cls.VERSION)
+            if fields.version != cls.VERSION:
+                raise IncorrectTrackerDataBlockVersionError(
+                    observed_version=fields.version,
+                    expected_version=cls.VERSION
+                )
 
         # TODO: Should `ascii` really be used here?
         return cls(
-            machine_id=bytes(data[base_offset+16:base_offset+32]).decode(encoding='ascii').replace('\x00', ''),
+            machine_id=fields.machine_id.decode(encoding='ascii').replace('\x00', ''),
             droid=(
-                UUID(bytes_le=bytes(data[base_offset+32:base_offset+48])),
-                UUID(bytes_le=bytes(data[base_offset+48:base_offset+64]))
+                UUID(bytes_le=fields.droid_volume_identifier),
+                UUID(bytes_le=fields.droid_file_identifier)
             ),
             droid_birth=(
-                UUID(bytes_le=bytes(data[base_offset+64:base_offset+80])),
-                UUID(bytes_le=bytes(data[base_offset+80:base_offset+96]))
+                UUID(bytes_le=fields.birth_droid_volume_identifier),
+                UUID(bytes_le=fields.birth_droid_file_identifier)
             )
         )
 
+    def to_bytes(self) -> bytes:
+        return self.LAYOUT.pack(
+            block_size=self.BLOCK_SIZE,
+            signature=self.SIGNATURE,
+            length=self.LENGTH,
+            version=self.VERSION,
+            machine_id=self.machine_id.encode(encoding='ascii'),
+            droid_volume_identifier=self.droid[0].bytes_le,
+            droid_file_identifier=self.droid[1].bytes_le,
+            birth_droid_volume_identifier=self.droid_birth[0].bytes_le,
+            birth_droid_file_identifier=self.droid_birth[1].bytes_le
+        )
+
     def __str__(self) -> str:
         return _format_str(
             string=(
@@ -2,7 +2,7 @@ from __future__ import annotations
 from logging import Logger, getLogger
 from dataclasses import dataclass
 from typing import ClassVar, ByteString
-from struct import unpack_from as struct_unpack_from
+from struct import unpack_from as struct_unpack_from, pack as struct_pack
 from datetime import datetime
 
 from msdsalgs.time import dos_date_to_datetime
@@ -10,17 +10,31 @@ from string_utils_py import underline
 
 from lnk_parser.structures.extension_version import ExtensionVersion
 from lnk_parser.structures.ntfs_file_reference import NTFSFileReference
-from lnk_parser.utils import _decode_null_terminated_string
+from lnk_parser.utils import _decode_null_terminated_string, _encode_null_terminated_string, \
+    datetime_to_dos_date_time_bytes
+from lnk_parser.struct_layout import StructLayout
 
 
 LOG: Logger = getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class FileEntryExtensionBlock:
 
     SIGNATURE: ClassVar[int] = 0xbeef0004
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='FileEntryExtensionBlockFields',
+        fields=(
+            ('size', 'H'),
+            ('extension_version', 'H'),
+            ('signature', 'I'),
+            ('creation_datetime', '4s'),
+            ('last_access_datetime', '4s'),
+            (None, '2x')
+        )
+    )
+
     extension_version: ExtensionVersion
     creation_datetime: datetime
     last_access_datetime: datetime
@@ -33,33 +47,29 @@ class FileEntryExtensionBlock:
     def from_bytes(
         cls,
         data: ByteString | memoryview,
-        base_offset: int = 0
+        base_offset: int = 0,
+        system_default_encoding: str | None = None
     ) -> FileEntryExtensionBlock | None:
 
         data = memoryview(data)
 
-        offset = base_offset
-
-        if (size := struct_unpack_from('<H', buffer=data, offset=offset)[0]) == 0:
+        # The size field of an absent extension block may be the last field of the data; it is checked on its own.
+        if struct_unpack_from('<H', buffer=data, offset=base_offset)[0] == 0:
             return None
-        offset += 2
 
-        extension_version = ExtensionVersion(struct_unpack_from('<H', buffer=data, offset=offset)[0])
-        offset += 2
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
 
-        if (signature := struct_unpack_from('<I', buffer=data, offset=offset)[0]) != cls.SIGNATURE:
-            LOG.warning(f'Unexpected file entry extension block signature: {hex(signature)}')
-            return None
-        offset += 4
+        extension_version = ExtensionVersion(fields.extension_version)
 
-        creation_datetime: datetime = dos_date_to_datetime(dos_date=data, offset=offset)
-        offset += 4
+        if fields.signature != cls.SIGNATURE:
+            LOG.warning(f'Unexpected file entry extension block signature: {hex(fields.signature)}')
+            return None
 
-        last_access_datetime: datetime = dos_date_to_datetime(dos_date=data, offset=offset)
-        offset += 4
+        creation_datetime: datetime = dos_date_to_datetime(dos_date=fields.creation_datetime)
+        last_access_datetime: datetime = dos_date_to_datetime(dos_date=fields.last_access_datetime)
 
-        # unknown
-        offset += 2
+        offset = base_offset + cls.LAYOUT.size
+        end = base_offset + fields.size
 
         if extension_version >= ExtensionVersion.WINDOWS_VISTA:
             # unknown
@@ -88,7 +98,12 @@ class FileEntryExtensionBlock:
             offset += 4
 
         if extension_version >= ExtensionVersion.WINDOWS_XP_2003:
-            long_name, num_long_name_bytes = _decode_null_terminated_string(data=data, is_unicode=True, offset=offset)
+            long_name, num_long_name_bytes = _decode_null_terminated_string(
+                data=data,
+                is_unicode=True,
+                offset=offset,
+                end=end
+            )
             offset += num_long_name_bytes + 1
             offset = offset + (-offset % 2)
 
@@ -99,7 +114,8 @@ class FileEntryExtensionBlock:
             localized_name, num_localized_name_bytes = _decode_null_terminated_string(
                 data=data,
                 is_unicode=True,
-                offset=offset
+                offset=offset,
+                end=end
             )
             offset += num_localized_name_bytes + 1
             offset = offset + (-offset % 2)
@@ -107,7 +123,9 @@ class FileEntryExtensionBlock:
             localized_name, num_localized_name_bytes = _decode_null_terminated_string(
                 data=data,
                 is_unicode=False,
-                offset=offset
+                offset=offset,
+                system_default_encoding=system_default_encoding,
+                end=end
             )
             offset += num_localized_name_bytes + 1
             offset = offset + (-offset % 2)
@@ -129,6 +147,56 @@ class FileEntryExtensionBlock:
             first_extension_block_version_offset=first_extension_block_version_offset
         )
 
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        """
+        Make the sequence of bytes constituting the file entry extension block.
+
+        The unknown fields are encoded as null bytes.
+
+        :param system_default_encoding: The encoding with which to encode the localized name of versions preceding
+            Windows Vista. Defaults to the current system's default encoding.
+        :return: The bytes of the file entry extension block.
+        """
+
+        extension_version = self.extension_version
+        body = b''
+
+        if extension_version >= ExtensionVersion.WINDOWS_VISTA:
+            body += bytes(2)
+            body += self.ntfs_file_reference.to_bytes() if self.ntfs_file_reference else bytes(NTFSFileReference.SIZE)
+            body += bytes(8)
+
+        if extension_version >= ExtensionVersion.WINDOWS_XP_2003:
+            # Only whether the long string size is zero is of importance when parsing.
+            body += struct_pack('<H', len(self.localized_name) + 1 if self.localized_name is not None else 0)
+
+        if extension_version >= ExtensionVersion.WINDOWS_81_10:
+            body += bytes(4)
+
+        if extension_version >= ExtensionVersion.WINDOWS_2008_7_80:
+            body += bytes(4)
+
+        if extension_version >= ExtensionVersion.WINDOWS_XP_2003:
+            body += _encode_null_terminated_string(string=self.long_name or '', is_unicode=True)
+
+            if self.localized_name is not None:
+                localized_name_bytes = _encode_null_terminated_string(
+                    string=self.localized_name,
+                    is_unicode=extension_version >= ExtensionVersion.WINDOWS_VISTA,
+                    system_default_encoding=system_default_encoding
+                )
+                body += localized_name_bytes + bytes(len(localized_name_bytes) % 2)
+
+            body += struct_pack('<H', self.first_extension_block_version_offset or 0)
+
+        return self.LAYOUT.pack(
+            size=self.LAYOUT.size + len(body),
+            extension_version=extension_version,
+            signature=self.SIGNATURE,
+            creation_datetime=datetime_to_dos_date_time_bytes(value=self.creation_datetime),
+            last_access_datetime=datetime_to_dos_date_time_bytes(value=self.last_access_datetime)
+        ) + body
+
     def __str__(self) -> str:
 
         if self.ntfs_file_reference:
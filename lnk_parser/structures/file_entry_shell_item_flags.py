@@ -1,6 +1,8 @@
 from enum import IntFlag
 from msdsalgs.utils import Mask
 
+from lnk_parser.structures.mask import bind_class_location
+
 
 class FileEntryShellItemFlags(IntFlag):
     IS_DIRECTORY = 0x1
@@ -10,4 +12,8 @@ class FileEntryShellItemFlags(IntFlag):
     HAS_CLASS_IDENTIFIER = 0x80
 
 
-FileEntryShellItemFlagsMask = Mask.make_class(int_flag_class=FileEntryShellItemFlags)
+FileEntryShellItemFlagsMask = bind_class_location(
+    cls=Mask.make_class(int_flag_class=FileEntryShellItemFlags),
+    module_name=__name__,
+    name='FileEntryShellItemFlagsMask'
+)
@@ -78,7 +78,7 @@ class ModifierKey(IntEnum):
     HOTKEYF_ALT = 0x04
 
 
-@dataclass
+@dataclass(slots=True)
 class HotKeyFlags:
     key: Key | None
     modifier_key: ModifierKey | None
@@ -89,3 +89,6 @@ class HotKeyFlags:
             key=Key(data[0]) if data[0] else None,
             modifier_key=ModifierKey(data[1]) if data[1] else None
         )
+
+    def to_bytes(self) -> bytes:
+        return bytes((self.key or 0, self.modifier_key or 0))
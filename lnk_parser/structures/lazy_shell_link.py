@@ -0,0 +1,188 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import ByteString, Final
+from struct import unpack_from as struct_unpack_from
+
+from lnk_parser.structures.shell_link import ShellLink, _extra_data_list_from_bytes
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.structures.link_target_id_list import LinkTargetIDList
+from lnk_parser.structures.link_info import LinkInfo
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.extra_data import ExtraData
+from lnk_parser.utils import _decode_string_data_field, resolve_encoding
+from lnk_parser.parse_budget import ParseLimits, ParseBudget, DEFAULT_PARSE_LIMITS
+
+# The string data fields, in the order in which they appear, and the link flag indicating the presence of each.
+STRING_DATA_FIELDS: Final[tuple[tuple[str, LinkFlags], ...]] = (
+    ('name_string', LinkFlags.HasName),
+    ('relative_path', LinkFlags.HasRelativePath),
+    ('working_dir', LinkFlags.HasWorkingDir),
+    ('command_line_arguments', LinkFlags.HasArguments),
+    ('icon_location', LinkFlags.HasIconLocation)
+)
+
+
+@dataclass
+class LazyShellLink:
+    """
+    A shell link whose sections are decoded when first accessed.
+
+    Making a lazy shell link only locates the sections, using the link flags and the size fields; each section is
+    decoded on the first access of its attribute, after which the result is cached. The byte sequence must stay
+    available, unchanged, for as long as the lazy shell link is used.
+
+    The limits on the parsing are those of `ShellLink.from_bytes`: no section is read beyond the byte limit, and the
+    link target ID list and extra data blocks decoded on access are counted against a single budget.
+    """
+
+    data: memoryview = field(repr=False)
+    base_offset: int
+    system_default_encoding: str
+    link_flags_value: int
+    link_target_id_list_offset: int | None
+    link_info_offset: int | None
+    string_data_offsets: dict[str, int]
+    extra_data_offset: int
+    budget: ParseBudget = field(repr=False)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: ByteString | memoryview,
+        base_offset: int = 0,
+        system_default_encoding: str | None = None,
+        limits: ParseLimits = DEFAULT_PARSE_LIMITS
+    ) -> LazyShellLink:
+        """
+        Make a lazy shell link from a sequence of bytes.
+
+        :param data: A byte sequence from which to extract the bytes constituting the shell link.
+        :param base_offset: The offset from the start of the byte sequence from where to start extracting.
+        :param system_default_encoding: The default encoding on the system on which the data was generated.
+        :param limits: Limits on the parsing, bounding the work that a crafted shell link can cause.
+        :return: A lazy shell link.
+        """
+
+        data = memoryview(data)[:base_offset + limits.max_bytes]
+
+        link_flags_value: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 0x0014)[0]
+        offset = base_offset + ShellLinkHeader.SIZE
+
+        if link_flags_value & LinkFlags.HasLinkTargetIDList:
+            link_target_id_list_offset = offset
+            offset += struct_unpack_from('<H', buffer=data, offset=offset)[0] + len(LinkTargetIDList.TERMINAL_ID)
+        else:
+            link_target_id_list_offset = None
+
+        if link_flags_value & LinkFlags.HasLinkInfo:
+            link_info_offset = offset
+            offset += struct_unpack_from('<I', buffer=data, offset=offset)[0]
+        else:
+            link_info_offset = None
+
+        character_size = 2 if link_flags_value & LinkFlags.IsUnicode else 1
+
+        string_data_offsets: dict[str, int] = {}
+        for field_name, link_flag in STRING_DATA_FIELDS:
+            if not link_flags_value & link_flag:
+                continue
+
+            string_data_offsets[field_name] = offset
+            offset += 2 + struct_unpack_from('<H', buffer=data, offset=offset)[0] * character_size
+
+        return cls(
+            data=data,
+            base_offset=base_offset,
+            system_default_encoding=resolve_encoding(system_default_encoding),
+            link_flags_value=link_flags_value,
+            link_target_id_list_offset=link_target_id_list_offset,
+            link_info_offset=link_info_offset,
+            string_data_offsets=string_data_offsets,
+            extra_data_offset=offset,
+            budget=ParseBudget(max_items=limits.max_items)
+        )
+
+    def _string_data(self, field_name: str) -> str | None:
+        if (offset := self.string_data_offsets.get(field_name)) is None:
+            return None
+
+        return _decode_string_data_field(
+            buffer=self.data,
+            is_unicode=bool(self.link_flags_value & LinkFlags.IsUnicode),
+            offset=offset,
+            system_default_encoding=self.system_default_encoding
+        )[0]
+
+    @cached_property
+    def header(self) -> ShellLinkHeader:
+        return ShellLinkHeader.from_bytes(data=self.data, base_offset=self.base_offset)
+
+    @cached_property
+    def link_target_id_list(self) -> LinkTargetIDList | None:
+        if self.link_target_id_list_offset is None:
+            return None
+
+        return LinkTargetIDList.from_bytes(
+            data=self.data,
+            base_offset=self.link_target_id_list_offset,
+            system_default_encoding=self.system_default_encoding,
+            budget=self.budget
+        )
+
+    @cached_property
+    def link_info(self) -> LinkInfo | None:
+        if self.link_info_offset is None:
+            return None
+
+        return LinkInfo.from_bytes(
+            data=self.data,
+            base_offset=self.link_info_offset,
+            system_default_encoding=self.system_default_encoding
+        )
+
+    @cached_property
+    def name_string(self) -> str | None:
+        return self._string_data(field_name='name_string')
+
+    @cached_property
+    def relative_path(self) -> str | None:
+        return self._string_data(field_name='relative_path')
+
+    @cached_property
+    def working_dir(self) -> str | None:
+        return self._string_data(field_name='working_dir')
+
+    @cached_property
+    def command_line_arguments(self) -> str | None:
+        return self._string_data(field_name='command_line_arguments')
+
+    @cached_property
+    def icon_location(self) -> str | None:
+        return self._string_data(field_name='icon_location')
+
+    @cached_property
+    def extra_data_list(self) -> list[ExtraData]:
+        return _extra_data_list_from_bytes(data=self.data, base_offset=self.extra_data_offset, budget=self.budget)
+
+    def to_shell_link(self) -> ShellLink:
+        """
+        Make a shell link with all sections decoded.
+
+        :return: A shell link.
+        """
+
+        return ShellLink(
+            header=self.header,
+            link_target_id_list=self.link_target_id_list,
+            link_info=self.link_info,
+            name_string=self.name_string,
+            relative_path=self.relative_path,
+            working_dir=self.working_dir,
+            command_line_arguments=self.command_line_arguments,
+            icon_location=self.icon_location,
+            extra_data_list=self.extra_data_list
+        )
+
+    def __str__(self) -> str:
+        return str(self.to_shell_link())
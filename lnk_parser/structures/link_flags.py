@@ -1,6 +1,8 @@
 from enum import IntFlag
 from msdsalgs.utils import Mask
 
+from lnk_parser.structures.mask import bind_class_location
+
 
 class LinkFlags(IntFlag):
     HasLinkTargetIDList = 0b00000000000000000000000000000001
@@ -32,4 +34,8 @@ class LinkFlags(IntFlag):
     KeepLocalIDListForUNCTarget = 0b00000100000000000000000000000000
 
 
-LinkFlagsMask = Mask.make_class(int_flag_class=LinkFlags)
+LinkFlagsMask = bind_class_location(
+    cls=Mask.make_class(int_flag_class=LinkFlags),
+    module_name=__name__,
+    name='LinkFlagsMask'
+)
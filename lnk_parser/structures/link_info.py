@@ -1,21 +1,44 @@
 from __future__ import annotations
-from dataclasses import dataclass, InitVar
-from typing import ByteString
-from struct import unpack_from as struct_unpack_from
+from dataclasses import dataclass, field, InitVar
+from typing import ByteString, ClassVar
 
 from lnk_parser.structures.volume_id import VolumeID
-from lnk_parser.structures.link_info_flags import LinkInfoFlagsMask
-from lnk_parser.utils import _decode_null_terminated_string
+from lnk_parser.structures.link_info_flags import LinkInfoFlags, LinkInfoFlagsMask
+from lnk_parser.utils import _decode_null_terminated_string, _encode_null_terminated_string
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.exceptions import StructureTooSmallError, StructureOutOfBoundsError
 
 
-@dataclass
+@dataclass(slots=True)
 class LinkInfo:
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='LinkInfoFields',
+        fields=(
+            ('link_info_size', 'I'),
+            ('link_info_header_size', 'I'),
+            ('link_info_flags', 'I'),
+            ('volume_id_offset', 'I'),
+            ('local_base_path_offset', 'I'),
+            ('common_network_relative_link_offset', 'I'),
+            ('common_path_suffix_offset', 'I')
+        )
+    )
+    # The optional fields that follow when the link info header size is at least 0x24.
+    UNICODE_OFFSETS_LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='LinkInfoUnicodeOffsetFields',
+        fields=(
+            ('local_base_path_offset_unicode', 'I'),
+            ('common_path_suffix_offset_unicode', 'I')
+        )
+    )
+
     link_info_size: InitVar[int]
     link_info_flags: LinkInfoFlagsMask
     volume_id: VolumeID | None = None
     local_base_path: str | None = None
     common_network_relative_link: str | None = None
     common_path_suffix: str | None = None
+    _link_info_size: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self, link_info_size: int):
         self._link_info_size = link_info_size
@@ -42,55 +65,137 @@ class LinkInfo:
 
         data = memoryview(data)
 
-        link_info_size: int = struct_unpack_from('<I', buffer=data, offset=base_offset)[0]
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
 
-        link_info_header_size: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 4)[0]
-
-        link_info_flags = LinkInfoFlagsMask.from_int(
-            value=struct_unpack_from('<I', buffer=data, offset=base_offset + 8)[0]
-        )
+        # The size determines where the structure following the link info starts; it must cover the fixed fields.
+        if fields.link_info_size < cls.LAYOUT.size:
+            raise StructureTooSmallError(
+                structure_name='LinkInfo',
+                observed_size=fields.link_info_size,
+                minimum_size=cls.LAYOUT.size
+            )
 
-        volume_id_offset: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 12)[0]
+        if base_offset + fields.link_info_size > len(data):
+            raise StructureOutOfBoundsError(
+                structure_name='LinkInfo',
+                observed_end=base_offset + fields.link_info_size,
+                maximum_end=len(data)
+            )
 
-        local_base_path_offset: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 16)[0]
+        link_info_flags = LinkInfoFlagsMask.from_int(value=fields.link_info_flags)
 
-        # TODO: Implement structure.
-        common_network_relative_link_offset: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 20)[0]
+        # TODO: Implement the common network relative link structure.
 
-        common_path_suffix_offset: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 24)[0]
+        if fields.link_info_header_size >= 0x00000024:
+            unicode_offset_fields = cls.UNICODE_OFFSETS_LAYOUT.unpack_from(data, base_offset + cls.LAYOUT.size)
 
-        if link_info_header_size >= 0x00000024:
-            local_base_path_offset: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 28)[0]
+            local_base_path_offset: int = unicode_offset_fields.local_base_path_offset_unicode
             local_base_path_is_unicode = True
 
-            common_path_suffix_offset: int = struct_unpack_from('<I', buffer=data, offset=base_offset + 32)[0]
+            common_path_suffix_offset: int = unicode_offset_fields.common_path_suffix_offset_unicode
             common_path_is_unicode = True
         else:
+            local_base_path_offset = fields.local_base_path_offset
             local_base_path_is_unicode = False
+
+            common_path_suffix_offset = fields.common_path_suffix_offset
             common_path_is_unicode = False
 
         return cls(
-            link_info_size=link_info_size,
+            link_info_size=fields.link_info_size,
             link_info_flags=link_info_flags,
             volume_id=VolumeID.from_bytes(
                 data=data,
-                base_offset=base_offset + volume_id_offset,
+                base_offset=base_offset + fields.volume_id_offset,
                 system_default_encoding=system_default_encoding
             ) if link_info_flags.volume_id_and_local_base_path else None,
             local_base_path=_decode_null_terminated_string(
                 data=data,
                 is_unicode=local_base_path_is_unicode,
                 offset=base_offset + local_base_path_offset,
-                system_default_encoding=system_default_encoding
+                system_default_encoding=system_default_encoding,
+                end=base_offset + fields.link_info_size
             )[0] if link_info_flags.volume_id_and_local_base_path else None,
             common_path_suffix=_decode_null_terminated_string(
                 data=data,
                 is_unicode=common_path_is_unicode,
                 offset=base_offset + common_path_suffix_offset,
-                system_default_encoding=system_default_encoding
+                system_default_encoding=system_default_encoding,
+                end=base_offset + fields.link_info_size
             )[0] if local_base_path_offset != 0 else None,
         )
 
+    def to_bytes(self, system_default_encoding: str | None = None, is_unicode: bool = False) -> bytes:
+        """
+        Make the sequence of bytes constituting the link info structure.
+
+        The common network relative link structure is not supported, and is never included.
+
+        :param system_default_encoding: The encoding with which to encode the strings when not Unicode-encoded. Defaults
+            to the current system's default encoding.
+        :param is_unicode: Whether to include Unicode-encoded versions of the local base path and common path suffix,
+            which take precedence over the system-encoded versions when parsing.
+        :return: The bytes of the link info structure.
+        """
+
+        has_volume_id_and_local_base_path = self.link_info_flags.volume_id_and_local_base_path
+        header_size = self.LAYOUT.size + (self.UNICODE_OFFSETS_LAYOUT.size if is_unicode else 0)
+
+        body = b''
+
+        def append(section: bytes) -> int:
+            nonlocal body
+            section_offset = header_size + len(body)
+            body += section
+            return section_offset
+
+        if has_volume_id_and_local_base_path:
+            volume_id_offset = append(
+                self.volume_id.to_bytes(system_default_encoding=system_default_encoding, is_unicode=is_unicode)
+            )
+            local_base_path_offset = append(
+                _encode_null_terminated_string(
+                    string=self.local_base_path or '',
+                    is_unicode=False,
+                    system_default_encoding=system_default_encoding
+                ) if not is_unicode else b'\x00'
+            )
+        else:
+            volume_id_offset = 0
+            local_base_path_offset = 0
+
+        common_path_suffix_offset = append(
+            _encode_null_terminated_string(
+                string=self.common_path_suffix or '',
+                is_unicode=False,
+                system_default_encoding=system_default_encoding
+            ) if not is_unicode else b'\x00'
+        )
+
+        if is_unicode:
+            local_base_path_offset_unicode = append(
+                _encode_null_terminated_string(string=self.local_base_path or '', is_unicode=True)
+            ) if has_volume_id_and_local_base_path else 0
+            common_path_suffix_offset_unicode = append(
+                _encode_null_terminated_string(string=self.common_path_suffix or '', is_unicode=True)
+            )
+            unicode_offsets_bytes = self.UNICODE_OFFSETS_LAYOUT.pack(
+                local_base_path_offset_unicode=local_base_path_offset_unicode,
+                common_path_suffix_offset_unicode=common_path_suffix_offset_unicode
+            )
+        else:
+            unicode_offsets_bytes = b''
+
+        return self.LAYOUT.pack(
+            link_info_size=header_size + len(body),
+            link_info_header_size=header_size,
+            link_info_flags=self.link_info_flags.to_int() & ~LinkInfoFlags.CommonNetworkRelativeLinkAndPathSuffix,
+            volume_id_offset=volume_id_offset,
+            local_base_path_offset=local_base_path_offset,
+            common_network_relative_link_offset=0,
+            common_path_suffix_offset=common_path_suffix_offset
+        ) + unicode_offsets_bytes + body
+
     def __str__(self) -> str:
         return (
             f'Flags: {self.link_info_flags}\n'
@@ -1,10 +1,16 @@
 from enum import IntFlag
 from msdsalgs.utils import Mask
 
+from lnk_parser.structures.mask import bind_class_location
+
 
 class LinkInfoFlags(IntFlag):
     VolumeIDAndLocalBasePath = 0b00000000000000000000000000000001
     CommonNetworkRelativeLinkAndPathSuffix = 0b00000000000000000000000000000010
 
 
-LinkInfoFlagsMask = Mask.make_class(int_flag_class=LinkInfoFlags)
+LinkInfoFlagsMask = bind_class_location(
+    cls=Mask.make_class(int_flag_class=LinkInfoFlags),
+    module_name=__name__,
+    name='LinkInfoFlagsMask'
+)
@@ -1,15 +1,33 @@
 from __future__ import annotations
-from struct import unpack_from as struct_unpack_from, calcsize as struct_calcsize
+from struct import unpack_from as struct_unpack_from, calcsize as struct_calcsize, pack as struct_pack
 from typing import ByteString
 from pathlib import PureWindowsPath
+from time import perf_counter_ns
 
 from lnk_parser.structures.shell_item import ShellItem
 from lnk_parser.structures.shell_item.volume import VolumeShellItem
 from lnk_parser.structures.shell_item.file_entry import FileEntryShellItem
-from lnk_parser.exceptions import MissingTerminalIDError
+from lnk_parser.exceptions import MissingTerminalIDError, StructureTooSmallError, StructureOutOfBoundsError
+from lnk_parser.parse_budget import ParseBudget
+from lnk_parser.instrumentation import get_collector, OUTCOME_OK, OUTCOME_UNSUPPORTED, OUTCOME_ERROR
+
+
+def _shell_item_stage(shell_item_data: memoryview) -> str:
+    """
+    Name the instrumentation stage of a shell item by its class type indicator.
+
+    :param shell_item_data: The bytes constituting the shell item.
+    :return: The name of the stage.
+    """
+
+    if len(shell_item_data) < 3:
+        return 'shell_item.unknown'
+
+    return f'shell_item.0x{shell_item_data[2]:02x}'
 
 
 class LinkTargetIDList(list):
+    __slots__ = ()
 
     TERMINAL_ID = b'\x00\x00'
 
@@ -18,14 +36,18 @@ class LinkTargetIDList(list):
         cls,
         data: ByteString | memoryview,
         base_offset: int = 0,
-        system_default_encoding: str | None = None
+        system_default_encoding: str | None = None,
+        budget: ParseBudget | None = None
     ) -> LinkTargetIDList:
         """
         Make a link target id list from a sequence of bytes.
 
+        Each item ID must advance through, and lie within, the list.
+
         :param data: A byte sequence from which to extract the bytes constituting the link target id list.
         :param base_offset: The offset from the start of the byte sequence from where to start extracting.
         :param system_default_encoding: The default encoding on the system on which the data was generated.
+        :param budget: The budget of the parse against which the shell items are counted.
         :return: A link target id list.
         """
 
@@ -34,18 +56,35 @@ class LinkTargetIDList(list):
         id_list_size_format: str = '<H'
         id_list_size: int = struct_unpack_from(id_list_size_format, buffer=data, offset=base_offset)[0]
 
-        shell_item_data_list: list[bytes] = []
+        shell_item_data_list: list[memoryview] = []
 
         offset = base_offset + struct_calcsize(id_list_size_format)
-        read_data = 0
-        while (read_data + len(cls.TERMINAL_ID)) < id_list_size:
+        item_ids_end = offset + id_list_size - len(cls.TERMINAL_ID)
+        while offset < item_ids_end:
             item_id_size: int = struct_unpack_from('<H', buffer=data, offset=offset)[0]
 
+            # An item ID is at least as large as its size field, so that each advances through the list.
+            if item_id_size < struct_calcsize(id_list_size_format):
+                raise StructureTooSmallError(
+                    structure_name='ItemID',
+                    observed_size=item_id_size,
+                    minimum_size=struct_calcsize(id_list_size_format)
+                )
+
+            if offset + item_id_size > item_ids_end:
+                raise StructureOutOfBoundsError(
+                    structure_name='ItemID',
+                    observed_end=offset + item_id_size,
+                    maximum_end=item_ids_end
+                )
+
+            if budget is not None:
+                budget.spend_item()
+
             # Add the item id size and actual data to a list.
-            shell_item_data_list.append(bytes(data[offset:offset+item_id_size]))
+            shell_item_data_list.append(data[offset:offset+item_id_size])
 
             offset += item_id_size
-            read_data += item_id_size
 
         if (observed_terminal_id := data[offset:offset+len(cls.TERMINAL_ID)]) != cls.TERMINAL_ID:
             raise MissingTerminalIDError(
@@ -53,9 +92,15 @@ class LinkTargetIDList(list):
                 expected_terminal_id=cls.TERMINAL_ID
             )
 
+        collector = get_collector()
+        stage_start_ns = 0
+
         # TODO: Support more `ShellItem` types?
         shell_items: list[ShellItem | bytes] = []
         for shell_item_data in shell_item_data_list:
+            if collector is not None:
+                stage_start_ns = perf_counter_ns()
+
             try:
                 shell_items.append(
                     ShellItem.from_bytes(
@@ -65,10 +110,44 @@ class LinkTargetIDList(list):
                     )
                 )
             except KeyError:
-                shell_items.append(shell_item_data)
+                shell_items.append(bytes(shell_item_data))
+            except Exception:
+                if collector is not None:
+                    collector.observe(
+                        stage=_shell_item_stage(shell_item_data=shell_item_data),
+                        start_ns=stage_start_ns,
+                        num_bytes=0,
+                        outcome=OUTCOME_ERROR
+                    )
+                raise
+
+            if collector is not None:
+                collector.observe(
+                    stage=_shell_item_stage(shell_item_data=shell_item_data),
+                    start_ns=stage_start_ns,
+                    num_bytes=len(shell_item_data),
+                    outcome=OUTCOME_UNSUPPORTED if isinstance(shell_items[-1], bytes) else OUTCOME_OK
+                )
 
         return cls(shell_items)
 
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        """
+        Make the sequence of bytes constituting the link target id list.
+
+        :param system_default_encoding: The encoding with which to encode strings that are not Unicode-encoded. Defaults
+            to the current system's default encoding.
+        :return: The bytes of the link target id list.
+        """
+
+        shell_items_bytes = b''.join(
+            shell_item.to_bytes(system_default_encoding=system_default_encoding)
+            if isinstance(shell_item, ShellItem) else bytes(shell_item)
+            for shell_item in self
+        )
+
+        return struct_pack('<H', len(shell_items_bytes) + len(self.TERMINAL_ID)) + shell_items_bytes + self.TERMINAL_ID
+
     @property
     def path(self) -> PureWindowsPath | None:
         path_segments: list[str] = []
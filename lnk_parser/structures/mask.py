@@ -0,0 +1,23 @@
+from typing import TypeVar
+
+T = TypeVar('T', bound=type)
+
+
+def bind_class_location(cls: T, module_name: str, name: str) -> T:
+    """
+    Record the module and name at which a dynamically made class is bound, so that its instances can be pickled.
+
+    The mask classes made by `Mask.make_class` report the module and name of the factory rather than those at which
+    they are bound, so that pickling a structure containing a mask, such as when sending a shell link from a worker
+    process, fails to look up the class.
+
+    :param cls: The class.
+    :param module_name: The name of the module in which the class is bound.
+    :param name: The name to which the class is bound in the module.
+    :return: The class.
+    """
+
+    cls.__module__ = module_name
+    cls.__name__ = cls.__qualname__ = name
+
+    return cls
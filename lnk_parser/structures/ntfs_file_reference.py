@@ -1,25 +1,36 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ByteString, ClassVar
-from struct import unpack_from
 
+from lnk_parser.struct_layout import StructLayout
 
-@dataclass
+
+@dataclass(slots=True)
 class NTFSFileReference:
     SIZE: ClassVar[int] = 8
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='NTFSFileReferenceFields',
+        fields=(
+            ('mft_entry_index', '6s'),
+            ('sequence_number', 'H')
+        )
+    )
+
     mft_entry_index: bytes
     sequence_number: int
 
     @classmethod
     def from_bytes(cls, data: ByteString | memoryview, offset: int = 0) -> NTFSFileReference | None:
-        if data[offset:offset+8] == bytes(8):
+        fields = cls.LAYOUT.unpack_from(data, offset)
+
+        if not fields.sequence_number and fields.mft_entry_index == bytes(6):
             return None
 
-        return cls(
-            mft_entry_index=bytes(data[offset:offset+6]),
-            sequence_number=unpack_from('<H', buffer=data, offset=offset + 6)[0]
-        )
+        return cls(mft_entry_index=fields.mft_entry_index, sequence_number=fields.sequence_number)
+
+    def to_bytes(self) -> bytes:
+        return self.LAYOUT.pack(mft_entry_index=self.mft_entry_index, sequence_number=self.sequence_number)
 
     def __len__(self) -> int:
         return self.SIZE
@@ -1,71 +1,250 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import ByteString
+from typing import ByteString, Iterable
+from typing import ClassVar
 from uuid import UUID
 from struct import unpack_from
 
 from lnk_parser.structures.serialized_property_value import SerializedPropertyValue, STRING_NAME_GUID
 from lnk_parser.structures.serialized_property_value.serialized_property_value_integer_name import \
     SerializedPropertyValueIntegerName
-from lnk_parser.utils import _format_str
+from lnk_parser.structures.serialized_property_value.serialized_property_value_string_name import \
+    SerializedPropertyValueStringName
+from lnk_parser.utils import _decode_null_terminated_string, _format_str
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.exceptions import StructureTooSmallError, StructureOutOfBoundsError
+from lnk_parser.parse_budget import ParseBudget
 
 
-@dataclass
+def _get_property_name(property_entry: SerializedPropertyValue) -> int | str:
+    if isinstance(property_entry, SerializedPropertyValueStringName):
+        return property_entry.name
+
+    return property_entry.property_id
+
+
+@dataclass(slots=True, eq=False)
 class PropertyStorage:
+    """
+    A property storage, holding serialized property values that share a format ID.
+
+    When a property storage is parsed, its bytes are copied and only the name (an integer ID or, in storages with the
+    format ID `STRING_NAME_GUID`, a string) and byte range of each property are recorded. A property value is decoded
+    when it is looked up with `get_property`; all of them are decoded when `properties` is first accessed.
+    """
+
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='PropertyStorageFields',
+        fields=(
+            ('storage_size', 'I'),
+            ('version', '4s'),
+            ('format_id', '16s')
+        )
+    )
+    # Attributes that are not fields, decoded on first access, that are rendered like public fields.
+    LAZY_FIELDS: ClassVar[tuple[str, ...]] = ('properties',)
+
     storage_size: int
     version: bytes
     format_id: UUID
-    properties: list[SerializedPropertyValue] = field(default_factory=list)
+    _data: bytes = field(default=b'', repr=False)
+    _property_ranges: list[tuple[int, int]] = field(default_factory=list, repr=False)
+    _property_name_to_range: dict[int | str, tuple[int, int]] = field(default_factory=dict, repr=False)
+    _properties: list[SerializedPropertyValue] | None = field(default=None, repr=False)
 
     @classmethod
-    def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0) -> PropertyStorage | None:
+    def from_bytes(
+        cls,
+        data: ByteString | memoryview,
+        base_offset: int = 0,
+        budget: ParseBudget | None = None
+    ) -> PropertyStorage | None:
         """
         Construct a `PropertyStorage` instance from a byte string.
 
+        The property storage must lie within the byte string, and each of its property values within it.
+
         :param data: A byte string from which to construct a `PropertyStorage` instance.
         :param base_offset: The offset in the byte string from where to start reading the bytes constituting the
             `PropertyStorage` instance
+        :param budget: The budget of the parse against which the property storage and its property values are counted.
         :return: A `PropertyStorage` instance or `None` if `Storage Size` indicates termination.
         """
 
         data = memoryview(data)[base_offset:]
-        offset = 0
-
-        storage_size: int = unpack_from('<I', buffer=data, offset=offset)[0]
-        offset += 4
 
-        if storage_size == 0:
+        # The terminating storage size field may be the last field of the data; it is checked on its own.
+        if unpack_from('<I', buffer=data, offset=0)[0] == 0:
             return None
 
-        version = bytes(data[offset:offset+4])
-        offset += 4
+        if budget is not None:
+            budget.spend_item()
 
-        format_id = UUID(bytes_le=bytes(data[offset:offset+16]))
-        offset += 16
+        fields = cls.LAYOUT.unpack_from(data, 0)
+        format_id = UUID(bytes_le=fields.format_id)
 
-        property_entries: list[SerializedPropertyValue] = []
-        while True:
-            if format_id == STRING_NAME_GUID:
-                raise NotImplementedError
-            else:
-                property_entry = SerializedPropertyValueIntegerName.from_bytes(
-                    data=data,
-                    base_offset=offset
+        if fields.storage_size < cls.LAYOUT.size:
+            raise StructureTooSmallError(
+                structure_name='PropertyStorage',
+                observed_size=fields.storage_size,
+                minimum_size=cls.LAYOUT.size
+            )
+
+        if fields.storage_size > len(data):
+            raise StructureOutOfBoundsError(
+                structure_name='PropertyStorage',
+                observed_end=base_offset + fields.storage_size,
+                maximum_end=base_offset + len(data)
+            )
+
+        # The bytes are copied, so that the property storage does not keep the data, which may be a memory map, in use.
+        storage_data = bytes(data[:fields.storage_size])
+        is_string_name = format_id == STRING_NAME_GUID
+        # A property value is at least as large as its fixed fields, so that each advances through the storage.
+        min_value_size = SerializedPropertyValueStringName.LAYOUT.size if is_string_name \
+            else SerializedPropertyValueIntegerName.LAYOUT.size
+
+        property_ranges: list[tuple[int, int]] = []
+        property_name_to_range: dict[int | str, tuple[int, int]] = {}
+
+        offset = cls.LAYOUT.size
+        while value_size := unpack_from('<I', buffer=storage_data, offset=offset)[0]:
+            if value_size < min_value_size:
+                raise StructureTooSmallError(
+                    structure_name='SerializedPropertyValue',
+                    observed_size=value_size,
+                    minimum_size=min_value_size
+                )
+
+            if offset + value_size > fields.storage_size:
+                raise StructureOutOfBoundsError(
+                    structure_name='SerializedPropertyValue',
+                    observed_end=base_offset + offset + value_size,
+                    maximum_end=base_offset + fields.storage_size
                 )
 
-            if property_entry is None:
-                offset += 4
-                break
+            if budget is not None:
+                budget.spend_item()
+
+            if is_string_name:
+                name_size: int = unpack_from('<I', buffer=storage_data, offset=offset + 4)[0]
+                name_offset = offset + SerializedPropertyValueStringName.LAYOUT.size
+                property_name, _ = _decode_null_terminated_string(
+                    data=storage_data,
+                    is_unicode=True,
+                    offset=name_offset,
+                    end=name_offset + name_size
+                )
             else:
-                offset += len(property_entry)
+                property_name = unpack_from('<I', buffer=storage_data, offset=offset + 4)[0]
+
+            property_range = (offset, offset + value_size)
+            property_ranges.append(property_range)
+            # Should a name occur more than once, the first property with the name is the one looked up.
+            property_name_to_range.setdefault(property_name, property_range)
 
-            property_entries.append(property_entry)
+            offset += value_size
 
         return cls(
-            storage_size=storage_size,
-            version=version,
+            storage_size=fields.storage_size,
+            version=fields.version,
             format_id=format_id,
-            properties=property_entries
+            _data=storage_data,
+            _property_ranges=property_ranges,
+            _property_name_to_range=property_name_to_range
+        )
+
+    @classmethod
+    def from_properties(
+        cls,
+        version: bytes,
+        format_id: UUID,
+        properties: Iterable[SerializedPropertyValue],
+        storage_size: int = 0
+    ) -> PropertyStorage:
+        """
+        Make a property storage from property values.
+
+        :param version: The version of the property storage.
+        :param format_id: The format ID of the property storage.
+        :param properties: The property values of the property storage.
+        :param storage_size: The size of the property storage. Not used when serializing.
+        :return: A property storage.
+        """
+
+        return cls(storage_size=storage_size, version=version, format_id=format_id, _properties=list(properties))
+
+    def _decode_property(self, property_range: tuple[int, int]) -> SerializedPropertyValue:
+        start, end = property_range
+        property_class = SerializedPropertyValueStringName if self.format_id == STRING_NAME_GUID \
+            else SerializedPropertyValueIntegerName
+
+        return property_class.from_bytes(data=memoryview(self._data)[start:end])
+
+    @property
+    def properties(self) -> list[SerializedPropertyValue]:
+        if self._properties is None:
+            self._properties = [self._decode_property(property_range) for property_range in self._property_ranges]
+
+        return self._properties
+
+    def property_names(self) -> list[int | str]:
+        """
+        Return the names of the properties, without decoding their values.
+
+        :return: The integer IDs or string names of the properties, without repetitions, in order of appearance.
+        """
+
+        if self._properties is None:
+            return list(self._property_name_to_range)
+
+        return list(dict.fromkeys(_get_property_name(property_entry) for property_entry in self._properties))
+
+    def get_property(self, property_name: int | str) -> SerializedPropertyValue | None:
+        """
+        Look up a property, decoding only its value.
+
+        :param property_name: The integer ID or string name of the property.
+        :return: The first property with the name, or `None` if there is none.
+        """
+
+        if self._properties is not None:
+            return next(
+                (
+                    property_entry for property_entry in self._properties
+                    if _get_property_name(property_entry) == property_name
+                ),
+                None
+            )
+
+        if (property_range := self._property_name_to_range.get(property_name)) is None:
+            return None
+
+        return self._decode_property(property_range)
+
+    def to_bytes(self) -> bytes:
+        """
+        Make the sequence of bytes constituting the property storage.
+
+        The storage size is computed from the properties rather than taken from `storage_size`.
+
+        :return: The bytes of the property storage.
+        """
+
+        properties_bytes = b''.join(property_entry.to_bytes() for property_entry in self.properties) + bytes(4)
+
+        return self.LAYOUT.pack(
+            storage_size=self.LAYOUT.size + len(properties_bytes),
+            version=self.version,
+            format_id=self.format_id.bytes_le
+        ) + properties_bytes
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PropertyStorage):
+            return NotImplemented
+
+        return (self.storage_size, self.version, self.format_id, self.properties) == (
+            other.storage_size, other.version, other.format_id, other.properties
         )
 
     def __str__(self) -> str:
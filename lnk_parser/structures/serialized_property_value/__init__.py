@@ -1,15 +1,78 @@
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 from typing import Final
+from struct import pack
 from uuid import UUID
+from datetime import datetime
+
+from msdsalgs.time import filetime_to_datetime
+
+from lnk_parser.utils import _decode_null_terminated_string, _encode_null_terminated_string, \
+    datetime_to_filetime_bytes
 
 STRING_NAME_GUID: Final[UUID] = UUID('D5CDD505-2E9C-101B-9397-08002B2CF9AE')
 
 
-@dataclass
+def _decode_typed_value(value_type: int, value_bytes: memoryview) -> bytes | str | UUID | datetime | None:
+    """
+    Decode the value of a typed property value.
+
+    :param value_type: The type of the value.
+    :param value_bytes: The bytes of the value, following its type and padding fields.
+    :return: The decoded value; the bytes of the value themselves if its type is not supported.
+    """
+
+    # TODO: Put the value types in an `IntEnum`.
+
+    # TODO: More types are listed at
+    #  https://docs.microsoft.com/en-us/openspecs/windows_protocols/ms-oleps/f122b9d7-e5cf-4484-8466-83f6fd94b3cc
+    #  Observed: 0x40 (FILETIME), 0x15 (8-byte unsigned integer)
+
+    # LPWSTR
+    if value_type == 0x001F:
+        return _decode_null_terminated_string(data=value_bytes, is_unicode=True, offset=4)[0]
+    # FILETIME
+    elif value_type == 0x0040:
+        return filetime_to_datetime(filetime=value_bytes)
+    # GUID
+    elif value_type == 0x0048:
+        return UUID(bytes_le=bytes(value_bytes))
+    else:
+        return bytes(value_bytes)
+
+
+def _encode_typed_value(value_type: int, value: bytes | str | UUID | datetime | None) -> bytes:
+    """
+    Encode the value of a typed property value.
+
+    :param value_type: The type of the value.
+    :param value: The value, as produced by `_decode_typed_value`.
+    :return: The bytes of the value, to follow its type and padding fields.
+    """
+
+    # LPWSTR
+    if value_type == 0x001F:
+        string_bytes = _encode_null_terminated_string(string=value, is_unicode=True)
+        value_bytes = pack('<I', len(string_bytes) // 2) + string_bytes
+        return value_bytes + bytes(-len(value_bytes) % 4)
+    # FILETIME
+    elif value_type == 0x0040:
+        return datetime_to_filetime_bytes(value=value)
+    # GUID
+    elif value_type == 0x0048:
+        return value.bytes_le
+    else:
+        return bytes(value)
+
+
+@dataclass(slots=True)
 class SerializedPropertyValue(ABC):
     value_size: int
 
+    @abstractmethod
+    def to_bytes(self) -> bytes:
+        raise NotImplementedError
+
     @abstractmethod
     def __len__(self) -> int:
         raise NotImplementedError
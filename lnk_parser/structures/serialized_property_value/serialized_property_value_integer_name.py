@@ -1,65 +1,68 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import ByteString
+from typing import ByteString, ClassVar
 from struct import unpack_from
 from uuid import UUID
+from datetime import datetime
 
-from msdsalgs.time import filetime_to_datetime
+from lnk_parser.utils import _format_str
+from lnk_parser.structures.serialized_property_value import SerializedPropertyValue, _decode_typed_value, \
+    _encode_typed_value
+from lnk_parser.struct_layout import StructLayout
 
-from lnk_parser.utils import _decode_null_terminated_string, _format_str
-from lnk_parser.structures.serialized_property_value import SerializedPropertyValue
 
-
-@dataclass
+@dataclass(slots=True)
 class SerializedPropertyValueIntegerName(SerializedPropertyValue):
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='SerializedPropertyValueIntegerNameFields',
+        fields=(
+            ('value_size', 'I'),
+            ('property_id', 'I'),
+            (None, 'x'),
+            ('value_type', 'H'),
+            (None, '2x')
+        )
+    )
+
     property_id: int
     value_type: int
-    value: bytes | str | int | UUID
+    value: bytes | str | int | UUID | datetime | None
 
     @classmethod
     def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0) -> SerializedPropertyValue | None:
         data = memoryview(data)[base_offset:]
         offset = 0
 
-        value_size = unpack_from('<I', buffer=data, offset=offset)[0]
-        offset += 4
-
-        if value_size == 0:
+        # The terminating value size field may be followed by nothing but the end of the data; it is checked on its own.
+        if unpack_from('<I', buffer=data, offset=offset)[0] == 0:
             return None
 
-        property_id: int = unpack_from('<I', buffer=data, offset=offset)[0]
-        offset += 4
+        value_size, property_id, value_type = cls.LAYOUT.unpack_from(data, offset)
+        offset += cls.LAYOUT.size
 
-        # One byte offset
-        offset += 1
-
-        value_type = unpack_from('<H', buffer=data, offset=offset)[0]
-        offset += 2
-
-        # Two bytes padding
-        offset += 2
+        return cls(
+            value_size=value_size,
+            property_id=property_id,
+            value_type=value_type,
+            value=_decode_typed_value(value_type=value_type, value_bytes=data[offset:value_size])
+        )
 
-        value_bytes = bytes(data[offset:offset+value_size-13])
+    def to_bytes(self) -> bytes:
+        """
+        Make the sequence of bytes constituting the serialized property value.
 
-        # TODO: Put the value types in an `IntEnum`. Refactor this.
+        The value size is computed from the value rather than taken from `value_size`.
 
-        # TODO: More types are listed at
-        #  https://docs.microsoft.com/en-us/openspecs/windows_protocols/ms-oleps/f122b9d7-e5cf-4484-8466-83f6fd94b3cc
-        #  Observed: 0x40 (FILETIME), 0x15 (8-byte unsigned integer)
+        :return: The bytes of the serialized property value.
+        """
 
-        # LPWSTR
-        if value_type == 0x001F:
-            value, _ = _decode_null_terminated_string(data=value_bytes, is_unicode=True, offset=4)
-        # FILETIME
-        elif value_type == 0x0040:
-            value = filetime_to_datetime(filetime=value_bytes)
-        # GUID
-        elif value_type == 0x0048:
-            value = UUID(bytes_le=value_bytes)
-        else:
-            value = value_bytes
+        value_bytes = _encode_typed_value(value_type=self.value_type, value=self.value)
 
-        return cls(value_size=value_size, property_id=property_id, value_type=value_type, value=value)
+        return self.LAYOUT.pack(
+            value_size=self.LAYOUT.size + len(value_bytes),
+            property_id=self.property_id,
+            value_type=self.value_type
+        ) + value_bytes
 
     def __len__(self) -> int:
         return self.value_size
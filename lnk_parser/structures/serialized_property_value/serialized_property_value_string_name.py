@@ -0,0 +1,98 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import ByteString, ClassVar
+from struct import unpack_from
+from uuid import UUID
+from datetime import datetime
+
+from lnk_parser.utils import _decode_null_terminated_string, _encode_null_terminated_string, _format_str
+from lnk_parser.structures.serialized_property_value import SerializedPropertyValue, _decode_typed_value, \
+    _encode_typed_value
+from lnk_parser.struct_layout import StructLayout
+
+
+@dataclass(slots=True)
+class SerializedPropertyValueStringName(SerializedPropertyValue):
+    """
+    A serialized property value named by a string, as found in property storages with the format ID
+    `STRING_NAME_GUID`.
+    """
+
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='SerializedPropertyValueStringNameFields',
+        fields=(
+            ('value_size', 'I'),
+            ('name_size', 'I'),
+            (None, 'x')
+        )
+    )
+    # The fields of the typed property value, which follow the name.
+    VALUE_TYPE_LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='TypedPropertyValueFields',
+        fields=(
+            ('value_type', 'H'),
+            (None, '2x')
+        )
+    )
+
+    name: str
+    value_type: int
+    value: bytes | str | int | UUID | datetime | None
+
+    @classmethod
+    def from_bytes(cls, data: ByteString | memoryview, base_offset: int = 0) -> SerializedPropertyValue | None:
+        data = memoryview(data)[base_offset:]
+        offset = 0
+
+        # The terminating value size field may be followed by nothing but the end of the data; it is checked on its own.
+        if unpack_from('<I', buffer=data, offset=offset)[0] == 0:
+            return None
+
+        value_size, name_size = cls.LAYOUT.unpack_from(data, offset)
+        offset += cls.LAYOUT.size
+
+        # The name size includes the null terminator.
+        name, _ = _decode_null_terminated_string(data=data, is_unicode=True, offset=offset, end=offset + name_size)
+        offset += name_size
+
+        value_type, = cls.VALUE_TYPE_LAYOUT.unpack_from(data, offset)
+        offset += cls.VALUE_TYPE_LAYOUT.size
+
+        return cls(
+            value_size=value_size,
+            name=name,
+            value_type=value_type,
+            value=_decode_typed_value(value_type=value_type, value_bytes=data[offset:value_size])
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Make the sequence of bytes constituting the serialized property value.
+
+        The value size is computed from the name and the value rather than taken from `value_size`.
+
+        :return: The bytes of the serialized property value.
+        """
+
+        name_bytes = _encode_null_terminated_string(string=self.name, is_unicode=True)
+        value_bytes = self.VALUE_TYPE_LAYOUT.pack(value_type=self.value_type) + _encode_typed_value(
+            value_type=self.value_type,
+            value=self.value
+        )
+
+        return self.LAYOUT.pack(
+            value_size=self.LAYOUT.size + len(name_bytes) + len(value_bytes),
+            name_size=len(name_bytes)
+        ) + name_bytes + value_bytes
+
+    def __len__(self) -> int:
+        return self.value_size
+
+    def __str__(self) -> str:
+        return _format_str(
+            string=(
+                f'Value name: {self.name}\n'
+                f'Value type: 0x{self.value_type:02x}\n'
+                f'Value: {self.value}\n'
+            )
+        )
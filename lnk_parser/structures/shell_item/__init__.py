@@ -1,24 +1,26 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import ClassVar, Type, FrozenSet
-from struct import unpack_from as struct_unpack_from
+from typing import ClassVar, Type, FrozenSet, Final, Mapping
+from types import MappingProxyType
 
 from lnk_parser.exceptions import ClassTypeIndicatorMismatchError
+from lnk_parser.struct_layout import StructLayout
 
+# The size and class type indicator fields that begin every shell item.
+SHELL_ITEM_HEADER_LAYOUT: Final[StructLayout] = StructLayout(
+    name='ShellItemHeaderFields',
+    fields=(
+        ('size', 'H'),
+        ('class_type_indicator', 'B')
+    )
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class ShellItem(ABC):
     CLASS_TYPE_INDICATOR: ClassVar[FrozenSet[int]] = NotImplemented
 
-    CLASS_TYPE_INDICATOR_TO_SHELL_ITEM_CLASS: ClassVar[dict[int, Type[ShellItem]]] = {}
-
-    @classmethod
-    def register_shell_item(cls, shell_item_class: Type[ShellItem]) -> Type[ShellItem]:
-        for class_type_indicator in shell_item_class.CLASS_TYPE_INDICATOR:
-            cls.CLASS_TYPE_INDICATOR_TO_SHELL_ITEM_CLASS[class_type_indicator] = shell_item_class
-        return shell_item_class
-
     # TODO: Add `strict` parameter.
     @classmethod
     @abstractmethod
@@ -49,16 +51,10 @@ class ShellItem(ABC):
         :return: A shell item.
         """
 
-        from lnk_parser.structures.shell_item.file_entry import FileEntryShellItem
-        from lnk_parser.structures.shell_item.root_folder import RootFolderShellItem
-        from lnk_parser.structures.shell_item.volume import VolumeShellItem
-
-        size: int = struct_unpack_from('<H', buffer=data, offset=base_offset)[0]
+        size, class_type_indicator = SHELL_ITEM_HEADER_LAYOUT.unpack_from(data, base_offset)
         if size == 0:
             raise ValueError
 
-        class_type_indicator: int = data[base_offset + 2]
-
         if cls != ShellItem:
             if class_type_indicator not in cls.CLASS_TYPE_INDICATOR:
                 raise ClassTypeIndicatorMismatchError(
@@ -71,7 +67,32 @@ class ShellItem(ABC):
                 system_default_encoding=system_default_encoding
             )
         else:
-            return cls.CLASS_TYPE_INDICATOR_TO_SHELL_ITEM_CLASS[class_type_indicator]._from_bytes(
+            return CLASS_TYPE_INDICATOR_TO_SHELL_ITEM_CLASS[class_type_indicator]._from_bytes(
                 data=data,
-                base_offset=base_offset
+                base_offset=base_offset,
+                system_default_encoding=system_default_encoding
             )
+
+    @abstractmethod
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        """
+        Make the sequence of bytes constituting the shell item.
+
+        :param system_default_encoding: The encoding with which to encode strings that are not Unicode-encoded. Defaults
+            to the current system's default encoding.
+        :return: The bytes of the shell item.
+        """
+
+        raise NotImplementedError
+
+
+# The concrete classes are imported after `ShellItem` is defined, as they derive from it.
+from lnk_parser.structures.shell_item.file_entry import FileEntryShellItem
+from lnk_parser.structures.shell_item.root_folder import RootFolderShellItem
+from lnk_parser.structures.shell_item.volume import VolumeShellItem
+
+CLASS_TYPE_INDICATOR_TO_SHELL_ITEM_CLASS: Final[Mapping[int, Type[ShellItem]]] = MappingProxyType({
+    class_type_indicator: shell_item_class
+    for shell_item_class in (FileEntryShellItem, RootFolderShellItem, VolumeShellItem)
+    for class_type_indicator in shell_item_class.CLASS_TYPE_INDICATOR
+})
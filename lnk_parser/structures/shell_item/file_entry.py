@@ -1,7 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar, FrozenSet, ByteString
-from struct import unpack_from as struct_unpack_from
 from datetime import datetime, timedelta
 
 from msdsalgs.fscc.file_attributes import FileAttributes
@@ -11,14 +10,33 @@ from string_utils_py import underline
 from lnk_parser.structures.shell_item import ShellItem
 from lnk_parser.structures.file_entry_shell_item_flags import FileEntryShellItemFlagsMask
 from lnk_parser.structures.file_entry_extension_block import FileEntryExtensionBlock
-from lnk_parser.utils import _decode_null_terminated_string, _format_str
+from lnk_parser.utils import _decode_null_terminated_string, _encode_null_terminated_string, _format_str, \
+    datetime_to_dos_date, timedelta_to_dos_time
+from lnk_parser.structures.mask import bind_class_location
+from lnk_parser.struct_layout import StructLayout
 
 
-@ShellItem.register_shell_item
-@dataclass
+# The mask class of the file attributes is made by `Mask.make_class`; see `bind_class_location`.
+bind_class_location(cls=FileAttributes, module_name='msdsalgs.fscc.file_attributes', name='FileAttributes')
+
+
+@dataclass(slots=True)
 class FileEntryShellItem(ShellItem):
     CLASS_TYPE_INDICATOR: ClassVar[FrozenSet[int]] = frozenset(range(0x30, 0x3f + 1))
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='FileEntryShellItemFields',
+        fields=(
+            ('size', 'H'),
+            ('class_type_indicator', 'B'),
+            (None, 'x'),
+            ('file_size', 'I'),
+            ('last_modified_date', 'H'),
+            ('last_modified_time', 'H'),
+            ('file_attributes', 'H')
+        )
+    )
+
     flags: FileEntryShellItemFlagsMask
     file_size: int | None
     last_modified_date: datetime | None
@@ -45,51 +63,62 @@ class FileEntryShellItem(ShellItem):
 
         data = memoryview(data)
 
-        offset = base_offset
-
-        size: int = struct_unpack_from('<H', buffer=data, offset=offset)[0]
-        offset += 2
-
-        flags = FileEntryShellItemFlagsMask.from_int(value=data[base_offset + 2] & 0x7)
-        offset += 2
-
-        file_size: int | None = struct_unpack_from('<I', buffer=data, offset=offset)[0] or None
-        offset += 4
-
-        last_modified_date: datetime = dos_date_to_datetime(dos_date=struct_unpack_from('<H', buffer=data, offset=8)[0])
-        offset += 2
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
 
-        last_modified_time: timedelta = dos_time_to_timedelta(
-            dos_time=struct_unpack_from('<H', buffer=data, offset=10)[0]
-        )
-        offset += 2
+        flags = FileEntryShellItemFlagsMask.from_int(value=fields.class_type_indicator & 0x7)
 
-        file_attributes = FileAttributes.from_int(
-            value=struct_unpack_from('<H', buffer=data, offset=base_offset + 12)[0]
-        )
-        offset += 2
+        offset = base_offset + cls.LAYOUT.size
 
         primary_name, primary_name_byte_len = _decode_null_terminated_string(
             data=data,
             is_unicode=flags.has_unicode_strings,
-            offset=offset
+            offset=offset,
+            system_default_encoding=system_default_encoding,
+            end=base_offset + fields.size
         )
 
         offset += primary_name_byte_len + 1
-        offset = offset + (-offset % 2)
+        offset += (offset - base_offset) % 2
 
-        extension_block_bytes = data[offset:size]
+        extension_block_bytes = data[offset:base_offset + fields.size]
 
         return cls(
             flags=flags,
-            file_size=file_size,
-            last_modified_date=last_modified_date,
-            last_modified_time=last_modified_time,
-            file_attributes=file_attributes,
+            file_size=fields.file_size or None,
+            last_modified_date=dos_date_to_datetime(dos_date=fields.last_modified_date),
+            last_modified_time=dos_time_to_timedelta(dos_time=fields.last_modified_time),
+            file_attributes=FileAttributes.from_int(value=fields.file_attributes),
             primary_name=primary_name,
-            extension_block=FileEntryExtensionBlock.from_bytes(data=extension_block_bytes) or extension_block_bytes
+            extension_block=(
+                FileEntryExtensionBlock.from_bytes(
+                    data=extension_block_bytes,
+                    system_default_encoding=system_default_encoding
+                ) or bytes(extension_block_bytes)
+            )
+        )
+
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        primary_name_bytes = _encode_null_terminated_string(
+            string=self.primary_name,
+            is_unicode=self.flags.has_unicode_strings,
+            system_default_encoding=system_default_encoding
+        )
+        primary_name_bytes += bytes((self.LAYOUT.size + len(primary_name_bytes)) % 2)
+
+        extension_block_bytes = (
+            self.extension_block.to_bytes(system_default_encoding=system_default_encoding)
+            if isinstance(self.extension_block, FileEntryExtensionBlock) else self.extension_block
         )
 
+        return self.LAYOUT.pack(
+            size=self.LAYOUT.size + len(primary_name_bytes) + len(extension_block_bytes),
+            class_type_indicator=min(self.CLASS_TYPE_INDICATOR) | self.flags.to_int(),
+            file_size=self.file_size or 0,
+            last_modified_date=datetime_to_dos_date(value=self.last_modified_date),
+            last_modified_time=timedelta_to_dos_time(value=self.last_modified_time),
+            file_attributes=self.file_attributes.to_int()
+        ) + primary_name_bytes + extension_block_bytes
+
     @property
     def last_modified_datetime(self) -> datetime | None:
         return (self.last_modified_date + self.last_modified_time) if self.last_modified_date else None
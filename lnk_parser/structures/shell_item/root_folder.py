@@ -2,17 +2,26 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar, FrozenSet, ByteString
 from uuid import UUID
-from struct import unpack_from as struct_unpack_from
 
 from lnk_parser.structures.shell_item import ShellItem
 from lnk_parser.utils import _format_str
+from lnk_parser.struct_layout import StructLayout
 
 
-@ShellItem.register_shell_item
-@dataclass
+@dataclass(slots=True)
 class RootFolderShellItem(ShellItem):
     CLASS_TYPE_INDICATOR: ClassVar[FrozenSet[int]] = frozenset((0x1f,))
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='RootFolderShellItemFields',
+        fields=(
+            ('size', 'H'),
+            ('class_type_indicator', 'B'),
+            ('sort_index', 'B'),
+            ('shell_folder_identifier', '16s')
+        )
+    )
+
     sort_index: int
     # TODO: Support mapping to entities (My Computer e.g.)?
     shell_folder_identifier: UUID
@@ -28,14 +37,22 @@ class RootFolderShellItem(ShellItem):
         :return: A root folder shell item.
         """
 
-        size: int = struct_unpack_from('<H', buffer=data, offset=base_offset)[0]
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
 
         return cls(
-            sort_index=data[base_offset + 3],
-            shell_folder_identifier=UUID(bytes_le=data[base_offset + 4:base_offset + 20]),
-            extension_block=data[base_offset + 20:base_offset + size]
+            sort_index=fields.sort_index,
+            shell_folder_identifier=UUID(bytes_le=fields.shell_folder_identifier),
+            extension_block=bytes(data[base_offset + cls.LAYOUT.size:base_offset + fields.size])
         )
 
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        return self.LAYOUT.pack(
+            size=self.LAYOUT.size + len(self.extension_block),
+            class_type_indicator=next(iter(self.CLASS_TYPE_INDICATOR)),
+            sort_index=self.sort_index,
+            shell_folder_identifier=self.shell_folder_identifier.bytes_le
+        ) + self.extension_block
+
     def __str__(self):
         return _format_str(
             string=(
@@ -1,15 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar, FrozenSet, ByteString
-from struct import unpack_from as struct_unpack_from
 
-from lnk_parser.structures.shell_item import ShellItem
+from lnk_parser.structures.shell_item import ShellItem, SHELL_ITEM_HEADER_LAYOUT
 from lnk_parser.structures.volume_shell_item_flags import VolumeShellItemFlagsMask
-from lnk_parser.utils import _format_str, get_system_default_encoding
+from lnk_parser.utils import _format_str, resolve_encoding
 
 
-@ShellItem.register_shell_item
-@dataclass
+@dataclass(slots=True)
 class VolumeShellItem(ShellItem):
     CLASS_TYPE_INDICATOR: ClassVar[FrozenSet[int]] = frozenset(range(0x20, 0x2f + 1))
 
@@ -36,19 +34,26 @@ class VolumeShellItem(ShellItem):
 
         data = memoryview(data)
 
-        size: int = struct_unpack_from('<H', buffer=data, offset=base_offset)[0]
+        size, class_type_indicator = SHELL_ITEM_HEADER_LAYOUT.unpack_from(data, base_offset)
 
-        flags = VolumeShellItemFlagsMask.from_int(value=data[base_offset + 2] & 0x7)
-        other = bytes(data[base_offset + 3:size])
+        flags = VolumeShellItemFlagsMask.from_int(value=class_type_indicator & 0x7)
+        other = bytes(data[base_offset + SHELL_ITEM_HEADER_LAYOUT.size:base_offset + size])
 
         return cls(
             flags=flags,
             name=other.decode(
-                encoding=system_default_encoding or get_system_default_encoding()
+                encoding=resolve_encoding(system_default_encoding)
             ).replace('\x00', '') if flags.has_name else None,
             other=other
         )
 
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        # The name is not encoded on its own; it is decoded from `other`.
+        return SHELL_ITEM_HEADER_LAYOUT.pack(
+            size=SHELL_ITEM_HEADER_LAYOUT.size + len(self.other),
+            class_type_indicator=min(self.CLASS_TYPE_INDICATOR) | self.flags.to_int()
+        ) + self.other
+
     def __str__(self) -> str:
         return _format_str(
             string=(
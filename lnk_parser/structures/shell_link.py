@@ -2,21 +2,109 @@ from __future__ import annotations
 from logging import getLogger
 from dataclasses import dataclass, field
 from typing import ByteString
-from struct import unpack_from as struct_unpack_from
+from struct import unpack_from as struct_unpack_from, error as struct_error
 from re import sub as re_sub
+from os import PathLike
+from mmap import mmap, ACCESS_READ
+from traceback import clear_frames
+from uuid import UUID
+from time import perf_counter_ns
 
 from string_utils_py import underline, text_align_delimiter
 
 from lnk_parser.structures.shell_link_header import ShellLinkHeader
 from lnk_parser.structures.link_target_id_list import LinkTargetIDList
 from lnk_parser.structures.link_info import LinkInfo
-from lnk_parser.utils import _decode_string_data_field
-from lnk_parser.structures.extra_data import ExtraData, UnsupportedExtraData
+from lnk_parser.utils import _decode_string_data_field, _encode_string_data_field, resolve_encoding
+from lnk_parser.structures.extra_data import ExtraData, UnsupportedExtraData, EXTRA_DATA_HEADER_LAYOUT, \
+    SIGNATURE_TO_EXTRA_DATA_CLASS
+from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+from lnk_parser.structures.serialized_property_value import SerializedPropertyValue
+from lnk_parser.instrumentation import get_collector, OUTCOME_OK, OUTCOME_UNSUPPORTED, OUTCOME_ERROR
+from lnk_parser.parse_budget import ParseLimits, ParseBudget, DEFAULT_PARSE_LIMITS
 
 LOG = getLogger(__name__)
 
 
-@dataclass
+def _extra_data_stage(data: memoryview, offset: int) -> str:
+    """
+    Name the instrumentation stage of an extra data block by its signature, or as unsupported.
+
+    :param data: A byte sequence containing the extra data block.
+    :param offset: The offset from the start of the byte sequence of the extra data block.
+    :return: The name of the stage.
+    """
+
+    try:
+        _, signature = EXTRA_DATA_HEADER_LAYOUT.unpack_from(data, offset)
+    except struct_error:
+        return 'extra_data.unsupported'
+
+    return f'extra_data.0x{signature:08x}' if signature in SIGNATURE_TO_EXTRA_DATA_CLASS else 'extra_data.unsupported'
+
+
+def _extra_data_list_from_bytes(
+    data: memoryview,
+    base_offset: int = 0,
+    budget: ParseBudget | None = None
+) -> list[ExtraData]:
+    """
+    Make the list of extra data structures that ends a shell link from a sequence of bytes.
+
+    :param data: A byte sequence from which to extract the bytes constituting the extra data structures.
+    :param base_offset: The offset from the start of the byte sequence of the first extra data structure.
+    :param budget: The budget of the parse against which the extra data structures are counted.
+    :return: The extra data structures, not including the terminal block.
+    """
+
+    offset = base_offset
+    extra_data_list: list[ExtraData] = []
+
+    collector = get_collector()
+    stage_start_ns = 0
+
+    while True:
+        if collector is not None:
+            stage_start_ns = perf_counter_ns()
+
+        try:
+            extra_data = ExtraData.from_bytes(data=data, base_offset=offset, budget=budget)
+        except KeyError:
+            extra_data = UnsupportedExtraData.from_bytes(data=data, base_offset=offset)
+            LOG.warning(
+                f'No supported `ExtraData` structure for signature `0x{extra_data.signature:02x}`.'
+            )
+        except Exception:
+            if collector is not None:
+                collector.observe(
+                    stage=_extra_data_stage(data=data, offset=offset),
+                    start_ns=stage_start_ns,
+                    num_bytes=0,
+                    outcome=OUTCOME_ERROR
+                )
+            raise
+
+        if extra_data is None:
+            break
+
+        if budget is not None:
+            budget.spend_item()
+
+        if collector is not None:
+            collector.observe(
+                stage=_extra_data_stage(data=data, offset=offset),
+                start_ns=stage_start_ns,
+                num_bytes=extra_data.size,
+                outcome=OUTCOME_UNSUPPORTED if isinstance(extra_data, UnsupportedExtraData) else OUTCOME_OK
+            )
+
+        offset += extra_data.size
+        extra_data_list.append(extra_data)
+
+    return extra_data_list
+
+
+@dataclass(slots=True)
 class ShellLink:
     header: ShellLinkHeader
     link_target_id_list: LinkTargetIDList | None = None
@@ -34,7 +122,8 @@ class ShellLink:
         cls,
         data: ByteString | memoryview,
         base_offset: int = 0,
-        system_default_encoding: str | None = None
+        system_default_encoding: str | None = None,
+        limits: ParseLimits = DEFAULT_PARSE_LIMITS
     ) -> ShellLink:
         """
         Make a shell link from a sequence of bytes.
@@ -42,85 +131,224 @@ class ShellLink:
         :param data: A byte sequence from which to extract the bytes constituting the shell link.
         :param base_offset: The offset from the start of the byte sequence from where to start extracting.
         :param system_default_encoding: The default encoding on the system on which the data was generated.
+        :param limits: Limits on the parsing, bounding the work that a crafted shell link can cause.
         :return: A shell link.
         """
 
-        data = memoryview(data)
+        # Nothing beyond the byte limit is read, even where the data continues, such as when carving.
+        data = memoryview(data)[:base_offset + limits.max_bytes]
+        budget = ParseBudget(max_items=limits.max_items)
 
-        header = ShellLinkHeader.from_bytes(data=data, base_offset=base_offset)
-        offset = base_offset + len(header)
+        # Resolved once here rather than by each of the structures that contain strings.
+        system_default_encoding = resolve_encoding(system_default_encoding)
 
-        if header.link_flags.has_link_target_id_list:
-            link_target_id_list = LinkTargetIDList.from_bytes(
-                data=data,
-                base_offset=offset,
-                system_default_encoding=system_default_encoding
-            )
-            offset += struct_unpack_from('<H', buffer=data, offset=offset)[0] + len(LinkTargetIDList.TERMINAL_ID)
-        else:
-            link_target_id_list = None
-
-        if header.link_flags.has_link_info:
-            link_info = LinkInfo.from_bytes(
-                data=data,
-                base_offset=offset,
-                system_default_encoding=system_default_encoding
-            )
-            offset += link_info.size
-        else:
-            link_info = None
+        collector = get_collector()
+        # The stage being parsed, to which an error is attributed; `None` while parsing the link target ID list and the
+        # extra data blocks, which observe their own stages.
+        stage: str | None = 'header'
+        stage_start_ns = perf_counter_ns() if collector is not None else 0
 
-        string_data_kwargs: dict[str, str] = {}
-        pairs = [
-            (header.link_flags.has_name, 'name_string'),
-            (header.link_flags.has_relative_path, 'relative_path'),
-            (header.link_flags.has_working_dir, 'working_dir'),
-            (header.link_flags.has_arguments, 'command_line_arguments'),
-            (header.link_flags.has_icon_location, 'icon_location')
-        ]
+        try:
+            header = ShellLinkHeader.from_bytes(data=data, base_offset=base_offset)
+            offset = base_offset + len(header)
 
-        for string_data_present, field_name in pairs:
-            if not string_data_present:
-                continue
+            if collector is not None:
+                collector.observe(stage=stage, start_ns=stage_start_ns, num_bytes=len(header))
 
-            string_value, size = _decode_string_data_field(
-                buffer=data,
-                is_unicode=header.link_flags.is_unicode,
-                offset=offset,
-                system_default_encoding=system_default_encoding
-            )
-            offset += size
+            if header.link_flags.has_link_target_id_list:
+                stage = None
+                link_target_id_list = LinkTargetIDList.from_bytes(
+                    data=data,
+                    base_offset=offset,
+                    system_default_encoding=system_default_encoding,
+                    budget=budget
+                )
+                offset += struct_unpack_from('<H', buffer=data, offset=offset)[0] + len(LinkTargetIDList.TERMINAL_ID)
+            else:
+                link_target_id_list = None
 
-            string_data_kwargs[field_name] = string_value
+            if header.link_flags.has_link_info:
+                stage = 'link_info'
+                if collector is not None:
+                    stage_start_ns = perf_counter_ns()
 
-        extra_data_list: list[ExtraData] = []
+                link_info = LinkInfo.from_bytes(
+                    data=data,
+                    base_offset=offset,
+                    system_default_encoding=system_default_encoding
+                )
+                offset += link_info.size
 
-        while True:
-            try:
-                extra_data = ExtraData.from_bytes(data=data, base_offset=offset)
-                block_size = extra_data.BLOCK_SIZE if extra_data is not None else None
-            except KeyError:
-                extra_data = UnsupportedExtraData.from_bytes(data=data, base_offset=offset)
-                LOG.warning(
-                    f'No supported `ExtraData` structure for signature `0x{extra_data.signature:02x}`.'
+                if collector is not None:
+                    collector.observe(stage=stage, start_ns=stage_start_ns, num_bytes=link_info.size)
+            else:
+                link_info = None
+
+            string_data_kwargs: dict[str, str] = {}
+            pairs = [
+                (header.link_flags.has_name, 'name_string', 'string_data.name_string'),
+                (header.link_flags.has_relative_path, 'relative_path', 'string_data.relative_path'),
+                (header.link_flags.has_working_dir, 'working_dir', 'string_data.working_dir'),
+                (header.link_flags.has_arguments, 'command_line_arguments', 'string_data.command_line_arguments'),
+                (header.link_flags.has_icon_location, 'icon_location', 'string_data.icon_location')
+            ]
+
+            for string_data_present, field_name, stage in pairs:
+                if not string_data_present:
+                    continue
+
+                if collector is not None:
+                    stage_start_ns = perf_counter_ns()
+
+                string_value, size = _decode_string_data_field(
+                    buffer=data,
+                    is_unicode=header.link_flags.is_unicode,
+                    offset=offset,
+                    system_default_encoding=system_default_encoding
                 )
-                block_size = extra_data.block_size
+                offset += size
+
+                if collector is not None:
+                    collector.observe(stage=stage, start_ns=stage_start_ns, num_bytes=size)
 
-            if extra_data is None:
-                offset += 4
-                break
+                string_data_kwargs[field_name] = string_value
 
-            offset += block_size
-            extra_data_list.append(extra_data)
+            stage = None
+            extra_data_list = _extra_data_list_from_bytes(data=data, base_offset=offset, budget=budget)
+        except Exception:
+            if collector is not None and stage is not None:
+                collector.observe(stage=stage, start_ns=stage_start_ns, num_bytes=0, outcome=OUTCOME_ERROR)
+            raise
 
         return cls(
-            header=ShellLinkHeader.from_bytes(data=data),
+            header=header,
             link_target_id_list=link_target_id_list,
             link_info=link_info,
             **string_data_kwargs,
             extra_data_list=extra_data_list
         )
 
+    @classmethod
+    def from_fd(
+        cls,
+        fd: int,
+        system_default_encoding: str | None = None,
+        limits: ParseLimits = DEFAULT_PARSE_LIMITS
+    ) -> ShellLink:
+        """
+        Make a shell link from the contents of an open file, which are memory-mapped rather than read.
+
+        The mapping is closed before returning; only the values that make up the shell link are copied out of it.
+
+        :param fd: A file descriptor of the file from which to extract the bytes constituting the shell link.
+        :param system_default_encoding: The default encoding on the system on which the data was generated.
+        :param limits: Limits on the parsing, bounding the work that a crafted shell link can cause.
+        :return: A shell link.
+        """
+
+        with mmap(fd, 0, access=ACCESS_READ) as mapped:
+            data = memoryview(mapped)
+            try:
+                return cls.from_bytes(data=data, system_default_encoding=system_default_encoding, limits=limits)
+            except BaseException as e:
+                # The frames of the traceback hold views of the mapping, which would prevent it from being closed.
+                clear_frames(e.__traceback__)
+                raise
+            finally:
+                data.release()
+
+    @classmethod
+    def from_path(
+        cls,
+        path: str | PathLike,
+        system_default_encoding: str | None = None,
+        limits: ParseLimits = DEFAULT_PARSE_LIMITS
+    ) -> ShellLink:
+        """
+        Make a shell link from the contents of a file, which are memory-mapped rather than read.
+
+        :param path: The path of the file from which to extract the bytes constituting the shell link.
+        :param system_default_encoding: The default encoding on the system on which the data was generated.
+        :param limits: Limits on the parsing, bounding the work that a crafted shell link can cause.
+        :return: A shell link.
+        """
+
+        with open(path, 'rb') as lnk_file:
+            return cls.from_fd(fd=lnk_file.fileno(), system_default_encoding=system_default_encoding, limits=limits)
+
+    def to_bytes(self, system_default_encoding: str | None = None) -> bytes:
+        """
+        Make the sequence of bytes constituting the shell link.
+
+        As when parsing, the link flags of the header determine which sections are included; the sections must be
+        present accordingly. The link info structure is Unicode-encoded if the `IsUnicode` link flag is set.
+
+        :param system_default_encoding: The encoding with which to encode strings that are not Unicode-encoded. Defaults
+            to the current system's default encoding.
+        :return: The bytes of the shell link.
+        """
+
+        link_flags = self.header.link_flags
+
+        sections: list[bytes] = [self.header.to_bytes()]
+
+        if link_flags.has_link_target_id_list:
+            sections.append(self.link_target_id_list.to_bytes(system_default_encoding=system_default_encoding))
+
+        if link_flags.has_link_info:
+            sections.append(
+                self.link_info.to_bytes(
+                    system_default_encoding=system_default_encoding,
+                    is_unicode=link_flags.is_unicode
+                )
+            )
+
+        pairs = [
+            (link_flags.has_name, self.name_string),
+            (link_flags.has_relative_path, self.relative_path),
+            (link_flags.has_working_dir, self.working_dir),
+            (link_flags.has_arguments, self.command_line_arguments),
+            (link_flags.has_icon_location, self.icon_location)
+        ]
+
+        for string_data_present, string_value in pairs:
+            if not string_data_present:
+                continue
+
+            sections.append(
+                _encode_string_data_field(
+                    string=string_value,
+                    is_unicode=link_flags.is_unicode,
+                    system_default_encoding=system_default_encoding
+                )
+            )
+
+        sections.extend(extra_data.to_bytes() for extra_data in self.extra_data_list)
+
+        # The terminal block.
+        sections.append(bytes(4))
+
+        return b''.join(sections)
+
+    def get_property(self, format_id: UUID, property_name: int | str) -> SerializedPropertyValue | None:
+        """
+        Look up a property in the property store data blocks, decoding only its value.
+
+        :param format_id: The format ID of the property storage of the property.
+        :param property_name: The integer ID or string name of the property.
+        :return: The first property with the format ID and name, or `None` if there is none.
+        """
+
+        for extra_data in self.extra_data_list:
+            if not isinstance(extra_data, PropertyStoreDataBlock):
+                continue
+
+            property_entry = extra_data.get_property(format_id=format_id, property_name=property_name)
+            if property_entry is not None:
+                return property_entry
+
+        return None
+
     def __str__(self) -> str:
         link_target_str: str = '\n\n'.join(str(link_target_id) for link_target_id in self.link_target_id_list)
         extra_data_str: str = '\n\n'.join(str(extra_data) for extra_data in self.extra_data_list)
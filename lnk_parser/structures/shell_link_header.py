@@ -1,7 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import ClassVar, ByteString
-from struct import unpack_from as struct_unpack_from
 from uuid import UUID
 from datetime import datetime
 from re import sub as re_sub
@@ -13,13 +12,38 @@ from string_utils_py import text_align_delimiter
 from lnk_parser.structures.link_flags import LinkFlagsMask
 from lnk_parser.structures.show_command import ShowCommand
 from lnk_parser.structures.hot_keys_flags import HotKeyFlags
+from lnk_parser.struct_layout import StructLayout
+from lnk_parser.utils import datetime_to_filetime_bytes
+from lnk_parser.structures.mask import bind_class_location
 
 
-@dataclass
+# The mask class of the file attributes is made by `Mask.make_class`; see `bind_class_location`.
+bind_class_location(cls=FileAttributes, module_name='msdsalgs.fscc.file_attributes', name='FileAttributes')
+
+
+@dataclass(slots=True)
 class ShellLinkHeader:
     SIZE: ClassVar[int] = 0x0000004C
     LINK_CLSID: ClassVar[UUID] = UUID('00021401-0000-0000-C000-000000000046')
 
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='ShellLinkHeaderFields',
+        fields=(
+            ('header_size', 'I'),
+            ('link_clsid', '16s'),
+            ('link_flags', 'I'),
+            ('file_attributes', 'I'),
+            ('creation_time', '8s'),
+            ('access_time', '8s'),
+            ('write_time', '8s'),
+            ('file_size', 'I'),
+            ('icon_index', 'I'),
+            ('show_command', 'I'),
+            ('hot_key', '2s'),
+            (None, '10x')
+        )
+    )
+
     link_flags: LinkFlagsMask
     file_attributes: FileAttributes
     creation_time: datetime | None
@@ -40,26 +64,43 @@ class ShellLinkHeader:
         :return: A shell link header.
         """
 
-        data = memoryview(data)
-
-        # TODO: Remove magic numbers?
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
 
-        hot_key = HotKeyFlags.from_bytes(data=data[base_offset+0x0040:0x0042])
+        hot_key = HotKeyFlags.from_bytes(data=fields.hot_key)
 
         return cls(
-            link_flags=LinkFlagsMask.from_int(value=struct_unpack_from('<I', buffer=data, offset=base_offset + 0x0014)[0]),
-            file_attributes=FileAttributes.from_int(
-                value=struct_unpack_from('<I', buffer=data, offset=base_offset+0x0018)[0]
-            ),
-            creation_time=filetime_to_datetime(filetime=data[base_offset+0x001C:base_offset+0x0024]),
-            access_time=filetime_to_datetime(filetime=data[base_offset+0x0024:base_offset+0x002C]),
-            write_time=filetime_to_datetime(filetime=data[base_offset+0x002C:base_offset+0x0034]),
-            file_size=struct_unpack_from('<I', buffer=data, offset=base_offset+0x0034)[0],
-            icon_index=struct_unpack_from('<I', buffer=data, offset=base_offset+0x0038)[0],
-            show_command=ShowCommand(struct_unpack_from('<I', buffer=data, offset=base_offset+0x003C)[0]),
+            link_flags=LinkFlagsMask.from_int(value=fields.link_flags),
+            file_attributes=FileAttributes.from_int(value=fields.file_attributes),
+            creation_time=filetime_to_datetime(filetime=fields.creation_time),
+            access_time=filetime_to_datetime(filetime=fields.access_time),
+            write_time=filetime_to_datetime(filetime=fields.write_time),
+            file_size=fields.file_size,
+            icon_index=fields.icon_index,
+            show_command=ShowCommand(fields.show_command),
             hot_key=hot_key if hot_key.key else None
         )
 
+    def to_bytes(self) -> bytes:
+        """
+        Make the sequence of bytes constituting the shell link header.
+
+        :return: The bytes of the shell link header.
+        """
+
+        return self.LAYOUT.pack(
+            header_size=self.SIZE,
+            link_clsid=self.LINK_CLSID.bytes_le,
+            link_flags=self.link_flags.to_int(),
+            file_attributes=self.file_attributes.to_int(),
+            creation_time=datetime_to_filetime_bytes(value=self.creation_time),
+            access_time=datetime_to_filetime_bytes(value=self.access_time),
+            write_time=datetime_to_filetime_bytes(value=self.write_time),
+            file_size=self.file_size,
+            icon_index=self.icon_index,
+            show_command=self.show_command,
+            hot_key=self.hot_key.to_bytes() if self.hot_key is not None else bytes(2)
+        )
+
     def __len__(self) -> int:
         return self.SIZE
 
@@ -1,14 +1,29 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import ByteString
-from struct import unpack_from as struct_unpack_from
+from typing import ByteString, ClassVar
 
 from lnk_parser.structures.drive_type import DriveType
-from lnk_parser.utils import get_system_default_encoding
+from lnk_parser.utils import resolve_encoding, _encode_null_terminated_string
+from lnk_parser.struct_layout import StructLayout
 
 
-@dataclass
+@dataclass(slots=True)
 class VolumeID:
+    LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='VolumeIDFields',
+        fields=(
+            ('volume_id_size', 'I'),
+            ('drive_type', 'I'),
+            ('drive_serial_number', '4s'),
+            ('volume_label_offset', 'I')
+        )
+    )
+    # The optional field that follows when the volume label offset is 0x14.
+    UNICODE_OFFSET_LAYOUT: ClassVar[StructLayout] = StructLayout(
+        name='VolumeIDUnicodeOffsetFields',
+        fields=(('volume_label_offset_unicode', 'I'),)
+    )
+
     drive_type: DriveType
     drive_serial_number: bytes
     volume_label: str
@@ -22,24 +37,58 @@ class VolumeID:
 
         data = memoryview(data)
 
-        volume_id_size: int = struct_unpack_from('<I', buffer=data, offset=base_offset)[0]
+        fields = cls.LAYOUT.unpack_from(data, base_offset)
+
+        volume_id_end = base_offset + fields.volume_id_size
 
-        volume_label_offset = struct_unpack_from('<I', buffer=data, offset=base_offset+12)[0]
-        if volume_label_offset == 0x00000014:
-            volume_label = bytes(data[
-                base_offset+struct_unpack_from('<I', buffer=data, offset=base_offset+16)[0]:base_offset+volume_id_size
-            ]).decode(encoding='utf-16-le')
+        if fields.volume_label_offset == 0x00000014:
+            volume_label_offset: int = cls.UNICODE_OFFSET_LAYOUT.unpack_from(
+                data,
+                base_offset + cls.LAYOUT.size
+            ).volume_label_offset_unicode
+            volume_label = str(data[base_offset+volume_label_offset:volume_id_end], encoding='utf-16-le')
         else:
-            volume_label = bytes(data[
-                base_offset+volume_label_offset:base_offset+volume_id_size
-            ]).decode(encoding=system_default_encoding or get_system_default_encoding())
+            volume_label = str(
+                data[base_offset+fields.volume_label_offset:volume_id_end],
+                encoding=resolve_encoding(system_default_encoding)
+            )
 
         return cls(
-            drive_type=DriveType(struct_unpack_from('<I', buffer=data, offset=base_offset+4)[0]),
-            drive_serial_number=bytes(data[base_offset+8:base_offset+12]),
+            drive_type=DriveType(fields.drive_type),
+            drive_serial_number=fields.drive_serial_number,
             volume_label=volume_label.replace('\x00', '')
         )
 
+    def to_bytes(self, system_default_encoding: str | None = None, is_unicode: bool = False) -> bytes:
+        """
+        Make the sequence of bytes constituting the volume ID.
+
+        :param system_default_encoding: The encoding with which to encode the volume label when not Unicode-encoded.
+            Defaults to the current system's default encoding.
+        :param is_unicode: Whether to Unicode-encode the volume label.
+        :return: The bytes of the volume ID.
+        """
+
+        volume_label_bytes = _encode_null_terminated_string(
+            string=self.volume_label,
+            is_unicode=is_unicode,
+            system_default_encoding=system_default_encoding
+        )
+
+        if is_unicode:
+            volume_label_offset = self.LAYOUT.size + self.UNICODE_OFFSET_LAYOUT.size
+            offset_bytes = self.UNICODE_OFFSET_LAYOUT.pack(volume_label_offset_unicode=volume_label_offset)
+        else:
+            volume_label_offset = self.LAYOUT.size
+            offset_bytes = b''
+
+        return self.LAYOUT.pack(
+            volume_id_size=volume_label_offset + len(volume_label_bytes),
+            drive_type=self.drive_type,
+            drive_serial_number=self.drive_serial_number,
+            volume_label_offset=0x00000014 if is_unicode else volume_label_offset
+        ) + offset_bytes + volume_label_bytes
+
     def __str__(self) -> str:
         return (
             f'Drive type: {repr(self.drive_type)}\n'
@@ -1,6 +1,8 @@
 from enum import IntFlag
 from msdsalgs.utils import Mask
 
+from lnk_parser.structures.mask import bind_class_location
+
 
 class VolumeShellItemFlags(IntFlag):
     HAS_NAME = 0x1
@@ -9,4 +11,8 @@ class VolumeShellItemFlags(IntFlag):
     IS_REMOVABLE_MEDIA = 0x8
 
 
-VolumeShellItemFlagsMask = Mask.make_class(int_flag_class=VolumeShellItemFlags)
+VolumeShellItemFlagsMask = bind_class_location(
+    cls=Mask.make_class(int_flag_class=VolumeShellItemFlags),
+    module_name=__name__,
+    name='VolumeShellItemFlagsMask'
+)
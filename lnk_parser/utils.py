@@ -1,14 +1,23 @@
 from logging import Logger, getLogger
-from struct import unpack_from as struct_unpack_from
-from typing import ByteString
-from re import sub as re_sub
+from struct import unpack_from as struct_unpack_from, pack as struct_pack
+from typing import ByteString, Final, Pattern
+from re import sub as re_sub, compile as re_compile, DOTALL
 from locale import getpreferredencoding
+from codecs import lookup as codecs_lookup, utf_16_le_decode
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 
 from string_utils_py import text_align_delimiter
 
 
 LOG: Logger = getLogger(__name__)
 
+_FILETIME_EPOCH = datetime(year=1601, month=1, day=1, tzinfo=timezone.utc)
+
+# Matches a UTF-16 string up to and including its null terminator, two null bytes aligned with the string's code units.
+_UTF_16_NULL_TERMINATED_PATTERN: Final[Pattern[bytes]] = re_compile(pattern=rb'(?:..)*?\x00\x00', flags=DOTALL)
+_NULL_BYTE_PATTERN: Final[Pattern[bytes]] = re_compile(pattern=rb'\x00')
+
 
 def get_system_default_encoding(*args, **kwargs) -> str:
     """
@@ -22,6 +31,93 @@ def get_system_default_encoding(*args, **kwargs) -> str:
     return res[1] if isinstance(res := getpreferredencoding(*args, **kwargs), tuple) else res
 
 
+@lru_cache(maxsize=None)
+def resolve_encoding(system_default_encoding: str | None = None) -> str:
+    """
+    Resolve an encoding to the canonical name of its codec.
+
+    The resolutions are cached, so that the current system's default encoding is looked up only once, and so that a
+    parse can resolve its encoding once and pass the result on to the parsing of the contained structures.
+
+    :param system_default_encoding: The name of an encoding. Defaults to the current system's default encoding.
+    :return: The canonical name of the codec of the encoding.
+    """
+
+    return codecs_lookup(system_default_encoding or get_system_default_encoding()).name
+
+
+def datetime_to_filetime(value: datetime) -> int:
+    """
+    Convert a datetime to a FILETIME value, the number of 100-nanosecond intervals since 1601-01-01 UTC.
+
+    :param value: The datetime to be converted. A naive datetime is taken to be in UTC.
+    :return: The FILETIME value corresponding to the datetime.
+    """
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    delta = value - _FILETIME_EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 10_000_000 + delta.microseconds * 10
+
+
+def datetime_to_filetime_bytes(value: datetime | None) -> bytes:
+    """
+    Convert a datetime to the bytes of a FILETIME structure.
+
+    :param value: The datetime to be converted, or `None` for an unset (zero) FILETIME.
+    :return: The bytes of the FILETIME structure.
+    """
+
+    return (datetime_to_filetime(value=value) if value is not None else 0).to_bytes(8, 'little')
+
+
+def datetime_to_dos_date(value: datetime | None) -> int:
+    """
+    Convert the date of a datetime to an MS-DOS date.
+
+    :param value: The datetime whose date is to be converted, or `None` for an unset (zero) date.
+    :return: The MS-DOS date.
+    """
+
+    if value is None:
+        return 0
+
+    return ((value.year - 1980) << 9) | (value.month << 5) | value.day
+
+
+def timedelta_to_dos_time(value: timedelta) -> int:
+    """
+    Convert a time of day, given as the time since midnight, to an MS-DOS time, which has a resolution of two seconds.
+
+    :param value: The time since midnight.
+    :return: The MS-DOS time.
+    """
+
+    hours, remainder = divmod(int(value.total_seconds()), 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    return (hours << 11) | (minutes << 5) | (seconds // 2)
+
+
+def datetime_to_dos_date_time_bytes(value: datetime | None) -> bytes:
+    """
+    Convert a datetime to the bytes of an MS-DOS date followed by an MS-DOS time.
+
+    :param value: The datetime to be converted, or `None` for an unset (zero) date and time.
+    :return: The bytes of the MS-DOS date and time.
+    """
+
+    if value is None:
+        return bytes(4)
+
+    return struct_pack(
+        '<HH',
+        datetime_to_dos_date(value=value),
+        timedelta_to_dos_time(value=timedelta(hours=value.hour, minutes=value.minute, seconds=value.second))
+    )
+
+
 def _decode_string_data_field(
     buffer: ByteString | memoryview,
     is_unicode: bool,
@@ -39,61 +135,106 @@ def _decode_string_data_field(
     :return: The string extracted from the buffer and byte size of the string length specifier and the string.
     """
 
-    buffer = memoryview(buffer)[offset:]
+    buffer = memoryview(buffer)
 
-    encoding = 'utf-16-le' if is_unicode else system_default_encoding or get_system_default_encoding()
+    if is_unicode:
+        str_len: int = struct_unpack_from('<H', buffer, offset)[0] * 2
+        return utf_16_le_decode(buffer[offset+2:offset+2+str_len], 'strict', True)[0], 2 + str_len
+
+    str_len: int = struct_unpack_from('<H', buffer, offset)[0]
+    return str(buffer[offset+2:offset+2+str_len], resolve_encoding(system_default_encoding)), 2 + str_len
+
+
+def _encode_string_data_field(string: str, is_unicode: bool, system_default_encoding: str | None = None) -> bytes:
+    """
+    Encode a string data field.
+
+    :param string: The string to be encoded.
+    :param is_unicode: Whether the string is to be Unicode-encoded.
+    :param system_default_encoding: The encoding with which to encode the string when not Unicode-encoded. Defaults to
+        the current system's default encoding.
+    :return: The bytes of the string length specifier and the string.
+    """
+
+    if is_unicode:
+        string_bytes = string.encode(encoding='utf-16-le')
+        return struct_pack('<H', len(string_bytes) // 2) + string_bytes
 
-    str_len: int = struct_unpack_from('<H', buffer=buffer)[0] * (2 if is_unicode else 1)
-    return bytes(buffer[2:2+str_len]).decode(encoding=encoding), 2 + str_len
+    string_bytes = string.encode(encoding=resolve_encoding(system_default_encoding))
+    return struct_pack('<H', len(string_bytes)) + string_bytes
+
+
+def _encode_null_terminated_string(
+    string: str,
+    is_unicode: bool,
+    system_default_encoding: str | None = None
+) -> bytes:
+    """
+    Encode a null-terminated string.
+
+    :param string: The string to be encoded.
+    :param is_unicode: Whether the string is to be Unicode-encoded.
+    :param system_default_encoding: The encoding with which to encode the string when not Unicode-encoded. Defaults to
+        the current system's default encoding.
+    :return: The bytes of the string, including the null terminator.
+    """
+
+    if is_unicode:
+        return string.encode(encoding='utf-16-le') + b'\x00\x00'
+
+    return string.encode(encoding=resolve_encoding(system_default_encoding)) + b'\x00'
 
 
 def _decode_null_terminated_string(
     data: ByteString | memoryview,
     is_unicode: bool,
     offset: int = 0,
-    system_default_encoding: str | None = None
+    system_default_encoding: str | None = None,
+    end: int | None = None
 ) -> tuple[str, int]:
     """
     Decode a null-terminated string from a data buffer.
 
+    The null terminator is searched for in place, without copying the data buffer. In Unicode-encoded strings, only
+    null terminators aligned with the code units of the string are considered.
+
     :param data: The data from which to decode a null-terminated string.
     :param is_unicode: Whether the string is Unicode-encoded.
     :param offset: The offset into the data buffer from where to start reading the null-terminated string.
     :param system_default_encoding: The default encoding on the system which produced the null-terminated string bytes.
         Necessary to know when not Unicode-encoded. Defaults to the current system's default encoding.
-    :return: The decoded string and the number of bytes it constituted in the data buffer.
+    :param end: The offset into the data buffer before which the null terminator must be found, such as the end of the
+        structure containing the string. Defaults to the end of the data buffer.
+    :return: The decoded string and the number of bytes it constituted in the data buffer, not including the null
+        terminator.
     """
 
-    # NOTE: Not sure if this is a very nice way of decoding.
+    data = memoryview(data)
+    end = len(data) if end is None else min(end, len(data))
 
     if is_unicode:
-        encoding = 'utf-16-le'
-
-        num_string_bytes = bytes(data[offset:]).index(b'\x00\x00') + 1
-        if num_string_bytes == 1:
-            return '', num_string_bytes
-
-        string_bytes = bytes(data[offset:offset + num_string_bytes])
-
-        try:
-            return string_bytes.decode(encoding=encoding), num_string_bytes
-        except UnicodeError as e:
+        if (match := _UTF_16_NULL_TERMINATED_PATTERN.match(data, offset, end)) is None:
             raise ValueError(
-                f'Unable to decode the bytes {string_bytes} with the encoding {encoding}. '
-                'Maybe the offset is incorrect.'
-            ) from e
+                f'No null terminator of a Unicode string was found between the offsets {offset} and {end}.'
+            )
+        num_string_bytes = match.end() - 2 - offset
     else:
-        system_default_encoding = system_default_encoding or get_system_default_encoding()
-        num_string_bytes = bytes(data[offset:]).index(b'\x00')
-        string_bytes = bytes(data[offset:offset + num_string_bytes])
-
-        try:
-            return string_bytes.decode(encoding=system_default_encoding), num_string_bytes
-        except UnicodeError as e:
-            raise ValueError(
-                f'Unable to decode the bytes {string_bytes} with the system encoding {system_default_encoding}. '
-                'Maybe the encoding or offset is incorrect.'
-            ) from e
+        if (match := _NULL_BYTE_PATTERN.search(data, offset, end)) is None:
+            raise ValueError(f'No null terminator of a string was found between the offsets {offset} and {end}.')
+        num_string_bytes = match.start() - offset
+
+    string_bytes = data[offset:offset + num_string_bytes]
+    encoding = 'utf-16-le' if is_unicode else resolve_encoding(system_default_encoding)
+
+    try:
+        if is_unicode:
+            return utf_16_le_decode(string_bytes, 'strict', True)[0], num_string_bytes
+        return str(string_bytes, encoding), num_string_bytes
+    except UnicodeError as e:
+        raise ValueError(
+            f'Unable to decode the bytes {bytes(string_bytes)} with the encoding {encoding}. '
+            'Maybe the encoding or offset is incorrect.'
+        ) from e
 
 
 def _format_str(string: str) -> str:
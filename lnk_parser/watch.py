@@ -0,0 +1,433 @@
+from __future__ import annotations
+from logging import Logger, getLogger
+from abc import ABC, abstractmethod
+from typing import Final, Iterable, Iterator
+from os import fspath, read, close, fsencode, fsdecode, scandir, stat, strerror, PathLike, O_NONBLOCK, O_CLOEXEC
+from os.path import join, dirname, basename, isdir
+from select import select
+from struct import Struct
+from sys import platform
+from time import monotonic, sleep, time_ns
+from contextlib import closing
+from ctypes import CDLL, c_char_p, c_int, c_uint32, get_errno
+
+from lnk_parser.scan import LNK_FILE_SUFFIX, iter_lnk_paths
+from lnk_parser.scan_cache import FileIdentity, get_file_identity
+from lnk_parser.jump_list import is_jump_list_path
+
+LOG: Logger = getLogger(__name__)
+
+# The number of seconds without changes to a file after which it is parsed.
+DEFAULT_DEBOUNCE_INTERVAL: Final[float] = 0.25
+
+# The number of seconds between listings of the watched directories when polling.
+DEFAULT_POLL_INTERVAL: Final[float] = 1.0
+
+# The events of `inotify(7)` that are watched for or handled.
+_IN_MODIFY: Final[int] = 0x00000002
+_IN_CLOSE_WRITE: Final[int] = 0x00000008
+_IN_MOVED_TO: Final[int] = 0x00000080
+_IN_CREATE: Final[int] = 0x00000100
+_IN_Q_OVERFLOW: Final[int] = 0x00004000
+_IN_IGNORED: Final[int] = 0x00008000
+_IN_ONLYDIR: Final[int] = 0x01000000
+_IN_ISDIR: Final[int] = 0x40000000
+
+_WATCH_MASK: Final[int] = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_ONLYDIR
+
+# The fixed fields of `struct inotify_event`: the watch descriptor, the mask, the cookie and the length of the name.
+_INOTIFY_EVENT_STRUCT: Final[Struct] = Struct('iIII')
+
+_INOTIFY_READ_SIZE: Final[int] = 64 * 1024
+
+
+class ChangeSource(ABC):
+    """
+    A source of the paths of watched files that may have been created or modified.
+
+    The watched files are those that `iter_lnk_paths` yields for the same paths and options.
+    """
+
+    def __init__(self, paths: Iterable[str | PathLike], recursive: bool = False, include_jump_lists: bool = False):
+        """
+        :param paths: Paths of LNK files, or of directories containing LNK files, to be watched.
+        :param recursive: Whether to also watch the subdirectories of the provided directories.
+        :param include_jump_lists: Whether to also watch the jump list files within the provided directories.
+        """
+
+        self.paths = [fspath(path) for path in paths]
+        self.recursive = recursive
+        self.include_jump_lists = include_jump_lists
+
+    def _is_watched_name(self, name: str) -> bool:
+        return name.lower().endswith(LNK_FILE_SUFFIX) or (self.include_jump_lists and is_jump_list_path(path=name))
+
+    @abstractmethod
+    def wait(self, timeout: float | None = None) -> list[str]:
+        """
+        Wait for watched files to be created or modified.
+
+        :param timeout: The largest number of seconds to wait. Defaults to waiting until there are changes.
+        :return: The paths of the files that may have been created or modified; empty if the timeout expired.
+        """
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class PollingChangeSource(ChangeSource):
+    """
+    A change source that lists the watched directories periodically, comparing the identity of each file to that of the
+    previous listing.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str | PathLike],
+        recursive: bool = False,
+        include_jump_lists: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL
+    ):
+        """
+        :param paths: Paths of LNK files, or of directories containing LNK files, to be watched.
+        :param recursive: Whether to also watch the subdirectories of the provided directories.
+        :param include_jump_lists: Whether to also watch the jump list files within the provided directories.
+        :param poll_interval: The number of seconds between listings.
+        """
+
+        super().__init__(paths=paths, recursive=recursive, include_jump_lists=include_jump_lists)
+
+        self.poll_interval = poll_interval
+
+        self._file_identities: dict[str, FileIdentity | None] = {}
+        self._poll()
+        self._next_poll_time = monotonic() + self.poll_interval
+
+    def _poll(self) -> list[str]:
+        file_identities: dict[str, FileIdentity | None] = {
+            path: get_file_identity(path=path)
+            for path in iter_lnk_paths(
+                paths=self.paths,
+                recursive=self.recursive,
+                include_jump_lists=self.include_jump_lists
+            )
+        }
+
+        changed_paths = [
+            path for path, file_identity in file_identities.items()
+            if file_identity is not None and file_identity != self._file_identities.get(path)
+        ]
+        self._file_identities = file_identities
+
+        return changed_paths
+
+    def wait(self, timeout: float | None = None) -> list[str]:
+        now = monotonic()
+        if timeout is not None and now + timeout < self._next_poll_time:
+            sleep(timeout)
+            return []
+
+        sleep(max(self._next_poll_time - now, 0))
+        self._next_poll_time = monotonic() + self.poll_interval
+
+        return self._poll()
+
+
+def _load_libc() -> CDLL:
+    libc = CDLL(None, use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError('The C library does not provide inotify.')
+
+    libc.inotify_init1.argtypes = (c_int,)
+    libc.inotify_init1.restype = c_int
+    libc.inotify_add_watch.argtypes = (c_int, c_char_p, c_uint32)
+    libc.inotify_add_watch.restype = c_int
+
+    return libc
+
+
+class InotifyChangeSource(ChangeSource):
+    """
+    A change source that is notified of the changes in the watched directories by the Linux kernel, through
+    `inotify(7)`.
+
+    Directories created within recursively watched directories are watched as they appear. If the kernel's event queue
+    overflows, the watched directories are listed, and the files whose inode has changed since the previous listing are
+    reported.
+    """
+
+    def __init__(self, paths: Iterable[str | PathLike], recursive: bool = False, include_jump_lists: bool = False):
+        """
+        :param paths: Paths of LNK files, or of directories containing LNK files, to be watched.
+        :param recursive: Whether to also watch the subdirectories of the provided directories.
+        :param include_jump_lists: Whether to also watch the jump list files within the provided directories.
+        """
+
+        super().__init__(paths=paths, recursive=recursive, include_jump_lists=include_jump_lists)
+
+        self._libc = _load_libc()
+
+        self._fd: int = self._libc.inotify_init1(O_NONBLOCK | O_CLOEXEC)
+        if self._fd < 0:
+            errno = get_errno()
+            raise OSError(errno, strerror(errno))
+
+        self._watch_descriptor_to_directory: dict[int, str] = {}
+        # The directories whose LNK files are watched, rather than only the explicitly provided files within them.
+        self._lnk_directories: set[str] = set()
+        # The explicitly provided files, by the directory in which they are watched and their names.
+        self._file_paths: dict[tuple[str, str], str] = {}
+        self._listing_time_ns = time_ns()
+
+        try:
+            for path in self.paths:
+                if isdir(path):
+                    self._add_directory(directory=path)
+                else:
+                    directory = dirname(path) or '.'
+                    self._add_watch(directory=directory)
+                    self._file_paths[(directory, basename(path))] = path
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: str) -> None:
+        watch_descriptor = self._libc.inotify_add_watch(self._fd, fsencode(directory), _WATCH_MASK)
+        if watch_descriptor < 0:
+            errno = get_errno()
+            raise OSError(errno, strerror(errno), directory)
+
+        self._watch_descriptor_to_directory[watch_descriptor] = directory
+
+    def _add_directory(self, directory: str) -> None:
+        """
+        Watch a directory for LNK files, and its subdirectories if watching recursively.
+
+        :param directory: The path of the directory.
+        :return: None
+        """
+
+        directory_stack: list[str] = [directory]
+        while directory_stack:
+            directory = directory_stack.pop()
+            self._add_watch(directory=directory)
+            self._lnk_directories.add(directory)
+
+            if not self.recursive:
+                continue
+
+            try:
+                with scandir(directory) as directory_entries:
+                    directory_stack.extend(
+                        directory_entry.path for directory_entry in directory_entries
+                        if directory_entry.is_dir(follow_symlinks=False)
+                    )
+            except OSError as e:
+                LOG.warning(f'Unable to list the directory {e.filename}: {e.strerror}')
+
+    def _list_changed_paths(self) -> list[str]:
+        """
+        List the watched files whose inode has changed since the previous listing.
+
+        :return: The paths of the files.
+        """
+
+        listing_time_ns = self._listing_time_ns
+        self._listing_time_ns = time_ns()
+
+        changed_paths: list[str] = []
+        for path in iter_lnk_paths(
+            paths=self.paths,
+            recursive=self.recursive,
+            include_jump_lists=self.include_jump_lists
+        ):
+            try:
+                if stat(path).st_ctime_ns >= listing_time_ns:
+                    changed_paths.append(path)
+            except OSError:
+                pass
+
+        return changed_paths
+
+    def _handle_new_directory(self, directory: str) -> list[str]:
+        """
+        Watch a directory created within a recursively watched directory.
+
+        :param directory: The path of the directory.
+        :return: The paths of the files already in the directory, which may have been created before it was watched.
+        """
+
+        try:
+            self._add_directory(directory=directory)
+        except OSError as e:
+            LOG.warning(f'Unable to watch the directory {directory}: {e.strerror}')
+            return []
+
+        return list(iter_lnk_paths(paths=[directory], recursive=True, include_jump_lists=self.include_jump_lists))
+
+    def wait(self, timeout: float | None = None) -> list[str]:
+        readable_fds, _, _ = select([self._fd], [], [], timeout)
+        if not readable_fds:
+            return []
+
+        changed_paths: list[str] = []
+        while True:
+            try:
+                data = read(self._fd, _INOTIFY_READ_SIZE)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                watch_descriptor, mask, _, name_size = _INOTIFY_EVENT_STRUCT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT_STRUCT.size
+                # The name is padded with null bytes.
+                name = fsdecode(data[offset:offset + name_size].rstrip(b'\x00'))
+                offset += name_size
+
+                if mask & _IN_Q_OVERFLOW:
+                    LOG.warning('The queue of file system events overflowed; the watched directories are listed.')
+                    changed_paths.extend(self._list_changed_paths())
+                    continue
+
+                if (directory := self._watch_descriptor_to_directory.get(watch_descriptor)) is None:
+                    continue
+
+                if mask & _IN_IGNORED:
+                    # The directory was removed, or moved out of the watched tree.
+                    del self._watch_descriptor_to_directory[watch_descriptor]
+                    self._lnk_directories.discard(directory)
+                    continue
+
+                path = join(directory, name)
+
+                if mask & _IN_ISDIR:
+                    if self.recursive and directory in self._lnk_directories and mask & (_IN_CREATE | _IN_MOVED_TO):
+                        changed_paths.extend(self._handle_new_directory(directory=path))
+                    continue
+
+                if (file_path := self._file_paths.get((directory, name))) is not None:
+                    changed_paths.append(file_path)
+                elif directory in self._lnk_directories and self._is_watched_name(name=name):
+                    changed_paths.append(path)
+
+        return changed_paths
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            close(self._fd)
+            self._fd = -1
+
+
+def make_change_source(
+    paths: Iterable[str | PathLike],
+    recursive: bool = False,
+    include_jump_lists: bool = False,
+    use_polling: bool = False,
+    poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> ChangeSource:
+    """
+    Make a change source for watched files: an `InotifyChangeSource` on Linux, or else, or if inotify cannot be used,
+    such as when the limit of watches is reached, a `PollingChangeSource`.
+
+    :param paths: Paths of LNK files, or of directories containing LNK files, to be watched.
+    :param recursive: Whether to also watch the subdirectories of the provided directories.
+    :param include_jump_lists: Whether to also watch the jump list files within the provided directories.
+    :param use_polling: Whether to poll even where inotify is available.
+    :param poll_interval: The number of seconds between listings when polling.
+    :return: A change source.
+    """
+
+    paths = [fspath(path) for path in paths]
+
+    if not use_polling and platform.startswith('linux'):
+        try:
+            return InotifyChangeSource(paths=paths, recursive=recursive, include_jump_lists=include_jump_lists)
+        except OSError as e:
+            LOG.warning(f'Unable to watch the files with inotify; they are polled instead: {e}')
+
+    return PollingChangeSource(
+        paths=paths,
+        recursive=recursive,
+        include_jump_lists=include_jump_lists,
+        poll_interval=poll_interval
+    )
+
+
+def watch_paths(
+    paths: Iterable[str | PathLike],
+    recursive: bool = False,
+    include_jump_lists: bool = False,
+    debounce_interval: float = DEFAULT_DEBOUNCE_INTERVAL,
+    use_polling: bool = False,
+    poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> Iterator[Iterable[str]]:
+    """
+    Yield batches of the paths of LNK files to be parsed: first those of the existing files, and then, indefinitely,
+    those of the files created or modified since.
+
+    A file is included in a batch once it has gone unchanged for the debounce interval, so that a file being written,
+    or a burst of files, is parsed once it is complete; when polling, it must also have been unchanged at a listing
+    after that. A file is not included again unless its identity (its inode, size or modification time) has changed
+    since. The first batch is produced lazily, as by `iter_lnk_paths`, and must be consumed before the next is
+    requested.
+
+    :param paths: Paths of LNK files, or of directories containing LNK files, to be watched.
+    :param recursive: Whether to also watch the subdirectories of the provided directories.
+    :param include_jump_lists: Whether to also watch the jump list files within the provided directories.
+    :param debounce_interval: The number of seconds without changes to a file after which it is included in a batch.
+    :param use_polling: Whether to poll even where inotify is available.
+    :param poll_interval: The number of seconds between listings when polling.
+    :return: An iterator of batches of paths.
+    """
+
+    paths = [fspath(path) for path in paths]
+
+    # Watching starts before the existing files are listed, so that no file created in between is missed.
+    change_source = make_change_source(
+        paths=paths,
+        recursive=recursive,
+        include_jump_lists=include_jump_lists,
+        use_polling=use_polling,
+        poll_interval=poll_interval
+    )
+    if isinstance(change_source, PollingChangeSource):
+        debounce_interval += poll_interval
+
+    with closing(change_source):
+        yield iter_lnk_paths(paths=paths, recursive=recursive, include_jump_lists=include_jump_lists)
+
+        # The time of the latest change to each file that is yet to be included in a batch.
+        path_to_change_time: dict[str, float] = {}
+        # The identity of each file that has been included in a batch since the existing files were listed.
+        path_to_file_identity: dict[str, FileIdentity] = {}
+
+        while True:
+            if path_to_change_time:
+                timeout = max(min(path_to_change_time.values()) + debounce_interval - monotonic(), 0)
+            else:
+                timeout = None
+
+            for path in change_source.wait(timeout=timeout):
+                path_to_change_time[path] = monotonic()
+
+            now = monotonic()
+            settled_paths = [
+                path for path, change_time in path_to_change_time.items()
+                if now - change_time >= debounce_interval
+            ]
+
+            batch: list[str] = []
+            for path in settled_paths:
+                del path_to_change_time[path]
+
+                if (file_identity := get_file_identity(path=path)) is None:
+                    path_to_file_identity.pop(path, None)
+                elif file_identity != path_to_file_identity.get(path):
+                    path_to_file_identity[path] = file_identity
+                    batch.append(path)
+
+            if batch:
+                yield batch
@@ -9,5 +9,8 @@ setup(
         'parsing_error @ git+https://github.com/vphpersson/parsing_error.git#egg=parsing_error',
         'typed_argument_parser @ git+https://github.com/vphpersson/typed_argument_parser.git#egg=typed_argument_parser',
         'msdsalgs @ git+https://github.com/vphpersson/msdsalgs.git#egg=msdsalgs'
-    ]
+    ],
+    extras_require={
+        'numpy': ['numpy']
+    }
 )
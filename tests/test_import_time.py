@@ -0,0 +1,46 @@
+from os import environ
+from pathlib import Path
+
+import pytest
+
+from benchmarks.import_time import (
+    SCENARIOS, Scenario, ScenarioMeasurement, measure_interpreter_module_names, measure_scenario, write_budget_lnk_file
+)
+
+# The number of times each scenario is run; the fastest run is kept.
+REPEAT = 3
+# The factor by which the budgets are multiplied, for slower machines.
+BUDGET_SCALE = float(environ.get('LNK_PARSER_IMPORT_BUDGET_SCALE', '1.0'))
+
+
+@pytest.fixture(scope='module')
+def interpreter_module_names() -> set[str]:
+    return measure_interpreter_module_names()
+
+
+@pytest.fixture(scope='module')
+def lnk_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return write_budget_lnk_file(directory=tmp_path_factory.mktemp('import_time'))
+
+
+@pytest.fixture(scope='module')
+def measurements(interpreter_module_names: set[str], lnk_path: Path) -> dict[str, ScenarioMeasurement]:
+    return {
+        scenario.name: measure_scenario(
+            scenario=scenario,
+            lnk_path=lnk_path,
+            interpreter_module_names=interpreter_module_names,
+            repeat=REPEAT
+        )
+        for scenario in SCENARIOS
+    }
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS, ids=lambda scenario: scenario.name)
+def test_excluded_modules_are_not_imported(scenario: Scenario, measurements: dict[str, ScenarioMeasurement]):
+    assert measurements[scenario.name].excluded_module_names == []
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS, ids=lambda scenario: scenario.name)
+def test_import_time_is_within_budget(scenario: Scenario, measurements: dict[str, ScenarioMeasurement]):
+    assert measurements[scenario.name].time_ms <= scenario.budget_ms * BUDGET_SCALE
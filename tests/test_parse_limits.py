@@ -0,0 +1,108 @@
+from struct import pack, error as struct_error
+from uuid import UUID
+
+import pytest
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.shell_link_header import ShellLinkHeader
+from lnk_parser.structures.link_flags import LinkFlags
+from lnk_parser.structures.lazy_shell_link import LazyShellLink
+from lnk_parser.structures.property_storage import PropertyStorage
+from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+from lnk_parser.parse_budget import ParseLimits
+from lnk_parser.exceptions import StructureTooSmallError, StructureOutOfBoundsError, ParseBudgetExceededError
+
+TERMINAL_BLOCK = bytes(4)
+
+
+def _make_header(link_flags: int = 0) -> bytes:
+    return ShellLinkHeader.LAYOUT.pack(
+        header_size=ShellLinkHeader.SIZE,
+        link_clsid=ShellLinkHeader.LINK_CLSID.bytes_le,
+        link_flags=link_flags,
+        file_attributes=0,
+        creation_time=bytes(8),
+        access_time=bytes(8),
+        write_time=bytes(8),
+        file_size=0,
+        icon_index=0,
+        show_command=1,
+        hot_key=bytes(2)
+    )
+
+
+def _make_property_storage(storage_size: int | None = None) -> bytes:
+    # A property storage without property values: its fields followed by the terminating value size.
+    return PropertyStorage.LAYOUT.pack(
+        storage_size=storage_size if storage_size is not None else PropertyStorage.LAYOUT.size + 4,
+        version=b'1SPS',
+        format_id=UUID(int=1).bytes_le
+    ) + bytes(4)
+
+
+def _make_property_store_data_block(property_storages: list[bytes]) -> bytes:
+    # The property storages are followed by the terminating storage size.
+    data = b''.join(property_storages) + bytes(4)
+
+    return pack('<II', 8 + len(data), PropertyStoreDataBlock.SIGNATURE) + data
+
+
+def _make_shell_link_bytes(num_property_storages: int) -> bytes:
+    return _make_header() + _make_property_store_data_block(
+        property_storages=[_make_property_storage() for _ in range(num_property_storages)]
+    ) + TERMINAL_BLOCK
+
+
+def test_crafted_shell_link_is_parsed():
+    shell_link = ShellLink.from_bytes(data=_make_shell_link_bytes(num_property_storages=5))
+
+    assert len(shell_link.extra_data_list) == 1
+    assert len(shell_link.extra_data_list[0].property_storages) == 5
+
+
+def test_zero_size_item_id():
+    # The link target ID list holds an item ID of size zero, which would not advance through the list.
+    data = _make_header(link_flags=LinkFlags.HasLinkTargetIDList) + pack('<HHH', 6, 0, 1) + bytes(2) + TERMINAL_BLOCK
+
+    with pytest.raises(StructureTooSmallError):
+        ShellLink.from_bytes(data=data)
+
+
+def test_item_id_beyond_id_list():
+    data = _make_header(link_flags=LinkFlags.HasLinkTargetIDList) + pack('<HH', 6, 100) + bytes(4) + TERMINAL_BLOCK
+
+    with pytest.raises(StructureOutOfBoundsError):
+        ShellLink.from_bytes(data=data)
+
+
+def test_extra_data_block_beyond_data():
+    # The property storage of the block claims to extend far past the end of the data.
+    data = _make_header() + _make_property_store_data_block(
+        property_storages=[_make_property_storage(storage_size=4096)]
+    ) + TERMINAL_BLOCK
+
+    with pytest.raises(StructureOutOfBoundsError):
+        ShellLink.from_bytes(data=data)
+
+
+@pytest.mark.parametrize('from_bytes', [ShellLink.from_bytes, LazyShellLink.from_bytes], ids=['eager', 'lazy'])
+def test_property_storages_beyond_max_items(from_bytes):
+    data = _make_shell_link_bytes(num_property_storages=5)
+    limits = ParseLimits(max_items=3)
+
+    with pytest.raises(ParseBudgetExceededError):
+        shell_link = from_bytes(data=data, limits=limits)
+        # The extra data blocks of a lazy shell link are parsed on access.
+        shell_link.extra_data_list
+
+
+def test_max_bytes_truncation():
+    data = _make_shell_link_bytes(num_property_storages=1)
+
+    # The bytes following the shell link, as when carving, are not read.
+    shell_link = ShellLink.from_bytes(data=data + b'\xff' * 64, limits=ParseLimits(max_bytes=len(data)))
+    assert shell_link.to_bytes() == ShellLink.from_bytes(data=data).to_bytes()
+
+    # A shell link extending past the byte limit is parsed as if the data ended there.
+    with pytest.raises(struct_error):
+        ShellLink.from_bytes(data=data, limits=ParseLimits(max_bytes=len(data) - 1))
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from sys import getswitchinterval, setswitchinterval
+
+import pytest
+
+from lnk_parser.structures.shell_link import ShellLink
+from lnk_parser.structures.extra_data.property_store_data_block import PropertyStoreDataBlock
+from lnk_parser.corpus import CorpusParameters, make_shell_link_bytes
+
+# A corpus whose shell links vary in shape, so that threads parsing at the same time advance through structures of
+# different sizes.
+PARAMETERS = CorpusParameters(unicode_ratio=0.5, max_path_depth=12, max_num_properties=40)
+CORPUS_SIZE = 400
+NUM_THREADS = 8
+
+
+def _parse(data: bytes) -> ShellLink:
+    return ShellLink.from_bytes(data=data, system_default_encoding=PARAMETERS.system_default_encoding)
+
+
+def _describe(shell_link: ShellLink) -> tuple[bytes, list[int]]:
+    return (
+        shell_link.to_bytes(system_default_encoding=PARAMETERS.system_default_encoding),
+        [extra_data.size for extra_data in shell_link.extra_data_list]
+    )
+
+
+def _describe_corpus(corpus: list[bytes], start: int) -> list[tuple[bytes, list[int]]]:
+    descriptions: list[tuple[bytes, list[int]] | None] = [None] * len(corpus)
+    for offset in range(len(corpus)):
+        index = (start + offset) % len(corpus)
+        descriptions[index] = _describe(shell_link=_parse(data=corpus[index]))
+
+    return descriptions
+
+
+@pytest.fixture(scope='module')
+def corpus() -> list[bytes]:
+    return [make_shell_link_bytes(index=index, parameters=PARAMETERS) for index in range(CORPUS_SIZE)]
+
+
+@pytest.fixture
+def short_switch_interval():
+    original_switch_interval = getswitchinterval()
+    setswitchinterval(1e-6)
+    yield
+    setswitchinterval(original_switch_interval)
+
+
+@pytest.mark.usefixtures('short_switch_interval')
+def test_concurrent_parse_matches_serial_parse(corpus: list[bytes]):
+    serial_descriptions = [_describe(shell_link=_parse(data=data)) for data in corpus]
+
+    # Each thread parses the whole corpus, starting at a different shell link.
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        thread_descriptions = list(
+            executor.map(
+                lambda start: _describe_corpus(corpus=corpus, start=start),
+                (thread_index * len(corpus) // NUM_THREADS for thread_index in range(NUM_THREADS))
+            )
+        )
+
+    for descriptions in thread_descriptions:
+        assert descriptions == serial_descriptions
+
+    assert all(data == description[0] for data, description in zip(corpus, serial_descriptions))
+
+
+def test_property_store_data_block_size_is_per_instance(corpus: list[bytes]):
+    property_store_data_blocks = [
+        extra_data
+        for data in corpus
+        for extra_data in _parse(data=data).extra_data_list
+        if isinstance(extra_data, PropertyStoreDataBlock)
+    ]
+
+    sizes = [property_store_data_block.size for property_store_data_block in property_store_data_blocks]
+    assert len(set(sizes)) > 1
+    # The size of each block is the one it was parsed with, not that of the block parsed last.
+    assert sizes == [
+        len(property_store_data_block.to_bytes()) for property_store_data_block in property_store_data_blocks
+    ]
+    assert 'BLOCK_SIZE' not in vars(PropertyStoreDataBlock)